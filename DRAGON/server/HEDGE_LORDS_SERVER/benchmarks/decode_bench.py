@@ -0,0 +1,120 @@
+"""Frames/sec for the strict (json + pydantic) and fast (msgspec) ticker decoders.
+
+The fast decoder is measured in both numeric modes (Decimal and float64).
+
+Run from the server root:
+    python -m benchmarks.decode_bench --frames 50000
+"""
+
+import json
+import time
+import random
+import argparse
+from services.common.core.config import EXCHANGES
+from services.producer.service import OptionsProducer
+from services.producer.writer import ticker_to_row
+from services.producer.decoding import decode_ticker_row
+from services.common.types.enums import NumericMode
+
+
+def sample_frame(i: int) -> str:
+    """A v2/ticker frame shaped like the ones Delta Exchange sends"""
+    strike = 80000 + 200 * (i % 100)
+    side = "C" if i % 2 else "P"
+    mark = random.uniform(10, 2000)
+    return json.dumps(
+        {
+            "type": "v2/ticker",
+            "symbol": f"{side}-BTC-{strike}-010325",
+            "timestamp": 1740787200000000 + i,
+            "contract_type": "call_options" if side == "C" else "put_options",
+            "underlying_asset_symbol": "BTC",
+            "description": f"BTC {'Call' if side == 'C' else 'Put'} option",
+            "product_id": 100000 + i % 100,
+            "mark_price": f"{mark:.4f}",
+            "spot_price": "84321.55",
+            "strike_price": str(strike),
+            "tick_size": "0.1",
+            "open": 1200.5,
+            "high": 1400.0,
+            "low": 900.2,
+            "close": 1000.1,
+            "volume": 12.0,
+            "turnover": 1000000.5,
+            "turnover_usd": 1000000.5,
+            "turnover_symbol": "USD",
+            "oi": "45.2310",
+            "oi_contracts": "45231",
+            "oi_value": "45.2310",
+            "oi_value_usd": "3813123.21",
+            "oi_value_symbol": "BTC",
+            "oi_change_usd_6h": "-1234.5",
+            "size": 0,
+            "initial_margin": "42.16",
+            "mark_change_24h": "-0.0123",
+            "mark_vol": "0.55",
+            "tags": [],
+            "price_band": {"lower_limit": "0.1", "upper_limit": f"{mark * 2:.4f}"},
+            "quotes": {
+                "ask_iv": "0.561",
+                "ask_size": "1200",
+                "best_ask": f"{mark + 5:.1f}",
+                "best_bid": f"{mark - 5:.1f}",
+                "bid_iv": "0.549",
+                "bid_size": "800",
+                "impact_mid_price": None,
+                "mark_iv": "0.555",
+            },
+            "greeks": {
+                "delta": "0.51234",
+                "gamma": "0.00002",
+                "rho": "12.3",
+                "spot": "84321.55",
+                "theta": "-150.2",
+                "vega": "30.1",
+            },
+        }
+    )
+
+
+def bench(name: str, decode, frames: list[str]) -> float:
+    start = time.perf_counter()
+    for frame in frames:
+        decode(frame)
+    elapsed = time.perf_counter() - start
+    rate = len(frames) / elapsed
+    print(
+        f"{name:>8}: {rate:>12,.0f} frames/sec ({elapsed * 1e6 / len(frames):.2f} us/frame)"
+    )
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=50000)
+    args = parser.parse_args()
+
+    producer = OptionsProducer(
+        api_key=EXCHANGES["delta_exchange"]["api_key"],
+        api_secret=EXCHANGES["delta_exchange"]["api_secret"],
+        ws_url=EXCHANGES["delta_exchange"]["ws_url"],
+        api_url=EXCHANGES["delta_exchange"]["base_url"],
+    )
+
+    def strict(frame: str):
+        ticker = producer.parse_ticker(json.loads(frame))
+        return ticker_to_row(ticker)
+
+    frames = [sample_frame(i) for i in range(args.frames)]
+    strict_rate = bench("strict", strict, frames)
+    fast_rate = bench("fast", decode_ticker_row, frames)
+    float_rate = bench(
+        "fast-f64", lambda frame: decode_ticker_row(frame, NumericMode.FLOAT), frames
+    )
+    print(
+        f"speedup: {fast_rate / strict_rate:.1f}x (float64: {float_rate / strict_rate:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Replays recorded v2/ticker frames through the producer's whole ingest path.
+
+Frames go through OptionsProducer.message_handler into the ingest queue and
+the DB writers, exactly as they do from the websocket, so a database is
+needed. Record frames with DELTA_RECORD_PATH set on a running producer, or
+generate a synthetic recording.
+
+Run from the server root:
+    python -m benchmarks.replay_bench recording.bin.gz --speed 10
+    python -m benchmarks.replay_bench synthetic.bin.gz --synthetic 50000 --speed 0
+"""
+
+import json
+import time
+import asyncio
+import argparse
+from benchmarks.decode_bench import sample_frame
+from services.common.core.config import EXCHANGES
+from services.common.exchanges.recording import FrameRecorder, FrameReplayer
+from services.producer.service import OptionsProducer
+
+
+def write_synthetic(path: str, frames: int, rate: float) -> None:
+    """A recording of ``frames`` sample frames received ``rate`` per second"""
+    recorder = FrameRecorder(path)
+    start = time.time()
+    for i in range(frames):
+        recorder.record(sample_frame(i), received_at=start + i / rate)
+    recorder.close()
+
+
+async def replay(path: str, speed: float) -> None:
+    producer = OptionsProducer(
+        api_key=EXCHANGES["delta_exchange"]["api_key"],
+        api_secret=EXCHANGES["delta_exchange"]["api_secret"],
+        ws_url=EXCHANGES["delta_exchange"]["ws_url"],
+        api_url=EXCHANGES["delta_exchange"]["base_url"],
+    )
+    producer.start_writers()
+    replayer = FrameReplayer(path, producer.message_handler, speed or None)
+    result = await replayer.run()
+
+    drain_start = time.perf_counter()
+    await producer.stop_writers(timeout=60)
+    result["drain_s"] = round(time.perf_counter() - drain_start, 3)
+    result["queue"] = producer.ingest_queue.stats
+    result["writer"] = producer.writer.stats if producer.writer else None
+    producer.close_chain_store()
+    print(json.dumps(result, indent=2, default=str))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", help="recording file")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="1 replays in real time, N at N times the speed, 0 as fast as possible",
+    )
+    parser.add_argument(
+        "--synthetic", type=int, default=0, help="first write this many sample frames"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=1000, help="frames/sec of the synthetic recording"
+    )
+    args = parser.parse_args()
+
+    if args.synthetic:
+        write_synthetic(args.path, args.synthetic, args.rate)
+    asyncio.run(replay(args.path, args.speed))
+
+
+if __name__ == "__main__":
+    main()
@@ -23,7 +23,143 @@ DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_HOST = os.getenv("REMOTE_DB_HOST")
 DB_PORT = os.getenv("DB_PORT")
 DB_NAME = os.getenv("DB_NAME")
+# Read route for consumer queries (a streaming replica or a stand-in Postgres),
+# without READ_DB_HOST reads share the primary's engine. Unset READ_DB_* values
+# fall back to the primary's
+READ_DB_HOST = os.getenv("READ_DB_HOST")
+READ_DB_PORT = os.getenv("READ_DB_PORT", DB_PORT)
+READ_DB_USER = os.getenv("READ_DB_USER", DB_USER)
+READ_DB_PASSWORD = os.getenv("READ_DB_PASSWORD", DB_PASSWORD)
+READ_DB_NAME = os.getenv("READ_DB_NAME", DB_NAME)
 
+# Market data
+# "decimal" keeps the Numeric market_data.options table as the live source,
+# "float" keeps the hot columns as float64 from decode to broadcast via the
+# double precision market_data.options_snapshot table, it implies the batch
+# write mode and the fast decoder
+NUMERIC_MODE = os.getenv("NUMERIC_MODE", "decimal")
+
+# "postgres" or "shm", with "shm" the producer publishes the live chain to a
+# shared-memory store that consumers on the same host read instead of polling
+# Postgres (which is then only used for persistence)
+LIVE_TRANSPORT = os.getenv("LIVE_TRANSPORT", "postgres")
+LIVE_STORE_NAME = os.getenv("LIVE_STORE_NAME", "hedge_lords_chain")
+LIVE_STORE_CAPACITY = int(os.getenv("LIVE_STORE_CAPACITY", "4096"))  # symbols
+LIVE_STORE_POLL_INTERVAL = float(
+    os.getenv("LIVE_STORE_POLL_INTERVAL", "0.05")
+)  # seconds
+# With "notify" the producer announces changed symbols after each write with
+# NOTIFY and consumers only re-read those, a full re-read still happens when
+# nothing arrived for LIVE_NOTIFY_FALLBACK_INTERVAL seconds
+LIVE_NOTIFY_CHANNEL = os.getenv("LIVE_NOTIFY_CHANNEL", "options_changed")
+LIVE_NOTIFY_FALLBACK_INTERVAL = float(
+    os.getenv("LIVE_NOTIFY_FALLBACK_INTERVAL", "5.0")
+)  # seconds
+
+# How the consumer polls the chain with LIVE_TRANSPORT=postgres: "orm", or
+# "prepared" to have Postgres build the whole JSON message in one statement
+CONSUMER_CHAIN_QUERY = os.getenv("CONSUMER_CHAIN_QUERY", "orm")
+
+# Producer ingest
+PRODUCER_WRITE_MODE = os.getenv("PRODUCER_WRITE_MODE", "orm")  # "orm" or "batch"
+PRODUCER_FLUSH_INTERVAL = float(os.getenv("PRODUCER_FLUSH_INTERVAL", "0.25"))  # seconds
+PRODUCER_BATCH_SIZE = int(os.getenv("PRODUCER_BATCH_SIZE", "500"))  # rows
+PRODUCER_QUEUE_SIZE = int(os.getenv("PRODUCER_QUEUE_SIZE", "10000"))  # messages
+# "block", "drop_oldest" or "coalesce"
+PRODUCER_QUEUE_POLICY = os.getenv("PRODUCER_QUEUE_POLICY", "block")
+# More than one needs PRODUCER_WRITE_MODE=batch
+PRODUCER_WRITER_TASKS = int(os.getenv("PRODUCER_WRITER_TASKS", "1"))
+PRODUCER_DECODE_MODE = os.getenv("PRODUCER_DECODE_MODE", "strict")  # or "fast"
+# Keep writing the Decimal market_data.options table when NUMERIC_MODE=float
+PRODUCER_WRITE_AUDIT_TABLE = (
+    os.getenv("PRODUCER_WRITE_AUDIT_TABLE", "true").lower() == "true"
+)
+# Keep market_data.options_snapshot UNLOGGED (NUMERIC_MODE=float), its tick-rate
+# upserts then write no WAL. Postgres empties unlogged tables after a crash and
+# standbys cannot read them, so the snapshot is copied to the logged
+# options_snapshot_checkpoint table every SNAPSHOT_CHECKPOINT_INTERVAL seconds
+# and restored from it at startup. READ_DB_HOST is ignored while it is set
+SNAPSHOT_UNLOGGED = os.getenv("SNAPSHOT_UNLOGGED", "false").lower() == "true"
+SNAPSHOT_CHECKPOINT_INTERVAL = float(
+    os.getenv("SNAPSHOT_CHECKPOINT_INTERVAL", "60")
+)  # seconds
+# Symbols one websocket connection should carry before subscriptions are sharded
+PRODUCER_MAX_SYMBOLS_PER_CONNECTION = int(
+    os.getenv("PRODUCER_MAX_SYMBOLS_PER_CONNECTION", "1000")
+)
+
+# Append every tick to the day-partitioned market_data.options_ticks table
+PRODUCER_TICK_HISTORY = os.getenv("PRODUCER_TICK_HISTORY", "false").lower() == "true"
+PRODUCER_HISTORY_FLUSH_INTERVAL = float(
+    os.getenv("PRODUCER_HISTORY_FLUSH_INTERVAL", "1.0")
+)  # seconds
+PRODUCER_HISTORY_BATCH_SIZE = int(os.getenv("PRODUCER_HISTORY_BATCH_SIZE", "5000"))
+# Ticks kept in memory while the database is unavailable before dropping the oldest
+PRODUCER_HISTORY_MAX_PENDING = int(os.getenv("PRODUCER_HISTORY_MAX_PENDING", "100000"))
+# Delta websocket supervision
+DELTA_PING_INTERVAL = float(os.getenv("DELTA_PING_INTERVAL", "10"))  # seconds
+DELTA_PING_TIMEOUT = float(os.getenv("DELTA_PING_TIMEOUT", "10"))  # seconds
+# Reconnect when subscribed but no message arrived for this long
+DELTA_STALE_TIMEOUT = float(os.getenv("DELTA_STALE_TIMEOUT", "30"))  # seconds
+DELTA_RECONNECT_MIN_DELAY = float(os.getenv("DELTA_RECONNECT_MIN_DELAY", "0.5"))
+DELTA_RECONNECT_MAX_DELAY = float(os.getenv("DELTA_RECONNECT_MAX_DELAY", "30"))
+# Delta pushes v2/ticker about once per second per symbol, used to express
+# disconnects as missed ticker intervals
+DELTA_TICK_INTERVAL = float(os.getenv("DELTA_TICK_INTERVAL", "1.0"))  # seconds
+# Seconds the /v2/products options catalog is reused before a background refresh
+DELTA_PRODUCTS_TTL = float(os.getenv("DELTA_PRODUCTS_TTL", "300"))
+# Directory of the Parquet candle cache behind get_historical_data, empty disables it
+CANDLE_CACHE_DIR = os.getenv("CANDLE_CACHE_DIR", "")
+# File the raw v2/ticker frames are recorded to for replays, empty disables it
+DELTA_RECORD_PATH = os.getenv("DELTA_RECORD_PATH", "")
+# Pooled HTTP client shared by the Delta REST calls
+DELTA_HTTP_MAX_CONNECTIONS = int(os.getenv("DELTA_HTTP_MAX_CONNECTIONS", "20"))
+DELTA_HTTP_MAX_KEEPALIVE = int(os.getenv("DELTA_HTTP_MAX_KEEPALIVE", "10"))
+DELTA_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("DELTA_HTTP_KEEPALIVE_EXPIRY", "30"))
+DELTA_HTTP_TIMEOUT = float(os.getenv("DELTA_HTTP_TIMEOUT", "10"))  # seconds
+DELTA_HTTP_CONNECT_TIMEOUT = float(os.getenv("DELTA_HTTP_CONNECT_TIMEOUT", "5"))
+# HTTP/2 needs the optional h2 package (pip install httpx[http2])
+DELTA_HTTP2 = os.getenv("DELTA_HTTP2", "false").lower() == "true"
+# Client-side limit for Delta REST requests (token bucket shared per exchange)
+DELTA_REST_RATE_LIMIT = float(os.getenv("DELTA_REST_RATE_LIMIT", "8"))  # requests/s
+DELTA_REST_BURST = float(os.getenv("DELTA_REST_BURST", "8"))  # requests
+
+# Candle backfill
+PRODUCER_BACKFILL_CONCURRENCY = int(os.getenv("PRODUCER_BACKFILL_CONCURRENCY", "4"))
+PRODUCER_BACKFILL_RETRIES = int(os.getenv("PRODUCER_BACKFILL_RETRIES", "4"))
+PRODUCER_BACKFILL_RETRY_DELAY = float(
+    os.getenv("PRODUCER_BACKFILL_RETRY_DELAY", "0.5")
+)  # seconds, doubled per attempt
+# Default period of the background OHLCV sync jobs, in seconds
+PRODUCER_OHLCV_SYNC_INTERVAL = float(os.getenv("PRODUCER_OHLCV_SYNC_INTERVAL", "60"))
+# Candles per COPY chunk of a bulk candle load
+PRODUCER_CANDLE_COPY_CHUNK = int(os.getenv("PRODUCER_CANDLE_COPY_CHUNK", "50000"))
+
+# Multi-venue top of book
+# Comma separated venues streamed next to Delta into the consolidated book
+# (see services/producer/venues.py), empty streams Delta only
+PRODUCER_VENUES = [
+    venue for venue in os.getenv("PRODUCER_VENUES", "").split(",") if venue
+]
+# Seconds after which a venue's quote is left out of the consolidated book
+BOOK_STALE_AFTER = float(os.getenv("BOOK_STALE_AFTER", "10"))
+BINANCE_RECONNECT_MIN_DELAY = float(os.getenv("BINANCE_RECONNECT_MIN_DELAY", "0.5"))
+BINANCE_RECONNECT_MAX_DELAY = float(os.getenv("BINANCE_RECONNECT_MAX_DELAY", "30"))
+# Pooled HTTP client of the Binance REST calls
+BINANCE_HTTP_MAX_CONNECTIONS = int(os.getenv("BINANCE_HTTP_MAX_CONNECTIONS", "10"))
+BINANCE_HTTP_TIMEOUT = float(os.getenv("BINANCE_HTTP_TIMEOUT", "10"))  # seconds
+# A 1000 candle klines request weighs 2 of the 1200 per minute request weight
+BINANCE_REST_RATE_LIMIT = float(os.getenv("BINANCE_REST_RATE_LIMIT", "8"))  # requests/s
+BINANCE_REST_BURST = float(os.getenv("BINANCE_REST_BURST", "8"))  # requests
+
+# Local Delta Exchange simulator (services/exchange_sim)
+EXCHANGE_SIM_UNDERLYINGS = os.getenv("EXCHANGE_SIM_UNDERLYINGS", "BTC,ETH").split(",")
+EXCHANGE_SIM_STRIKES = int(os.getenv("EXCHANGE_SIM_STRIKES", "40"))  # per expiry
+EXCHANGE_SIM_EXPIRIES = int(os.getenv("EXCHANGE_SIM_EXPIRIES", "5"))  # daily expiries
+EXCHANGE_SIM_TICK_RATE = float(
+    os.getenv("EXCHANGE_SIM_TICK_RATE", "1.0")
+)  # tickers per second per symbol
+EXCHANGE_SIM_SEED = int(os.getenv("EXCHANGE_SIM_SEED", "7"))
 
 EXCHANGES = {
     "binance": {
@@ -34,8 +170,9 @@ EXCHANGES = {
         "api_secret": os.getenv("BINANCE_API_SECRET"),
     },
     "delta_exchange": {
-        "base_url": "https://api.india.delta.exchange",
-        "ws_url": "wss://socket.india.delta.exchange",
+        # Overridable to point at the local simulator (services/exchange_sim)
+        "base_url": os.getenv("DELTA_BASE_URL", "https://api.india.delta.exchange"),
+        "ws_url": os.getenv("DELTA_WS_URL", "wss://socket.india.delta.exchange"),
         "coins": ["BTCUSD", "ETHUSD"],
         "api_key": os.getenv("DELTA_API_KEY"),
         "api_secret": os.getenv("DELTA_API_SECRET"),
@@ -61,6 +61,11 @@ simulator_logger = setup_logger(
     log_file="simulator.log",
     file_logging_level=logging.INFO,
 )
+exchange_sim_logger = setup_logger(
+    logger_name="exchange_sim_logger",
+    log_file="exchange_sim.log",
+    file_logging_level=logging.INFO,
+)
 common_logger = setup_logger(
     logger_name="common_logger", log_file="common.log", file_logging_level=logging.DEBUG
 )
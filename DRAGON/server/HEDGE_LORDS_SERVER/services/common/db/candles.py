@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from sqlalchemy import Select, func, literal, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg
+from services.common.types.enums import Resolution, ResolutionSeconds
+from services.common.types.models import HistoricalData
+
+# Buckets are aligned to the epoch like the exchange's own candles
+BUCKET_ORIGIN = datetime.fromisoformat("1970-01-01T00:00:00+00:00")
+
+
+def resolution_seconds(resolution: Resolution) -> int:
+    return ResolutionSeconds[resolution.name].value
+
+
+def source_resolution(
+    resolution: Resolution, stored: Iterable[Resolution]
+) -> Optional[Resolution]:
+    """Stored resolution to serve ``resolution`` from, None if there is none.
+
+    The resolution itself when stored, else the coarsest stored one that
+    evenly divides it (fewest rows to aggregate).
+    """
+    stored = set(stored)
+    if resolution in stored:
+        return resolution
+    target = resolution_seconds(resolution)
+    divisors = [
+        candidate
+        for candidate in stored
+        if resolution_seconds(candidate) < target
+        and target % resolution_seconds(candidate) == 0
+    ]
+    return max(divisors, key=resolution_seconds, default=None)
+
+
+def stored_resolutions_query(symbol: str) -> Select:
+    return (
+        select(HistoricalData.resolution)
+        .where(HistoricalData.symbol == symbol)
+        .distinct()
+    )
+
+
+def candles_query(
+    symbol: str,
+    resolution: Resolution,
+    source: Resolution,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Select:
+    """OHLCV of ``symbol`` at ``resolution``, resampled from ``source`` candles.
+
+    With a coarser ``resolution`` the stored candles are aggregated by the
+    database into date_bin buckets: first open, highest high, lowest low,
+    last close and summed volume. Columns: time, open, high, low, close,
+    volume, in time order.
+    """
+    candles = HistoricalData
+    filters = [candles.symbol == symbol, candles.resolution == source.value]
+    if start is not None:
+        filters.append(candles.time >= start)
+    if end is not None:
+        filters.append(candles.time < end)
+
+    if resolution == source:
+        return (
+            select(
+                candles.time,
+                candles.open,
+                candles.high,
+                candles.low,
+                candles.close,
+                candles.volume,
+            )
+            .where(*filters)
+            .order_by(candles.time)
+        )
+
+    bucket = func.date_bin(
+        literal(timedelta(seconds=resolution_seconds(resolution))),
+        candles.time,
+        literal(BUCKET_ORIGIN),
+    ).label("time")
+    return (
+        select(
+            bucket,
+            array_agg(aggregate_order_by(candles.open, candles.time.asc()))[1].label(
+                "open"
+            ),
+            func.max(candles.high).label("high"),
+            func.min(candles.low).label("low"),
+            array_agg(aggregate_order_by(candles.close, candles.time.desc()))[1].label(
+                "close"
+            ),
+            func.sum(candles.volume).label("volume"),
+        )
+        .where(*filters)
+        .group_by(bucket)
+        .order_by(bucket)
+    )
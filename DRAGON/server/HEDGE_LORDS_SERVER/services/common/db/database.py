@@ -1,14 +1,23 @@
 import re
 import asyncio
+import hashlib
+import asyncpg
 from pathlib import Path
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import text
-from typing import AsyncGenerator, List
+from typing import Any, AsyncGenerator, Dict, List, Optional
 from contextlib import asynccontextmanager
 from pydantic_settings import BaseSettings
 from services.common.core.config import DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, DB_NAME
+from services.common.core.config import (
+    READ_DB_HOST,
+    READ_DB_PORT,
+    READ_DB_USER,
+    READ_DB_PASSWORD,
+    READ_DB_NAME,
+    SNAPSHOT_UNLOGGED,
+)
 from services.common.core.logging import common_logger as logger
 
 
@@ -19,12 +28,16 @@ class Settings(BaseSettings):
     DB_POOL_SIZE: int = 20
     DB_MAX_OVERFLOW: int = 10
     DB_POOL_TIMEOUT: int = 30
+    READ_DATABASE_URL: str = ""
+    READ_DB_POOL_SIZE: int = 20
+    READ_DB_MAX_OVERFLOW: int = 10
     MIGRATIONS_FOLDER: str = "services/common/migrations"
     RUN_MIGRATIONS: bool = True
 
     def model_post_init(self, __context):
         # Build the connection string after initialization
         self.DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+        self.READ_DATABASE_URL = f"postgresql+asyncpg://{READ_DB_USER}:{READ_DB_PASSWORD}@{READ_DB_HOST}:{READ_DB_PORT}/{READ_DB_NAME}"
 
     class Config:
         env_file = ".env"
@@ -42,6 +55,26 @@ connection_url = (
 logger.info(f"Database connection URL: {connection_url}")
 
 
+def use_read_database(read_host: Optional[str], snapshot_unlogged: bool) -> bool:
+    """Whether consumer reads get their own engine.
+
+    Standbys cannot read UNLOGGED tables, so with an unlogged snapshot reads
+    stay on the primary even when a read host is configured.
+    """
+    if read_host and snapshot_unlogged:
+        logger.warning(
+            "READ_DB_HOST is ignored: SNAPSHOT_UNLOGGED is set and standbys cannot "
+            "read the unlogged options_snapshot, reads stay on the primary"
+        )
+        return False
+    return bool(read_host)
+
+
+SEPARATE_READ_DATABASE = use_read_database(READ_DB_HOST, SNAPSHOT_UNLOGGED)
+if SEPARATE_READ_DATABASE:
+    logger.info(f"Read database host: {READ_DB_HOST}:{READ_DB_PORT}/{READ_DB_NAME}")
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -55,17 +88,42 @@ engine = create_async_engine(
     pool_pre_ping=True,
 )
 
+# Consumer reads go to their own engine when READ_DB_HOST is set, so polling
+# does not compete with ingest writes for the primary's pool and CPU
+read_engine = (
+    create_async_engine(
+        settings.READ_DATABASE_URL,
+        echo=False,
+        pool_size=settings.READ_DB_POOL_SIZE,
+        max_overflow=settings.READ_DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=True,
+    )
+    if SEPARATE_READ_DATABASE
+    else engine
+)
+
 AsyncSessionFactory = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
+ReadSessionFactory = async_sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
 
 
 @asynccontextmanager
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSessionFactory() as session:
+async def get_db_session(read_only: bool = False) -> AsyncGenerator[AsyncSession, None]:
+    """Session on the primary, committed on exit.
+
+    With ``read_only`` the session runs on the read engine and is only
+    rolled back, reads there may lag the primary by the replica lag.
+    """
+    factory = ReadSessionFactory if read_only else AsyncSessionFactory
+    async with factory() as session:
         try:
             yield session
-            await session.commit()
+            if not read_only:
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
@@ -73,34 +131,73 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+@asynccontextmanager
+async def get_raw_connection(read_only: bool = False) -> AsyncGenerator[Any, None]:
+    """Pooled asyncpg connection for driver-level APIs such as COPY.
+
+    Statements run in autocommit mode unless the caller opens a transaction.
+    With ``read_only`` the connection comes from the read engine.
+    """
+    async with (read_engine if read_only else engine).connect() as conn:
+        raw = await conn.get_raw_connection()
+        yield raw.driver_connection
+
+
+async def connect_dedicated() -> asyncpg.Connection:
+    """Open an asyncpg connection outside the pool.
+
+    For long-lived session state such as LISTEN, which must not be handed
+    back to the pool. The caller closes it.
+    """
+    return await asyncpg.connect(
+        user=DB_USER, password=DB_PASSWORD, host=DB_HOST, port=DB_PORT, database=DB_NAME
+    )
+
+
 # Usage in FastAPI through dependency injection
 async def db_session():
     async with get_db_session() as session:
         yield session
 
 
-async def create_migrations_table():
+async def read_db_session():
+    async with get_db_session(read_only=True) as session:
+        yield session
+
+
+# Session-level advisory lock serializing migration runs of concurrent workers
+MIGRATIONS_LOCK_ID = 0x48444C4D4947  # "HDLMIG"
+# First line of a migration that must run outside a transaction, e.g. for
+# CREATE INDEX CONCURRENTLY. Its statements run one by one in autocommit mode,
+# so they have to be safe to re-run after a failure (IF NOT EXISTS)
+NO_TRANSACTION_MARKER = "-- migrate: no-transaction"
+
+# Checksum manifest of the migrations folder the last run completed, kept as
+# the migrations table's comment. NULL while the table does not exist
+_MANIFEST_SQL = "SELECT obj_description(to_regclass('migrations'), 'pg_class')"
+
+
+async def create_migrations_table(conn):
     """Create the migrations table if it doesn't exist"""
-    async with AsyncSessionFactory() as session:
-        await session.execute(
-            text("""
-            CREATE TABLE IF NOT EXISTS migrations (
-                id SERIAL PRIMARY KEY,
-                filename VARCHAR(255) NOT NULL UNIQUE,
-                applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-            )
-            """)
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS migrations (
+            id SERIAL PRIMARY KEY,
+            filename VARCHAR(255) NOT NULL UNIQUE,
+            applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
         )
-        await session.commit()
+        """)
+    # Tables created before checksums were recorded
+    await conn.execute(
+        "ALTER TABLE migrations ADD COLUMN IF NOT EXISTS checksum VARCHAR(64)"
+    )
 
 
-async def get_applied_migrations() -> List[str]:
-    """Get list of migrations that have already been applied"""
-    async with AsyncSessionFactory() as session:
-        result = await session.execute(text("SELECT filename FROM migrations"))
-        applied_migrations = [row[0] for row in result.fetchall()]
-        logger.debug(f"Applied migrations: {applied_migrations}")
-        return applied_migrations
+async def get_applied_migrations(conn) -> Dict[str, Optional[str]]:
+    """Checksums of the migrations that have already been applied, by filename"""
+    rows = await conn.fetch("SELECT filename, checksum FROM migrations")
+    applied = {row["filename"]: row["checksum"] for row in rows}
+    logger.debug(f"Applied migrations: {list(applied)}")
+    return applied
 
 
 def get_migration_files() -> List[Path]:
@@ -132,16 +229,59 @@ def get_migration_files() -> List[Path]:
         # Extract number from patterns like 001_..., V1_..., etc.
         match = re.search(r"^(?:V|)(\d+)", filename.name)
         if match:
-            return int(match.group(1))
-        # If no number pattern found, use the filename as is
-        return filename.name
+            return (1, int(match.group(1)), filename.name)
+        # Unnumbered files predate the numbered ones, order them by name
+        return (0, 0, filename.name)
 
     # Sort files by their numeric prefix or name
     return sorted(files, key=get_number)
 
 
-async def apply_migration(filepath: Path):
-    """Apply a single migration file"""
+def file_checksum(filepath: Path) -> str:
+    return hashlib.sha256(filepath.read_bytes()).hexdigest()
+
+
+def migrations_manifest(checksums: Dict[str, str]) -> str:
+    """One checksum over the names and contents of all migration files"""
+    digest = hashlib.sha256()
+    for filename, checksum in checksums.items():
+        digest.update(f"{filename}:{checksum}\n".encode())
+    return digest.hexdigest()
+
+
+def split_statements(sql_content: str) -> List[str]:
+    """Split SQL content into statements by ;, skipping -- comments.
+
+    Semicolons inside comments and quoted strings do not end a statement.
+    """
+    statements, current = [], []
+    quoted = False
+    i = 0
+    while i < len(sql_content):
+        char = sql_content[i]
+        if char == "'":
+            quoted = not quoted
+        elif not quoted and sql_content.startswith("--", i):
+            end = sql_content.find("\n", i)
+            i = len(sql_content) if end == -1 else end
+            continue
+        elif not quoted and char == ";":
+            statements.append("".join(current))
+            current = []
+            i += 1
+            continue
+        current.append(char)
+        i += 1
+    statements.append("".join(current))
+    return [stmt.strip() for stmt in statements if stmt.strip()]
+
+
+async def apply_migration(conn, filepath: Path, checksum: str):
+    """Apply a single migration file and record it.
+
+    The statements and the record share one transaction, unless the file
+    starts with NO_TRANSACTION_MARKER.
+    """
     logger.info(f"Applying migration: {filepath.name}")
 
     # Read the SQL file content
@@ -153,60 +293,90 @@ async def apply_migration(filepath: Path):
         raise
 
     logger.debug(f"Migration SQL content length: {len(sql_content)} characters")
+    statements = split_statements(sql_content)
+    transactional = not sql_content.lstrip().startswith(NO_TRANSACTION_MARKER)
 
-    # Execute the SQL within a transaction
-    async with AsyncSessionFactory() as session:
-        async with session.begin():
-            try:
-                # Split SQL content into statements by ; and execute each one
-                # This handles multi-statement migrations better
-                statements = [
-                    stmt.strip() for stmt in sql_content.split(";") if stmt.strip()
-                ]
-
-                for i, stmt in enumerate(statements):
-                    if stmt:
-                        logger.debug(
-                            f"Executing statement {i + 1}/{len(statements)} from {filepath.name}"
-                        )
-                        await session.execute(text(stmt))
-
-                # Record the migration
-                await session.execute(
-                    text("INSERT INTO migrations (filename) VALUES (:filename)"),
-                    {"filename": filepath.name},
-                )
-
-                logger.info(f"Successfully applied migration: {filepath.name}")
-            except Exception as e:
-                logger.error(f"Failed to apply migration {filepath.name}: {str(e)}")
-                raise
-
-
-async def run_migrations():
-    """Run all pending migrations"""
-    logger.info("Checking for database migrations to apply...")
+    async def execute_all():
+        for i, stmt in enumerate(statements):
+            logger.debug(
+                f"Executing statement {i + 1}/{len(statements)} from {filepath.name}"
+            )
+            await conn.execute(stmt)
+        await conn.execute(
+            "INSERT INTO migrations (filename, checksum) VALUES ($1, $2)",
+            filepath.name,
+            checksum,
+        )
 
-    # Ensure migrations table exists
-    await create_migrations_table()
+    try:
+        if transactional:
+            async with conn.transaction():
+                await execute_all()
+        else:
+            await execute_all()
+        logger.info(f"Successfully applied migration: {filepath.name}")
+    except Exception as e:
+        logger.error(f"Failed to apply migration {filepath.name}: {str(e)}")
+        raise
 
-    # Get applied migrations
-    applied = await get_applied_migrations()
 
-    # Get all migration files
-    migrations = get_migration_files()
+async def apply_pending_migrations(
+    conn, migrations: List[Path], checksums: Dict[str, str]
+):
+    """Apply the migrations not recorded yet, holding the migrations lock"""
+    await create_migrations_table(conn)
+    applied = await get_applied_migrations(conn)
 
-    # Count pending migrations
     pending_migrations = [m for m in migrations if m.name not in applied]
     logger.info(f"Found {len(pending_migrations)} pending migrations to apply")
 
-    # Apply pending migrations
     for migration_file in migrations:
-        if migration_file.name not in applied:
-            logger.info(f"Applying new migration: {migration_file.name}")
-            await apply_migration(migration_file)
+        name = migration_file.name
+        if name not in applied:
+            logger.info(f"Applying new migration: {name}")
+            await apply_migration(conn, migration_file, checksums[name])
+        elif applied[name] is None:
+            await conn.execute(
+                "UPDATE migrations SET checksum = $1 WHERE filename = $2",
+                checksums[name],
+                name,
+            )
+        elif applied[name] != checksums[name]:
+            logger.warning(
+                f"Migration {name} changed after it was applied, it is not re-run"
+            )
         else:
-            logger.debug(f"Skipping already applied migration: {migration_file.name}")
+            logger.debug(f"Skipping already applied migration: {name}")
+
+
+async def run_migrations():
+    """Run all pending migrations.
+
+    When the stored manifest matches the migrations folder there is nothing
+    to do, which costs one query. Otherwise the run holds an advisory lock, so
+    concurrent workers apply each file once; a worker that waited for the
+    lock finds the new manifest and returns.
+    """
+    logger.info("Checking for database migrations to apply...")
+
+    migrations = get_migration_files()
+    checksums = {path.name: file_checksum(path) for path in migrations}
+    manifest = migrations_manifest(checksums)
+
+    async with get_raw_connection() as conn:
+        if await conn.fetchval(_MANIFEST_SQL) == manifest:
+            logger.info("Database migrations are up to date")
+            return
+
+        await conn.execute("SELECT pg_advisory_lock($1)", MIGRATIONS_LOCK_ID)
+        try:
+            if await conn.fetchval(_MANIFEST_SQL) == manifest:
+                logger.info("Database migrations were applied by another worker")
+                return
+            await apply_pending_migrations(conn, migrations, checksums)
+            await conn.execute(f"COMMENT ON TABLE migrations IS '{manifest}'")
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATIONS_LOCK_ID)
 
     logger.info("Database migrations completed")
 
@@ -0,0 +1,162 @@
+import asyncio
+from typing import Iterable, Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from services.common.db.database import connect_dedicated
+from services.common.core.config import LIVE_NOTIFY_CHANNEL
+from services.common.core.logging import common_logger as logger
+
+# NOTIFY payloads must stay below 8000 bytes
+MAX_PAYLOAD_BYTES = 7900
+SEPARATOR = ","
+# Payload telling listeners to drop what they know and re-read everything
+RESET = "*"
+
+
+def chunk_symbols(
+    symbols: Iterable[str], max_bytes: int = MAX_PAYLOAD_BYTES
+) -> list[str]:
+    """Pack symbols into comma separated payloads that fit in one NOTIFY"""
+    payloads = []
+    current: list[str] = []
+    size = 0
+    for symbol in symbols:
+        length = len(symbol.encode()) + len(SEPARATOR)
+        if current and size + length > max_bytes:
+            payloads.append(SEPARATOR.join(current))
+            current, size = [], 0
+        current.append(symbol)
+        size += length
+    if current:
+        payloads.append(SEPARATOR.join(current))
+    return payloads
+
+
+async def notify_changed(
+    db: AsyncSession, channel: str, symbols: Iterable[str]
+) -> None:
+    """Announce changed symbols on ``channel``.
+
+    Sent in the caller's transaction, so Postgres delivers the notification
+    only once the rows it announces are committed.
+    """
+    for payload in chunk_symbols(symbols):
+        await db.execute(select(func.pg_notify(channel, payload)))
+
+
+async def notify_reset(db: AsyncSession, channel: str) -> None:
+    await db.execute(select(func.pg_notify(channel, RESET)))
+
+
+class ChangeSubscription:
+    """Changed symbols accumulated for one reader since its last wait()"""
+
+    def __init__(self):
+        self._changed: set[str] = set()
+        self._reset = False
+        self._event = asyncio.Event()
+
+    def _push(self, payload: str) -> None:
+        if payload == RESET:
+            self._reset = True
+        else:
+            self._changed.update(payload.split(SEPARATOR))
+        self._event.set()
+
+    def reset(self) -> None:
+        """Make the next wait() ask for a full re-read (e.g. after a reconnect)"""
+        self._reset = True
+        self._event.set()
+
+    async def wait(self, timeout: float) -> Optional[set[str]]:
+        """Wait for changes, returns the changed symbols.
+
+        Returns None when the reader should re-read everything: on a reset
+        notification, or when nothing arrived within ``timeout`` seconds.
+        """
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._event.clear()
+        if self._reset:
+            self._reset = False
+            self._changed = set()
+            return None
+        changed, self._changed = self._changed, set()
+        return changed
+
+
+class ChangeListener:
+    """LISTENs on one channel over a dedicated connection and fans the
+    notifications out to every subscription in this process.
+
+    The connection is re-established when it drops; subscriptions are told
+    to re-read everything since notifications may have been missed meanwhile.
+    """
+
+    def __init__(self, channel: str, retry_interval: float = 2.0):
+        self.channel = channel
+        self.retry_interval = retry_interval
+        self._subscriptions: list[ChangeSubscription] = []
+        self._connection = None
+        self._task: Optional[asyncio.Task] = None
+        self._lost = asyncio.Event()
+
+        # Metrics
+        self.notifications = 0
+        self.reconnects = 0
+
+    def subscribe(self) -> ChangeSubscription:
+        subscription = ChangeSubscription()
+        self._subscriptions.append(subscription)
+        self.start()
+        return subscription
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self._connection = await connect_dedicated()
+                self._lost.clear()
+                self._connection.add_termination_listener(lambda _: self._lost.set())
+                await self._connection.add_listener(self.channel, self._on_notify)
+                logger.info(f"Listening for changes on channel {self.channel}")
+                for subscription in self._subscriptions:
+                    subscription.reset()
+                await self._lost.wait()
+                logger.warning(f"Lost LISTEN connection for channel {self.channel}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error listening on channel {self.channel}: {e}")
+            self.reconnects += 1
+            await self._close_connection()
+            await asyncio.sleep(self.retry_interval)
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        self.notifications += 1
+        for subscription in self._subscriptions:
+            subscription._push(payload)
+
+    async def _close_connection(self) -> None:
+        if self._connection is not None:
+            try:
+                await self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self._close_connection()
+
+
+# Shared by the consumers of this process, started by the first subscribe()
+change_listener = ChangeListener(LIVE_NOTIFY_CHANNEL)
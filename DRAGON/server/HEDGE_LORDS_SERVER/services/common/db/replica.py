@@ -0,0 +1,57 @@
+from typing import Any
+from sqlalchemy import text
+from services.common.db.database import engine, read_engine
+
+# Replay position and age on the read side. A standby that has replayed
+# everything it received is not behind, however old its last transaction
+_REPLICA_STATUS_SQL = """
+SELECT
+    pg_is_in_recovery(),
+    pg_last_wal_replay_lsn()::text,
+    CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+_LAG_BYTES_SQL = "SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), CAST(:lsn AS pg_lsn))"
+
+
+async def replica_lag() -> dict[str, Any]:
+    """How far the read engine is behind the primary.
+
+    ``lag_seconds`` is the age of the last replayed transaction and
+    ``lag_bytes`` the WAL the standby still has to replay. Both are None for
+    a read database that is not a standby (a stand-in Postgres), and 0 when
+    reads share the primary's engine.
+    """
+    if read_engine is engine:
+        return {
+            "separate": False,
+            "in_recovery": False,
+            "lag_seconds": 0.0,
+            "lag_bytes": 0,
+        }
+
+    async with read_engine.connect() as conn:
+        in_recovery, replay_lsn, lag_seconds = (
+            await conn.execute(text(_REPLICA_STATUS_SQL))
+        ).one()
+    if not in_recovery:
+        return {
+            "separate": True,
+            "in_recovery": False,
+            "lag_seconds": None,
+            "lag_bytes": None,
+        }
+
+    async with engine.connect() as conn:
+        lag_bytes = (
+            await conn.execute(text(_LAG_BYTES_SQL), {"lsn": replay_lsn})
+        ).scalar()
+    return {
+        "separate": True,
+        "in_recovery": True,
+        "lag_seconds": float(lag_seconds) if lag_seconds is not None else None,
+        "lag_bytes": int(lag_bytes) if lag_bytes is not None else None,
+    }
@@ -2,9 +2,14 @@ import pandas as pd
 
 from datetime import date as Date
 from abc import ABC, abstractmethod
+from typing import Optional
+from services.common.exchanges.consolidated import NormalizedTick
 
 
 class BaseExchange(ABC):
+    # Name of the venue in normalized ticks
+    venue: str = ""
+
     def __init__(
         self,
         base_url: str,
@@ -28,11 +33,15 @@ class BaseExchange(ABC):
         pass
 
     @abstractmethod
-    async def subscribe(self, coin: str, date: Date) -> None:
+    async def subscribe(self, coin: str, date: Date) -> list[str]:
+        pass
+
+    @abstractmethod
+    async def subscribe_symbols(self, symbols: list[str]) -> None:
         pass
 
     @abstractmethod
-    async def unsubscribe(self) -> None:
+    async def unsubscribe(self, symbols: Optional[list[str]] = None) -> None:
         pass
 
     @property
@@ -44,6 +53,17 @@ class BaseExchange(ABC):
     async def filtered_contracts(self, coin: str, date: Date) -> list[str]:
         pass
 
+    @abstractmethod
+    def normalize(self, message: str) -> list[NormalizedTick]:
+        """Top-of-book updates carried by a websocket frame"""
+        pass
+
+    @abstractmethod
+    async def fetch_candles(
+        self, coin: str, resolution: str, start_date: Date, end_date: Date
+    ) -> pd.DataFrame:
+        pass
+
     @abstractmethod
     async def get_historical_data(
         self, coin: str, resolution: str, start_date: Date, end_date: Date
@@ -0,0 +1,268 @@
+import json
+import time
+import random
+import asyncio
+import httpx
+import msgspec
+import websockets
+import pandas as pd
+from datetime import date as Date, datetime
+from typing import Any, Optional
+from services.common.core.logging import common_logger as logger
+from services.common.core.config import (
+    EXCHANGES,
+    BINANCE_RECONNECT_MIN_DELAY,
+    BINANCE_RECONNECT_MAX_DELAY,
+    BINANCE_HTTP_MAX_CONNECTIONS,
+    BINANCE_HTTP_TIMEOUT,
+    BINANCE_REST_RATE_LIMIT,
+    BINANCE_REST_BURST,
+)
+from services.common.types.enums import Resolution
+from services.common.exchanges.base import BaseExchange
+from services.common.exchanges.consolidated import NormalizedTick, canonical_instrument
+from services.common.exchanges.ratelimit import TokenBucket
+
+# Binance kline intervals of the resolutions it supports
+KLINE_INTERVALS = {
+    Resolution.MINUTE_1: "1m",
+    Resolution.MINUTE_5: "5m",
+    Resolution.MINUTE_15: "15m",
+    Resolution.MINUTE_30: "30m",
+    Resolution.HOUR_1: "1h",
+    Resolution.HOUR_2: "2h",
+    Resolution.HOUR_4: "4h",
+    Resolution.HOUR_6: "6h",
+    Resolution.DAY_1: "1d",
+    Resolution.DAY_7: "1w",
+    Resolution.WEEK_1: "1w",
+}
+
+
+class BookTicker(msgspec.Struct):
+    """A <symbol>@bookTicker frame"""
+
+    s: str
+    b: str
+    B: str
+    a: str
+    A: str
+
+
+_decode_book_ticker = msgspec.json.Decoder(BookTicker).decode
+
+
+class BinanceExchange(BaseExchange):
+    """Binance spot best bid/ask over the bookTicker streams.
+
+    Binance lists no options, so the options methods return nothing; a
+    subscription for a coin streams its spot pair.
+    """
+
+    venue = "binance"
+
+    def __init__(self, on_message_callback: callable):
+        super().__init__(
+            base_url=EXCHANGES["binance"]["base_url"],
+            ws_url=EXCHANGES["binance"]["ws_url"],
+            api_key=EXCHANGES["binance"]["api_key"],
+            api_secret=EXCHANGES["binance"]["api_secret"],
+            on_message_callback=on_message_callback,
+        )
+        self.ws = None
+        self.should_stop = False
+        self._supervisor: Optional[asyncio.Task] = None
+        self.subscribed_symbols: dict[str, None] = {}
+        self._request_id = 0
+        self._http: Optional[httpx.AsyncClient] = None
+        self.rate_limiter = TokenBucket(BINANCE_REST_RATE_LIMIT, BINANCE_REST_BURST)
+
+        # Metrics
+        self.messages_received = 0
+        self.reconnects = 0
+        self.http_requests = 0
+        self.http_errors = 0
+
+    async def _open(self) -> None:
+        self.ws = await websockets.connect(self.ws_url)
+        if self.subscribed_symbols:
+            await self._send("SUBSCRIBE", list(self.subscribed_symbols))
+
+    async def _supervise(self) -> None:
+        """Read and reconnect with exponential backoff until disconnect()"""
+        delay = BINANCE_RECONNECT_MIN_DELAY
+        while not self.should_stop:
+            try:
+                if self.ws is None:
+                    await self._open()
+                    delay = BINANCE_RECONNECT_MIN_DELAY
+                async for message in self.ws:
+                    self.messages_received += 1
+                    await self.on_message_callback(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Binance connection error: {e}, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+                delay = min(delay * 2, BINANCE_RECONNECT_MAX_DELAY)
+            if self.ws is not None and not self.should_stop:
+                self.reconnects += 1
+            self.ws = None
+
+    async def connect(self) -> None:
+        self.should_stop = False
+        self._supervisor = asyncio.create_task(self._supervise())
+
+    async def disconnect(self) -> None:
+        self.should_stop = True
+        if self._supervisor:
+            self._supervisor.cancel()
+            await asyncio.gather(self._supervisor, return_exceptions=True)
+            self._supervisor = None
+        if self.ws:
+            try:
+                await self.ws.close()
+            except Exception as e:
+                logger.error(f"Error disconnecting from Binance: {e}")
+        self.ws = None
+        await self.close_http()
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Keep-alive connection pool for the REST API, reopened after close_http()"""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=httpx.Limits(max_connections=BINANCE_HTTP_MAX_CONNECTIONS),
+                timeout=BINANCE_HTTP_TIMEOUT,
+            )
+        return self._http
+
+    async def close_http(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def _get(self, path: str, params: dict[str, Any]) -> httpx.Response:
+        """GET through the shared pool and rate limiter"""
+        await self.rate_limiter.acquire()
+        self.http_requests += 1
+        try:
+            return await self.http.get(path, params=params)
+        except httpx.RequestError:
+            self.http_errors += 1
+            raise
+
+    async def _send(self, method: str, symbols: list[str]) -> None:
+        self._request_id += 1
+        message = {
+            "method": method,
+            "params": [f"{symbol.lower()}@bookTicker" for symbol in symbols],
+            "id": self._request_id,
+        }
+        await self.ws.send(json.dumps(message))
+
+    async def subscribe(self, coin: str, date: Date) -> list[str]:
+        """Stream the coin's spot pair, e.g. BTC, BTCUSD and BTCUSDT stream BTCUSDT"""
+        symbol = f"{canonical_instrument(coin).removesuffix('-USD')}USDT"
+        await self.subscribe_symbols([symbol])
+        return [symbol]
+
+    async def subscribe_symbols(self, symbols: list[str]) -> None:
+        self.subscribed_symbols.update(dict.fromkeys(symbols))
+        if self.ws:
+            await self._send("SUBSCRIBE", symbols)
+
+    async def unsubscribe(self, symbols: Optional[list[str]] = None) -> None:
+        symbols = list(self.subscribed_symbols) if symbols is None else symbols
+        for symbol in symbols:
+            self.subscribed_symbols.pop(symbol, None)
+        if self.ws and symbols:
+            await self._send("UNSUBSCRIBE", symbols)
+
+    @property
+    async def all_options_contracts(self) -> list[str]:
+        return []
+
+    async def filtered_contracts(self, coin: str, date: Date) -> list[str]:
+        return []
+
+    def normalize(self, message: str) -> list[NormalizedTick]:
+        try:
+            frame = _decode_book_ticker(message)
+        except msgspec.DecodeError:
+            # Subscription acknowledgements and other non-ticker frames
+            return []
+        return [
+            NormalizedTick(
+                venue=self.venue,
+                instrument=canonical_instrument(frame.s),
+                symbol=frame.s,
+                timestamp=int(time.time() * 1_000_000),
+                bid=float(frame.b),
+                ask=float(frame.a),
+                bid_size=float(frame.B),
+                ask_size=float(frame.A),
+            )
+        ]
+
+    async def fetch_candles(
+        self,
+        coin: str,
+        resolution: Resolution,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> pd.DataFrame:
+        """One /api/v3/klines request (at most 1000 candles), raises on errors"""
+        interval = KLINE_INTERVALS.get(resolution)
+        if interval is None:
+            raise ValueError(f"Binance has no {resolution.value} klines")
+        params = {
+            "symbol": coin,
+            "interval": interval,
+            "startTime": int(start_date.timestamp() * 1000),
+            "endTime": int(end_date.timestamp() * 1000),
+            "limit": 1000,
+        }
+        response = await self._get("/api/v3/klines", params)
+        response.raise_for_status()
+        klines = response.json()
+        df = pd.DataFrame(
+            [kline[:6] for kline in klines],
+            columns=["time", "open", "high", "low", "close", "volume"],
+        )
+        df["time"] = pd.to_datetime(df["time"], unit="ms", utc=True)
+        for column in ("open", "high", "low", "close", "volume"):
+            df[column] = df[column].astype(float)
+        df["symbol"] = coin
+        return df
+
+    async def get_historical_data(
+        self,
+        coin: str,
+        resolution: Resolution,
+        start_date: datetime,
+        end_date: datetime,
+        set_index: bool = False,
+    ) -> pd.DataFrame:
+        try:
+            df = await self.fetch_candles(coin, resolution, start_date, end_date)
+        except Exception as e:
+            logger.error(f"Error fetching Binance klines for {coin}: {e}")
+            df = pd.DataFrame(
+                columns=["open", "high", "low", "close", "volume", "time"]
+            )
+        if set_index and not df.empty:
+            df = df.set_index("time")
+        return df
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            "connected": self.ws is not None,
+            "subscribed_symbols": len(self.subscribed_symbols),
+            "messages_received": self.messages_received,
+            "reconnects": self.reconnects,
+            "http_requests": self.http_requests,
+            "http_errors": self.http_errors,
+        }
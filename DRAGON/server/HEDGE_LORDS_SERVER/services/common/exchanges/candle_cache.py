@@ -0,0 +1,171 @@
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+from services.common.core.logging import common_logger as logger
+from services.common.types.enums import Resolution, ResolutionSeconds
+
+CACHE_COLUMNS = ["time", "open", "high", "low", "close", "volume", "symbol"]
+CACHE_SCHEMA = pa.schema(
+    [
+        ("time", pa.timestamp("us", tz="UTC")),
+        ("open", pa.float64()),
+        ("high", pa.float64()),
+        ("low", pa.float64()),
+        ("close", pa.float64()),
+        ("volume", pa.float64()),
+        ("symbol", pa.string()),
+    ]
+)
+# Most candles a single request may ask for
+MAX_CANDLES_PER_REQUEST = 2000
+
+CandleFetch = Callable[[str, Resolution, datetime, datetime], Awaitable[pd.DataFrame]]
+
+
+def day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def days_between(start: datetime, end: datetime) -> list[date]:
+    """UTC days touched by [start, end)"""
+    start = start.astimezone(timezone.utc)
+    last = (end.astimezone(timezone.utc) - timedelta(microseconds=1)).date()
+    days = []
+    day = start.date()
+    while day <= last:
+        days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def missing_runs(days: list[date], cached: set[date]) -> list[list[date]]:
+    """Consecutive days that are not cached, grouped into runs"""
+    runs: list[list[date]] = []
+    for day in days:
+        if day in cached:
+            continue
+        if runs and runs[-1][-1] == day - timedelta(days=1):
+            runs[-1].append(day)
+        else:
+            runs.append([day])
+    return runs
+
+
+class CandleCache:
+    """Read-through Parquet cache of exchange candles.
+
+    One file per symbol, resolution and UTC day under
+    ``root/<symbol>/<resolution>/<YYYY-MM-DD>.parquet``. Range queries read
+    the cached days memory-mapped and fetch only the missing days through
+    ``fetch`` (e.g. DeltaExchange.fetch_candles). Days that have not ended
+    yet, and days the fetch returned no candles for, are served but never
+    written, so a cached day is always complete.
+    """
+
+    def __init__(self, root: str, fetch: CandleFetch):
+        self.root = Path(root)
+        self.fetch = fetch
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.fetches = 0
+
+    def path(self, symbol: str, resolution: Resolution, day: date) -> Path:
+        return self.root / symbol / resolution.value / f"{day.isoformat()}.parquet"
+
+    def _read(self, path: Path) -> pa.Table:
+        table = pq.read_table(path, memory_map=True)
+        self.bytes_read += path.stat().st_size
+        return table
+
+    def _write(self, path: Path, table: pa.Table) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written aside and renamed so readers never see a partial file
+        tmp = path.with_suffix(".tmp")
+        pq.write_table(table, tmp)
+        os.replace(tmp, path)
+        self.bytes_written += path.stat().st_size
+
+    async def _fetch_days(
+        self, symbol: str, resolution: Resolution, days: list[date]
+    ) -> pa.Table:
+        """Fetch a run of consecutive days, caching the ones that are over"""
+        step = ResolutionSeconds[resolution.name].value
+        days_per_request = max(1, MAX_CANDLES_PER_REQUEST * step // 86400)
+        frames = []
+        for i in range(0, len(days), days_per_request):
+            chunk = days[i : i + days_per_request]
+            self.fetches += 1
+            frames.append(
+                await self.fetch(
+                    symbol,
+                    resolution,
+                    day_start(chunk[0]),
+                    day_start(chunk[-1] + timedelta(days=1)),
+                )
+            )
+        df = pd.concat(frames, ignore_index=True).reindex(columns=CACHE_COLUMNS)
+        prices = CACHE_COLUMNS[1:-1]
+        df[prices] = df[prices].astype(float)
+        table = pa.Table.from_pandas(df, schema=CACHE_SCHEMA, preserve_index=False)
+
+        now = datetime.now(timezone.utc)
+        day_of = pc.cast(table["time"], pa.date32())
+        for day in days:
+            if day_start(day + timedelta(days=1)) > now:
+                continue
+            partition = table.filter(pc.equal(day_of, pa.scalar(day)))
+            if not partition.num_rows:
+                # A transient empty result or a listing gap, not known complete
+                continue
+            self._write(self.path(symbol, resolution, day), partition)
+        return table
+
+    async def get(
+        self, symbol: str, resolution: Resolution, start: datetime, end: datetime
+    ) -> pd.DataFrame:
+        """Candles with start <= time < end, in time order"""
+        days = days_between(start, end)
+        cached = {day for day in days if self.path(symbol, resolution, day).exists()}
+        self.hits += len(cached)
+        self.misses += len(days) - len(cached)
+
+        tables = [
+            self._read(self.path(symbol, resolution, day)) for day in sorted(cached)
+        ]
+        for run in missing_runs(days, cached):
+            tables.append(await self._fetch_days(symbol, resolution, run))
+        if not tables:
+            return pd.DataFrame(columns=CACHE_COLUMNS)
+
+        df = pa.concat_tables(tables).to_pandas()
+        df = df[(df["time"] >= start) & (df["time"] < end)]
+        logger.debug(
+            f"Candle cache {symbol} {resolution.value}: {len(cached)}/{len(days)} days cached"
+        )
+        return (
+            df.drop_duplicates(subset=["time"], keep="last")
+            .sort_values("time")
+            .reset_index(drop=True)
+        )
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "root": str(self.root),
+            "partition_hits": self.hits,
+            "partition_misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "fetches": self.fetches,
+        }
@@ -0,0 +1,181 @@
+import time
+import asyncio
+from datetime import date, datetime
+from functools import lru_cache
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Optional
+from services.common.core.logging import common_logger as logger
+from services.common.types.models import OptionContract
+
+
+@lru_cache(maxsize=65536)
+def expiry_from_symbol(symbol: str) -> Optional[date]:
+    """Expiry of a dated contract symbol such as "C-BTC-90000-010325".
+
+    None for perpetuals and anything else without a DDMMYY part. Cached, the
+    producer calls it for every tick of a bounded set of symbols.
+    """
+    parts = symbol.split("-")
+    if len(parts) != 4:
+        return None
+    try:
+        return datetime.strptime(parts[3], "%d%m%y").date()
+    except ValueError:
+        return None
+
+
+def parse_option_product(product: dict[str, Any]) -> Optional[OptionContract]:
+    """Parse a /v2/products entry, None for anything but a dated option.
+
+    Symbols look like "C-BTC-90000-010325": type, underlying, strike and the
+    expiry as DDMMYY.
+    """
+    parts = product.get("symbol", "").split("-")
+    if len(parts) != 4:
+        return None
+    try:
+        return OptionContract(
+            symbol=product["symbol"],
+            contract_type=product.get("contract_type")
+            or ("call_options" if parts[0] == "C" else "put_options"),
+            underlying_asset_symbol=parts[1],
+            strike_price=Decimal(product.get("strike_price") or parts[2]),
+            expiry_date=expiry_from_symbol(product["symbol"]),
+            product_id=product.get("id"),
+        )
+    except Exception as e:
+        logger.debug(f"Skipping product {product.get('symbol')}: {e}")
+        return None
+
+
+class ProductsCatalog:
+    """Live option contracts, parsed once and indexed by (underlying, expiry).
+
+    ``fetch`` downloads the raw product list. The first lookup waits for it;
+    afterwards lookups are served from memory and a lookup on a catalog older
+    than ``ttl`` seconds triggers a background refresh (the stale catalog is
+    served meanwhile). ``start`` additionally refreshes every ``ttl`` seconds.
+    """
+
+    def __init__(
+        self, fetch: Callable[[], Awaitable[list[dict[str, Any]]]], ttl: float
+    ):
+        self.fetch = fetch
+        self.ttl = ttl
+        self._by_expiry: dict[tuple[str, date], list[OptionContract]] = {}
+        self._symbols: list[str] = []
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.refreshes = 0
+        self.failed_refreshes = 0
+        self.lookups = 0
+
+    @property
+    def age(self) -> Optional[float]:
+        if self._loaded_at is None:
+            return None
+        return time.monotonic() - self._loaded_at
+
+    async def refresh(self, force: bool = True) -> None:
+        """Download and re-index the catalog, the old one is kept on failure.
+
+        Without ``force`` a catalog younger than ``ttl`` is left alone, so
+        concurrent callers share one download.
+        """
+        async with self._lock:
+            if not force and self._loaded_at is not None and self.age < self.ttl:
+                return
+            try:
+                products = await self.fetch()
+            except Exception as e:
+                self.failed_refreshes += 1
+                logger.error(f"Error refreshing products catalog: {e}")
+                return
+            if not products and self._symbols:
+                # An empty answer is far more likely an API hiccup than no options
+                self.failed_refreshes += 1
+                logger.warning("Products catalog refresh returned nothing, keeping it")
+                return
+
+            by_expiry: dict[tuple[str, date], list[OptionContract]] = {}
+            symbols = []
+            for product in products:
+                contract = parse_option_product(product)
+                if contract is None:
+                    continue
+                symbols.append(contract.symbol)
+                by_expiry.setdefault(
+                    (contract.underlying_asset_symbol, contract.expiry_date), []
+                ).append(contract)
+            for contracts in by_expiry.values():
+                contracts.sort(key=lambda c: (c.strike_price, c.contract_type.value))
+
+            self._by_expiry = by_expiry
+            self._symbols = symbols
+            self._loaded_at = time.monotonic()
+            self.refreshes += 1
+            logger.info(
+                f"Products catalog refreshed: {len(symbols)} options, {len(by_expiry)} expiries"
+            )
+
+    async def _ensure_fresh(self) -> None:
+        if self._loaded_at is None:
+            await self.refresh(force=False)
+        elif self.age > self.ttl and (
+            self._refresh_task is None or self._refresh_task.done()
+        ):
+            self._refresh_task = asyncio.create_task(self.refresh(force=False))
+
+    async def symbols(self) -> list[str]:
+        """Symbols of every live option"""
+        await self._ensure_fresh()
+        return list(self._symbols)
+
+    async def contracts(
+        self, underlying: str, expiry_date: date
+    ) -> list[OptionContract]:
+        """Options of one underlying (e.g. "BTC") and expiry, sorted by strike"""
+        self.lookups += 1
+        await self._ensure_fresh()
+        return list(self._by_expiry.get((underlying, expiry_date), ()))
+
+    async def expiries(self, underlying: str) -> list[date]:
+        await self._ensure_fresh()
+        return sorted(
+            expiry for asset, expiry in self._by_expiry if asset == underlying
+        )
+
+    async def _run(self) -> None:
+        while True:
+            await self.refresh(force=False)
+            await asyncio.sleep(self.ttl)
+
+    def start(self) -> None:
+        """Refresh in the background every ``ttl`` seconds"""
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        for task in (self._loop_task, self._refresh_task):
+            if task and not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._loop_task = None
+        self._refresh_task = None
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        age = self.age
+        return {
+            "options": len(self._symbols),
+            "expiries": len(self._by_expiry),
+            "age_s": round(age, 1) if age is not None else None,
+            "ttl_s": self.ttl,
+            "refreshes": self.refreshes,
+            "failed_refreshes": self.failed_refreshes,
+            "lookups": self.lookups,
+        }
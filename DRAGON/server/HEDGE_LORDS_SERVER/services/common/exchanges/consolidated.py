@@ -0,0 +1,172 @@
+import time
+import msgspec
+from typing import Any, Optional
+
+# Quote currencies treated as the same dollar for cross-venue comparison
+USD_QUOTES = ("USDT", "USDC", "USD")
+
+
+def canonical_instrument(symbol: str) -> str:
+    """Venue independent name of a spot or perpetual pair, e.g. "BTC-USD".
+
+    BTCUSDT (Binance) and BTCUSD (Delta perpetual) both become "BTC-USD";
+    symbols without a dollar quote (options) are kept as they are.
+    """
+    for quote in USD_QUOTES:
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            return f"{symbol[: -len(quote)]}-USD"
+    return symbol
+
+
+class NormalizedTick(msgspec.Struct, array_like=True):
+    """One top-of-book update from any venue"""
+
+    venue: str
+    instrument: str  # canonical_instrument of the venue symbol
+    symbol: str  # the venue's own symbol
+    timestamp: int  # microseconds since the epoch
+    bid: Optional[float] = None
+    ask: Optional[float] = None
+    bid_size: Optional[float] = None
+    ask_size: Optional[float] = None
+    spot: Optional[float] = None  # index / spot price the venue reports
+
+
+def _float(value: Any) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def delta_tick(row: dict[str, Any]) -> Optional[NormalizedTick]:
+    """Normalize a Delta ticker row (market_data.options columns)"""
+    if row.get("best_bid") is None and row.get("best_ask") is None:
+        return None
+    return NormalizedTick(
+        venue="delta_exchange",
+        instrument=canonical_instrument(row["symbol"]),
+        symbol=row["symbol"],
+        timestamp=row.get("timestamp") or int(time.time() * 1_000_000),
+        bid=_float(row.get("best_bid")),
+        ask=_float(row.get("best_ask")),
+        bid_size=_float(row.get("bid_size")),
+        ask_size=_float(row.get("ask_size")),
+        spot=_float(row.get("spot_price")),
+    )
+
+
+class _Instrument:
+    """Latest tick per venue plus the cached best bid and ask"""
+
+    __slots__ = ("ticks", "best_bid", "best_ask")
+
+    def __init__(self):
+        self.ticks: dict[str, NormalizedTick] = {}
+        self.best_bid: Optional[NormalizedTick] = None
+        self.best_ask: Optional[NormalizedTick] = None
+
+    def recompute(self, stale_before: int = 0) -> None:
+        fresh = [t for t in self.ticks.values() if t.timestamp >= stale_before]
+        self.best_bid = max(
+            (t for t in fresh if t.bid is not None), key=lambda t: t.bid, default=None
+        )
+        self.best_ask = min(
+            (t for t in fresh if t.ask is not None), key=lambda t: t.ask, default=None
+        )
+
+
+class ConsolidatedBook:
+    """Cross-venue top of book per instrument, kept in memory.
+
+    ``update`` is O(1) in the number of ticks and instruments: it replaces
+    the venue's quote and compares it with the cached best bid and ask. Only
+    when the venue holding the best price backs off are the instrument's
+    venues (a handful) scanned again. Quotes older than ``stale_after``
+    seconds are left out when reading.
+    """
+
+    def __init__(self, stale_after: float = 10.0):
+        self.stale_after = stale_after
+        self._instruments: dict[str, _Instrument] = {}
+        self.updates = 0
+        self.recomputes = 0
+
+    def update(self, tick: NormalizedTick) -> None:
+        instrument = self._instruments.get(tick.instrument)
+        if instrument is None:
+            instrument = self._instruments[tick.instrument] = _Instrument()
+        instrument.ticks[tick.venue] = tick
+        self.updates += 1
+
+        best_bid, best_ask = instrument.best_bid, instrument.best_ask
+        bid_backed_off = (
+            best_bid is not None
+            and best_bid.venue == tick.venue
+            and (tick.bid is None or tick.bid < best_bid.bid)
+        )
+        ask_backed_off = (
+            best_ask is not None
+            and best_ask.venue == tick.venue
+            and (tick.ask is None or tick.ask > best_ask.ask)
+        )
+        if bid_backed_off or ask_backed_off:
+            self.recomputes += 1
+            instrument.recompute()
+            return
+
+        if tick.bid is not None and (
+            best_bid is None or best_bid.venue == tick.venue or tick.bid >= best_bid.bid
+        ):
+            instrument.best_bid = tick
+        if tick.ask is not None and (
+            best_ask is None or best_ask.venue == tick.venue or tick.ask <= best_ask.ask
+        ):
+            instrument.best_ask = tick
+
+    def _stale_before(self) -> int:
+        return int((time.time() - self.stale_after) * 1_000_000)
+
+    def top(self, instrument: str) -> Optional[dict[str, Any]]:
+        """Best bid and ask across venues, None for an unknown instrument"""
+        state = self._instruments.get(instrument)
+        if state is None:
+            return None
+        stale_before = self._stale_before()
+        if any(
+            best is not None and best.timestamp < stale_before
+            for best in (state.best_bid, state.best_ask)
+        ):
+            # Not stored back: a stale venue may still be the freshest one later
+            view = _Instrument()
+            view.ticks = state.ticks
+            view.recompute(stale_before)
+            state = view
+        bid, ask = state.best_bid, state.best_ask
+        spots = [
+            t.spot
+            for t in state.ticks.values()
+            if t.spot is not None and t.timestamp >= stale_before
+        ]
+        return {
+            "instrument": instrument,
+            "best_bid": bid.bid if bid else None,
+            "best_bid_venue": bid.venue if bid else None,
+            "best_ask": ask.ask if ask else None,
+            "best_ask_venue": ask.venue if ask else None,
+            "mid": (bid.bid + ask.ask) / 2 if bid and ask else None,
+            "spot": sum(spots) / len(spots) if spots else None,
+            "venues": {
+                venue: {"bid": t.bid, "ask": t.ask, "spot": t.spot}
+                for venue, t in state.ticks.items()
+            },
+        }
+
+    @property
+    def instruments(self) -> list[str]:
+        return list(self._instruments)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            "instruments": len(self._instruments),
+            "updates": self.updates,
+            "recomputes": self.recomputes,
+        }
@@ -1,18 +1,65 @@
 import json
+import time
 import httpx
+import random
 import asyncio
 import websockets
 import pandas as pd
 
 from datetime import datetime
 from datetime import date as Date
+from typing import Any, Optional
 from services.common.types.enums import Resolution
 from services.common.core.logging import common_logger as logger
-from services.common.core.config import EXCHANGES
+from services.common.core.config import (
+    EXCHANGES,
+    DELTA_PING_INTERVAL,
+    DELTA_PING_TIMEOUT,
+    DELTA_STALE_TIMEOUT,
+    DELTA_RECONNECT_MIN_DELAY,
+    DELTA_RECONNECT_MAX_DELAY,
+    DELTA_TICK_INTERVAL,
+    DELTA_PRODUCTS_TTL,
+    DELTA_HTTP_MAX_CONNECTIONS,
+    DELTA_HTTP_MAX_KEEPALIVE,
+    DELTA_HTTP_KEEPALIVE_EXPIRY,
+    DELTA_HTTP_TIMEOUT,
+    DELTA_HTTP_CONNECT_TIMEOUT,
+    DELTA_HTTP2,
+    DELTA_REST_RATE_LIMIT,
+    DELTA_REST_BURST,
+    CANDLE_CACHE_DIR,
+    DELTA_RECORD_PATH,
+)
 from services.common.exchanges.base import BaseExchange
+from services.common.exchanges.catalog import ProductsCatalog
+from services.common.exchanges.candle_cache import CandleCache
+from services.common.exchanges.recording import FrameRecorder
+from services.common.exchanges.consolidated import NormalizedTick, delta_tick
+from services.common.exchanges.ratelimit import TokenBucket
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("DELTA_HTTP2 is set but h2 is not installed, using HTTP/1.1")
+        return False
+    return True
+
+
+def normalize_ticker(data: dict[str, Any]) -> list[NormalizedTick]:
+    """DeltaExchange.normalize of an already decoded v2/ticker frame"""
+    if data.get("type") != "v2/ticker":
+        return []
+    quotes = data.get("quotes") or {}
+    tick = delta_tick({**data, **quotes})
+    return [tick] if tick else []
 
 
 class DeltaExchange(BaseExchange):
+    venue = "delta_exchange"
+
     def __init__(self, on_message_callback: callable):
         super().__init__(
             base_url=EXCHANGES["delta_exchange"]["base_url"],
@@ -22,43 +69,191 @@ class DeltaExchange(BaseExchange):
             on_message_callback=on_message_callback,
         )
         self.ws = None
+        self.should_stop = False
+        self._supervisor: Optional[asyncio.Task] = None
+        # Replayed after every reconnect
+        self.subscribed_symbols: dict[str, None] = {}
+        self.catalog = ProductsCatalog(self.fetch_option_products, DELTA_PRODUCTS_TTL)
+        self._http: Optional[httpx.AsyncClient] = None
+        self.http2_enabled = False
+        self.rate_limiter = TokenBucket(DELTA_REST_RATE_LIMIT, DELTA_REST_BURST)
+        self.candle_cache: Optional[CandleCache] = (
+            CandleCache(CANDLE_CACHE_DIR, self.fetch_candles)
+            if CANDLE_CACHE_DIR
+            else None
+        )
+        self.recorder: Optional[FrameRecorder] = None
+
+        # Metrics
+        self.messages_received = 0
+        self.last_message_at: Optional[float] = None
+        self.disconnects = 0
+        self.reconnects = 0
+        self.disconnected_at: Optional[float] = None
+        self.last_disconnect_seconds = 0.0
+        self.total_disconnect_seconds = 0.0
+        self.missed_intervals = 0
+        self.missed_ticks = 0
+        self.http_requests = 0
+        self.http_errors = 0
+        self.http_total_ms = 0.0
 
     async def listen(self) -> None:
+        """Read the open connection until it closes or goes stale"""
         try:
-            async for message in self.ws:
+            while True:
+                # Without subscriptions silence is expected, pings still run
+                timeout = DELTA_STALE_TIMEOUT if self.subscribed_symbols else None
+                message = await asyncio.wait_for(self.ws.recv(), timeout=timeout)
+                self.messages_received += 1
+                self.last_message_at = time.monotonic()
+                if self.recorder and "v2/ticker" in message:
+                    self.recorder.record(message)
                 await self.on_message_callback(message)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"No data from Delta Exchange for {DELTA_STALE_TIMEOUT}s, reconnecting"
+            )
+            await self.ws.close()
+        except websockets.ConnectionClosed as e:
+            if not self.should_stop:
+                logger.warning(f"Delta Exchange connection closed: {e}")
         except Exception as e:
             logger.error(f"Error listening to Delta Exchange: {e}")
+            await self.ws.close()
+
+    async def _open(self) -> None:
+        """Open the websocket and replay the active subscriptions"""
+        self.ws = await websockets.connect(
+            self.ws_url,
+            ping_interval=DELTA_PING_INTERVAL,
+            ping_timeout=DELTA_PING_TIMEOUT,
+        )
+        if self.disconnected_at is not None:
+            gap = time.monotonic() - self.disconnected_at
+            self.disconnected_at = None
+            self.reconnects += 1
+            self.last_disconnect_seconds = gap
+            self.total_disconnect_seconds += gap
+            self.missed_intervals += int(gap / DELTA_TICK_INTERVAL)
+            # Estimated ticker messages lost across all subscribed symbols
+            self.missed_ticks += int(gap / DELTA_TICK_INTERVAL) * len(
+                self.subscribed_symbols
+            )
+            logger.info(
+                f"Reconnected to Delta Exchange after {gap:.1f}s, "
+                f"replaying {len(self.subscribed_symbols)} symbols"
+            )
+        if self.subscribed_symbols:
+            await self._send_subscribe(list(self.subscribed_symbols))
+
+    async def _supervise(self) -> None:
+        """Keep the connection up, reconnecting with exponential backoff"""
+        delay = DELTA_RECONNECT_MIN_DELAY
+        while not self.should_stop:
+            if self.ws is None:
+                try:
+                    await self._open()
+                    delay = DELTA_RECONNECT_MIN_DELAY
+                except Exception as e:
+                    logger.error(
+                        f"Error connecting to Delta Exchange: {e}, retrying in {delay:.1f}s"
+                    )
+                    await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+                    delay = min(delay * 2, DELTA_RECONNECT_MAX_DELAY)
+                    continue
+
+            await self.listen()
+            self.ws = None
+            if not self.should_stop:
+                self.disconnects += 1
+                self.disconnected_at = time.monotonic()
 
     async def connect(self) -> None:
+        self.should_stop = False
+        if DELTA_RECORD_PATH and self.recorder is None:
+            self.recorder = FrameRecorder(DELTA_RECORD_PATH)
         try:
-            self.ws = await websockets.connect(self.ws_url)
-            asyncio.create_task(self.listen())
+            await self._open()
         except Exception as e:
+            # The supervisor keeps retrying
             logger.error(f"Error connecting to Delta Exchange: {e}")
+            self.disconnected_at = time.monotonic()
+        self._supervisor = asyncio.create_task(self._supervise())
+        self.catalog.start()
 
     async def disconnect(self) -> None:
+        self.should_stop = True
         try:
-            await self.ws.close()
+            if self.ws:
+                await self.ws.close()
         except Exception as e:
             logger.error(f"Error disconnecting from Delta Exchange: {e}")
+        if self._supervisor:
+            self._supervisor.cancel()
+            await asyncio.gather(self._supervisor, return_exceptions=True)
+            self._supervisor = None
+        self.ws = None
+        await self.catalog.stop()
+        await self.close_http()
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
 
-    async def subscribe(self, coin: str, date: Date) -> None:
-        try:
-            if not self.ws:
-                raise RuntimeError("Not connected to Delta Exchange")
+    @property
+    def connected(self) -> bool:
+        return self.ws is not None and self.disconnected_at is None
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Connection health and data gap metrics"""
+        now = time.monotonic()
+        current_gap = now - self.disconnected_at if self.disconnected_at else 0.0
+        return {
+            "connected": self.connected,
+            "subscribed_symbols": len(self.subscribed_symbols),
+            "messages_received": self.messages_received,
+            "last_message_age_s": (
+                round(now - self.last_message_at, 3) if self.last_message_at else None
+            ),
+            "disconnects": self.disconnects,
+            "reconnects": self.reconnects,
+            "current_disconnect_s": round(current_gap, 3),
+            "last_disconnect_s": round(self.last_disconnect_seconds, 3),
+            "total_disconnect_s": round(self.total_disconnect_seconds + current_gap, 3),
+            "missed_intervals": self.missed_intervals
+            + int(current_gap / DELTA_TICK_INTERVAL),
+            "missed_ticks": self.missed_ticks,
+            "recording": self.recorder.stats if self.recorder else None,
+        }
 
-            contracts = await self.filtered_contracts(coin, date)
-            logger.info(f"Subscribing to contracts: {contracts}")
-            contracts.append(coin)
+    async def subscribe(self, coin: str, date: Date) -> list[str]:
+        """Subscribe to an expiry's contracts and the underlying, returns the symbols"""
+        contracts = await self.filtered_contracts(coin, date)
+        contracts.append(coin)
+        await self.subscribe_symbols(contracts)
+        return contracts
 
+    async def subscribe_symbols(self, symbols: list[str]) -> None:
+        """Add symbols to the ticker channel, they are replayed on reconnect"""
+        self.subscribed_symbols.update(dict.fromkeys(symbols))
+        if not self.ws:
+            logger.warning(
+                f"Not connected to Delta Exchange, {len(symbols)} symbols will be subscribed on reconnect"
+            )
+            return
+        await self._send_subscribe(symbols)
+
+    async def _send_subscribe(self, symbols: list[str]) -> None:
+        try:
+            logger.info(f"Subscribing to contracts: {symbols}")
             message = {
                 "type": "subscribe",
                 "payload": {
                     "channels": [
                         {
                             "name": "v2/ticker",
-                            "symbols": contracts,
+                            "symbols": symbols,
                         }
                     ]
                 },
@@ -67,108 +262,167 @@ class DeltaExchange(BaseExchange):
         except Exception as e:
             logger.error(f"Error subscribing to Delta Exchange: {e}")
 
-    async def unsubscribe(self) -> None:
+    async def unsubscribe(self, symbols: Optional[list[str]] = None) -> None:
+        """Remove symbols from the ticker channel, all of them when None"""
+        if symbols is None:
+            self.subscribed_symbols.clear()
+        else:
+            for symbol in symbols:
+                self.subscribed_symbols.pop(symbol, None)
         if not self.ws:
             return
 
         try:
             message = {
                 "type": "unsubscribe",
-                "payload": {"channels": [{"name": "v2/ticker", "symbols": [""]}]},
+                "payload": {
+                    "channels": [{"name": "v2/ticker", "symbols": symbols or [""]}]
+                },
             }
             await self.ws.send(json.dumps(message))
         except Exception as e:
             logger.error(f"Error unsubscribing from Delta Exchange: {e}")
 
     @property
-    async def all_options_contracts(self) -> list[str]:
+    def http(self) -> httpx.AsyncClient:
+        """Keep-alive connection pool for the REST API, reopened after close_http()"""
+        if self._http is None or self._http.is_closed:
+            self.http2_enabled = DELTA_HTTP2 and _http2_available()
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=self.http2_enabled,
+                limits=httpx.Limits(
+                    max_connections=DELTA_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=DELTA_HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=DELTA_HTTP_KEEPALIVE_EXPIRY,
+                ),
+                timeout=httpx.Timeout(
+                    DELTA_HTTP_TIMEOUT, connect=DELTA_HTTP_CONNECT_TIMEOUT
+                ),
+            )
+        return self._http
+
+    async def close_http(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def _get(self, path: str, params: dict[str, Any]) -> httpx.Response:
+        """GET through the shared pool and rate limiter, with request metrics"""
+        await self.rate_limiter.acquire()
+        start = time.perf_counter()
+        self.http_requests += 1
+        try:
+            return await self.http.get(path, params=params)
+        except httpx.RequestError:
+            self.http_errors += 1
+            raise
+        finally:
+            self.http_total_ms += (time.perf_counter() - start) * 1000
+
+    @property
+    def http_stats(self) -> dict[str, Any]:
+        """Request counters of the shared client"""
+        return {
+            "http2": self.http2_enabled,
+            "max_connections": DELTA_HTTP_MAX_CONNECTIONS,
+            "requests": self.http_requests,
+            "errors": self.http_errors,
+            "avg_request_ms": (
+                round(self.http_total_ms / self.http_requests, 3)
+                if self.http_requests
+                else 0.0
+            ),
+            "rate_limit_wait_s": round(self.rate_limiter.waited_seconds, 3),
+        }
+
+    async def fetch_option_products(self) -> list[dict[str, Any]]:
+        """Download the live option products, raises on failure"""
         params = {"contract_types": "call_options,put_options", "states": "live"}
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/v2/products", params=params
-                )
-                response.raise_for_status()
-                data = response.json()
+        response = await self._get("/v2/products", params)
+        response.raise_for_status()
+        data = response.json()
+        if not data["success"]:
+            raise RuntimeError(f"Delta Exchange products request failed: {data}")
+        return data["result"]
 
-                if data["success"]:
-                    return [product["symbol"] for product in data["result"]]
-                return []
-            except httpx.RequestError as e:
-                self.logger.error(f"Delta Exchange API error: {e}")
-                return []
+    @property
+    async def all_options_contracts(self) -> list[str]:
+        return await self.catalog.symbols()
 
     async def filtered_contracts(self, coin: str, date: Date) -> list[str]:
-        contracts = await self.all_options_contracts
-        return [
-            contract
-            for contract in contracts
-            if (parts := contract.split("-"))
-            and len(parts) == 4
-            and parts[1] == coin[:3]
-            and datetime.strptime(parts[3], "%d%m%y").date() == date
-        ]
+        contracts = await self.catalog.contracts(coin[:3], date)
+        return [contract.symbol for contract in contracts]
 
-    async def get_historical_data(
+    def normalize(self, message: str) -> list[NormalizedTick]:
+        return normalize_ticker(json.loads(message))
+
+    async def fetch_candles(
         self,
         coin: str,
         resolution: Resolution,
         start_date: datetime,
         end_date: datetime,
-        set_index: bool = False,
     ) -> pd.DataFrame:
+        """One /v2/history/candles request, raises on HTTP and API errors"""
         params = {
             "resolution": resolution.value,
             "symbol": coin,
             "start": int(start_date.timestamp()),
             "end": int(end_date.timestamp()),
         }
-        df = pd.DataFrame(columns=["open", "high", "low", "close", "volume", "time"])
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/v2/history/candles", params=params
-                )
+        response = await self._get("/v2/history/candles", params)
+        response.raise_for_status()
+        data = response.json()
+        if not data.get("success"):
+            raise RuntimeError(f"Delta Exchange candles request failed: {data}")
 
-                # Check for HTTP errors
-                response.raise_for_status()
-                data = response.json()
-                # Check API-level success indicator
-                if data.get("success") and data.get(
-                    "result"
-                ):  # Use .get for safer access
-                    temp_df = pd.DataFrame(data["result"])
-                    if temp_df.empty:
-                        self.logger.warning(
-                            f"Received empty result list for {coin} from API for {resolution} resolution and dates {start_date} to {end_date}."
-                        )
-
-                    temp_df["time"] = pd.to_datetime(
-                        temp_df["time"], unit="s", utc=True
-                    )
-                    temp_df["symbol"] = coin
-                    df = temp_df
-                else:
-                    self.logger.warning(
-                        f"API call for {coin} did not succeed or returned no result. Response: {data}"
-                    )
+        df = pd.DataFrame(
+            data.get("result") or [],
+            columns=["time", "open", "high", "low", "close", "volume"],
+        )
+        df["time"] = pd.to_datetime(df["time"], unit="s", utc=True)
+        df["symbol"] = coin
+        return df
 
-            except httpx.RequestError as e:
-                # Network-level errors (connection, timeout, etc.)
-                self.logger.error(f"Delta Exchange API request error for {coin}: {e}")
-            except httpx.HTTPStatusError as e:
-                # HTTP errors (4xx, 5xx)
-                self.logger.error(
-                    f"Delta Exchange API HTTP status error for {coin}: {e.response.status_code} - {e.response.text}"
-                )
-            except Exception as e:
-                # Other potential errors (e.g., JSON decoding)
-                self.logger.error(
-                    f"Unexpected error fetching historical data for {coin}: {e}",
-                    exc_info=True,
+    async def get_historical_data(
+        self,
+        coin: str,
+        resolution: Resolution,
+        start_date: datetime,
+        end_date: datetime,
+        set_index: bool = False,
+    ) -> pd.DataFrame:
+        """Candles of one range, an empty frame on errors.
+
+        Served through the Parquet candle cache when CANDLE_CACHE_DIR is set.
+        """
+        df = pd.DataFrame(columns=["open", "high", "low", "close", "volume", "time"])
+        try:
+            if self.candle_cache:
+                df = await self.candle_cache.get(coin, resolution, start_date, end_date)
+            else:
+                df = await self.fetch_candles(coin, resolution, start_date, end_date)
+            if df.empty:
+                logger.warning(
+                    f"Received empty result list for {coin} from API for {resolution} resolution and dates {start_date} to {end_date}."
                 )
-            finally:
-                if set_index and not df.empty and "time" in df.columns:
-                    df = df.set_index("time")
-                return df
+        except httpx.RequestError as e:
+            # Network-level errors (connection, timeout, etc.)
+            logger.error(f"Delta Exchange API request error for {coin}: {e}")
+        except httpx.HTTPStatusError as e:
+            # HTTP errors (4xx, 5xx)
+            logger.error(
+                f"Delta Exchange API HTTP status error for {coin}: {e.response.status_code} - {e.response.text}"
+            )
+        except Exception as e:
+            # Other potential errors (e.g., JSON decoding)
+            logger.error(
+                f"Unexpected error fetching historical data for {coin}: {e}",
+                exc_info=True,
+            )
+        finally:
+            if set_index and not df.empty and "time" in df.columns:
+                df = df.set_index("time")
+            return df
@@ -0,0 +1,41 @@
+import time
+import asyncio
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` tokens per second, bursts up to ``capacity``.
+
+    Waiters are served in arrival order, a caller that has to wait holds the
+    lock so later callers cannot overtake it.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+        # Metrics
+        self.acquired = 0
+        self.waited_seconds = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                delay = (tokens - self._tokens) / self.rate
+                self.waited_seconds += delay
+                await asyncio.sleep(delay)
+                self._refill()
+            self._tokens -= tokens
+            self.acquired += 1
@@ -0,0 +1,182 @@
+import os
+import gzip
+import time
+import zlib
+import struct
+import asyncio
+from typing import Any, Awaitable, Callable, Iterator, Optional
+from services.common.core.logging import common_logger as logger
+
+# Record header: receive time (epoch seconds) and frame length in bytes
+_HEADER = struct.Struct("<dI")
+
+
+def _records(path: str) -> Iterator[tuple[float, str]]:
+    """Like read_frames, but raises where the recording is cut short"""
+    with gzip.open(path, "rb") as file:
+        while True:
+            header = file.read(_HEADER.size)
+            if not header:
+                return
+            if len(header) < _HEADER.size:
+                raise EOFError("truncated frame header")
+            received_at, length = _HEADER.unpack(header)
+            payload = file.read(length)
+            if len(payload) < length:
+                raise EOFError("truncated frame")
+            yield received_at, payload.decode()
+
+
+def read_frames(path: str) -> Iterator[tuple[float, str]]:
+    """(receive time, frame) pairs of a recording, in recorded order.
+
+    A recording whose last gzip member was never closed (crash or a recorder
+    still running) ends at its last complete frame.
+    """
+    try:
+        yield from _records(path)
+    except (EOFError, zlib.error, gzip.BadGzipFile) as e:
+        logger.warning(f"Recording {path} is cut short ({e}), stopping there")
+
+
+def repair_recording(path: str) -> int:
+    """Rewrite a recording cut short to its complete frames.
+
+    New gzip members appended after an unclosed one could not be read, so a
+    recorder repairs the file before appending. Returns the number of frames
+    kept, -1 when the file was intact (or missing) and left alone.
+    """
+    if not os.path.exists(path):
+        return -1
+    try:
+        for _ in _records(path):
+            pass
+        return -1
+    except (EOFError, zlib.error, gzip.BadGzipFile):
+        pass
+    repaired = f"{path}.repair"
+    frames = 0
+    with gzip.open(repaired, "wb", compresslevel=1) as file:
+        for received_at, frame in read_frames(path):
+            payload = frame.encode()
+            file.write(_HEADER.pack(received_at, len(payload)) + payload)
+            frames += 1
+    os.replace(repaired, path)
+    logger.warning(f"Repaired recording {path}, kept {frames} frames")
+    return frames
+
+
+class FrameRecorder:
+    """Appends raw websocket frames with their receive time to a gzip file.
+
+    Every frame is a length-prefixed record. The gzip member is closed and a
+    new one started every ``member_frames`` frames or ``member_interval``
+    seconds, and by every recording session. Gzip readers see the members as
+    one stream, so recordings accumulate in one append-only file and a crash
+    loses at most the frames of the open member.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        compresslevel: int = 1,
+        member_frames: int = 10000,
+        member_interval: float = 10.0,
+    ):
+        self.path = path
+        self.compresslevel = compresslevel
+        self.member_frames = member_frames
+        self.member_interval = member_interval
+        repair_recording(path)
+        self._open_member()
+        self.frames = 0
+        self.bytes = 0
+        self.members = 1
+        logger.info(f"Recording websocket frames to {path}")
+
+    def _open_member(self) -> None:
+        self._file = gzip.open(self.path, "ab", compresslevel=self.compresslevel)
+        self._member_frames = 0
+        self._member_started = time.monotonic()
+
+    def record(self, frame: str, received_at: Optional[float] = None) -> None:
+        payload = frame.encode()
+        self._file.write(
+            _HEADER.pack(received_at or time.time(), len(payload)) + payload
+        )
+        self.frames += 1
+        self.bytes += len(payload)
+        self._member_frames += 1
+        if (
+            self._member_frames >= self.member_frames
+            or time.monotonic() - self._member_started >= self.member_interval
+        ):
+            self._file.close()
+            self._open_member()
+            self.members += 1
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+            logger.info(f"Recorded {self.frames} frames to {self.path}")
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "frames": self.frames,
+            "bytes": self.bytes,
+            "members": self.members,
+        }
+
+
+class FrameReplayer:
+    """Feeds a recording back through a message handler.
+
+    ``speed`` 1.0 keeps the recorded timing, 10.0 replays ten times faster
+    and None sends every frame as soon as the handler returns.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        handler: Callable[[str], Awaitable[None]],
+        speed: Optional[float] = 1.0,
+    ):
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive, or None for max speed")
+        self.path = path
+        self.handler = handler
+        self.speed = speed
+
+    async def run(self) -> dict[str, Any]:
+        """Replay the whole recording, returns throughput and pacing metrics"""
+        frames = 0
+        max_lag = 0.0
+        first_received: Optional[float] = None
+        start = time.perf_counter()
+        for received_at, frame in read_frames(self.path):
+            if self.speed is not None:
+                if first_received is None:
+                    first_received = received_at
+                due = start + (received_at - first_received) / self.speed
+                ahead = due - time.perf_counter()
+                if ahead > 0:
+                    await asyncio.sleep(ahead)
+                else:
+                    # Behind schedule: the handler is slower than the recording
+                    max_lag = max(max_lag, -ahead)
+            await self.handler(frame)
+            frames += 1
+            if self.speed is None and frames % 1000 == 0:
+                # Let the writer tasks run between bursts
+                await asyncio.sleep(0)
+
+        elapsed = time.perf_counter() - start
+        return {
+            "frames": frames,
+            "elapsed_s": round(elapsed, 3),
+            "frames_per_sec": round(frames / elapsed, 1) if elapsed else 0.0,
+            "speed": self.speed,
+            "max_lag_s": round(max_lag, 3),
+        }
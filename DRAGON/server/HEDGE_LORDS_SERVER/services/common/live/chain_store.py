@@ -0,0 +1,310 @@
+import os
+import math
+import numpy as np
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Iterable, Optional
+from services.common.core.logging import common_logger as logger
+
+# Numeric columns published for every symbol, NaN when unknown
+CHAIN_FIELDS = (
+    "mark_price",
+    "spot_price",
+    "strike_price",
+    "best_bid",
+    "best_ask",
+    "bid_size",
+    "ask_size",
+    "bid_iv",
+    "ask_iv",
+    "mark_iv",
+    "delta",
+    "gamma",
+    "theta",
+    "vega",
+    "rho",
+)
+
+# Quote and greek fields keep their last value when a tick omits them, the same
+# partial update rule as the market_data.options upsert
+_MERGE_FIELDS = frozenset(CHAIN_FIELDS) - {"mark_price", "spot_price", "strike_price"}
+
+CHAIN_DTYPE = np.dtype(
+    [
+        ("symbol", "S50"),
+        ("contract_type", "S20"),
+        ("underlying_asset_symbol", "S20"),
+        ("expiry_date", "S10"),  # ISO date, empty for futures
+        ("timestamp", "i8"),
+    ]
+    + [(field, "f8") for field in CHAIN_FIELDS]
+)
+
+# Header layout, one cache line of int64 slots ahead of the records
+_MAGIC = 0x48444745434841  # "HDGECHA"
+_H_MAGIC, _H_SEQ, _H_COUNT, _H_CAPACITY, _H_OPEN, _H_PID = range(6)
+_HEADER_BYTES = 64
+_MAX_READ_RETRIES = 1000
+# Segments created by this process, see ChainStore.attach
+_created: set[str] = set()
+_EMPTY_RECORD = (b"", b"", b"", b"", 0) + (math.nan,) * len(CHAIN_FIELDS)
+
+
+def _untrack(shm: SharedMemory) -> None:
+    """Keep the resource tracker from unlinking a segment this process did not create"""
+    if os.name == "posix":
+        resource_tracker.unregister(f"/{shm.name}", "shared_memory")
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, owned by another user
+        return True
+    return True
+
+
+def _is_stale(shm: SharedMemory) -> bool:
+    """The segment's writer closed it or is gone, so it can be replaced"""
+    if shm.size < _HEADER_BYTES:
+        return True
+    header = np.ndarray((8,), dtype=np.int64, buffer=shm.buf)
+    stale = (
+        header[_H_MAGIC] != _MAGIC
+        or not header[_H_OPEN]
+        or not _pid_alive(int(header[_H_PID]))
+    )
+    del header
+    return bool(stale)
+
+
+class ChainStore:
+    """Latest options chain in a shared-memory segment, keyed by symbol.
+
+    The segment holds a small int64 header followed by a fixed capacity
+    array of CHAIN_DTYPE records. One producer process writes it, any number
+    of consumer processes on the same host map it read-only.
+
+    Consistency uses a seqlock: the writer makes the sequence counter odd
+    before touching the records and even again afterwards, readers copy the
+    records and retry if the counter was odd or changed meanwhile. The even
+    counter doubles as a version number for cheap change detection.
+    """
+
+    def __init__(self, shm: SharedMemory, owner: bool):
+        self._shm = shm
+        self.owner = owner
+        self._header = np.ndarray((8,), dtype=np.int64, buffer=shm.buf)
+        capacity = int(self._header[_H_CAPACITY])
+        self._records = np.ndarray(
+            (capacity,), dtype=CHAIN_DTYPE, buffer=shm.buf, offset=_HEADER_BYTES
+        )
+        # Symbol to slot, only maintained by the writer
+        self._slots: dict[str, int] = {}
+        self.overflowed = 0
+
+    @staticmethod
+    def segment_size(capacity: int) -> int:
+        return _HEADER_BYTES + capacity * CHAIN_DTYPE.itemsize
+
+    @classmethod
+    def create(cls, name: str, capacity: int) -> "ChainStore":
+        """Create the segment as its single writer.
+
+        A segment left behind by a writer that closed it or exited is
+        replaced, one whose writer is still running raises RuntimeError.
+        """
+        size = cls.segment_size(capacity)
+        try:
+            shm = SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            existing = SharedMemory(name=name)
+            if not _is_stale(existing):
+                _untrack(existing)
+                existing.close()
+                raise RuntimeError(
+                    f"Live chain store {name} is still written by another process"
+                )
+            # Left behind by a producer that exited, start from a fresh segment
+            existing.close()
+            existing.unlink()
+            shm = SharedMemory(name=name, create=True, size=size)
+
+        _created.add(name)
+        header = np.ndarray((8,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[_H_CAPACITY] = capacity
+        header[_H_MAGIC] = _MAGIC
+        header[_H_OPEN] = 1
+        header[_H_PID] = os.getpid()
+        logger.info(
+            f"Live chain store created: {name} ({capacity} symbols, {size} bytes)"
+        )
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> Optional["ChainStore"]:
+        """Map an existing segment as a reader, None if there is none yet"""
+        try:
+            shm = SharedMemory(name=name)
+        except FileNotFoundError:
+            return None
+        # Readers must not unlink the segment when they exit, only the creator
+        # owns it (the tracker would otherwise remove it on interpreter exit)
+        if name not in _created:
+            _untrack(shm)
+
+        header = np.ndarray((8,), dtype=np.int64, buffer=shm.buf)
+        usable = header[_H_MAGIC] == _MAGIC and header[_H_OPEN]
+        del header
+        if not usable:
+            shm.close()
+            return None
+        logger.info(f"Live chain store attached: {name}")
+        return cls(shm, owner=False)
+
+    @property
+    def version(self) -> int:
+        return int(self._header[_H_SEQ])
+
+    @property
+    def is_open(self) -> bool:
+        """False once the writer has closed the segment, readers should re-attach"""
+        return bool(self._header[_H_OPEN])
+
+    def __len__(self) -> int:
+        return int(self._header[_H_COUNT])
+
+    def update(self, rows: Iterable[dict[str, Any]]) -> None:
+        """Publish a batch of market_data.options rows in one write section"""
+        header = self._header
+        records = self._records
+        header[_H_SEQ] += 1  # odd: write in progress
+        try:
+            for row in rows:
+                symbol = row["symbol"]
+                slot = self._slots.get(symbol)
+                if slot is None:
+                    slot = int(header[_H_COUNT])
+                    if slot >= len(records):
+                        self.overflowed += 1
+                        continue
+                    records[slot] = _EMPTY_RECORD
+                    records[slot]["symbol"] = symbol.encode()
+                    self._slots[symbol] = slot
+                    header[_H_COUNT] = slot + 1
+
+                record = records[slot]
+                record["contract_type"] = row["contract_type"].encode()
+                record["underlying_asset_symbol"] = (
+                    row["underlying_asset_symbol"] or ""
+                ).encode()
+                expiry_date = row.get("expiry_date")
+                if expiry_date is not None:
+                    # Fixed per symbol, a new slot starts out empty
+                    record["expiry_date"] = expiry_date.isoformat().encode()
+                record["timestamp"] = row["timestamp"]
+                for field in CHAIN_FIELDS:
+                    value = row.get(field)
+                    if value is not None:
+                        record[field] = float(value)
+                    elif field not in _MERGE_FIELDS:
+                        record[field] = math.nan
+        finally:
+            header[_H_SEQ] += 1  # even: records are consistent
+
+    def remove(self, symbols: Iterable[str]) -> None:
+        """Drop symbols, the last record moves into each freed slot"""
+        header = self._header
+        records = self._records
+        header[_H_SEQ] += 1
+        try:
+            for symbol in symbols:
+                slot = self._slots.pop(symbol, None)
+                if slot is None:
+                    continue
+                last = int(header[_H_COUNT]) - 1
+                if slot != last:
+                    records[slot] = records[last]
+                    self._slots[records[slot]["symbol"].decode()] = slot
+                header[_H_COUNT] = last
+        finally:
+            header[_H_SEQ] += 1
+
+    def clear(self) -> None:
+        """Drop every symbol, e.g. when the producer switches subscriptions"""
+        self._header[_H_SEQ] += 1
+        self._header[_H_COUNT] = 0
+        self._slots.clear()
+        self._header[_H_SEQ] += 1
+
+    def snapshot(self) -> tuple[int, np.ndarray]:
+        """Consistent copy of the published records and the version they match.
+
+        The copy is a single memcpy of the used slots; readers that only need
+        a torn-tolerant look can index ``records`` directly without copying.
+        """
+        header = self._header
+        for _ in range(_MAX_READ_RETRIES):
+            before = int(header[_H_SEQ])
+            if before & 1:
+                continue
+            data = self._records[: int(header[_H_COUNT])].copy()
+            if int(header[_H_SEQ]) == before:
+                return before, data
+        raise RuntimeError("Live chain store is being rewritten continuously")
+
+    @property
+    def records(self) -> np.ndarray:
+        """Zero-copy view of the published records (may be mid-update)"""
+        return self._records[: len(self)]
+
+    def close(self) -> None:
+        """Unmap the segment, the owner also marks it closed and unlinks it"""
+        if self.owner:
+            self._header[_H_OPEN] = 0
+        # Views must be released before the buffer can be closed
+        self._header = None
+        self._records = None
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+            _created.discard(self._shm.name)
+
+
+def records_to_dicts(
+    records: np.ndarray, symbols: Optional[Iterable[str]] = None
+) -> list[dict[str, Any]]:
+    """Decode snapshot records into plain dicts, NaN becomes None.
+
+    With ``symbols`` only those symbols are returned.
+    """
+    if symbols is not None:
+        wanted = np.array([symbol.encode() for symbol in symbols], dtype="S50")
+        records = records[np.isin(records["symbol"], wanted)]
+    names = records.dtype.names
+    rows = []
+    for values in records.tolist():
+        row = {}
+        for name, value in zip(names, values):
+            if isinstance(value, bytes):
+                value = value.decode()
+            elif isinstance(value, float) and value != value:
+                value = None
+            row[name] = value
+        rows.append(row)
+    return rows
+
+
+def reattach(store: Optional[ChainStore], name: str) -> Optional[ChainStore]:
+    """Keep a reader's store while its writer has it open, else attach again"""
+    if store is not None:
+        if store.is_open:
+            return store
+        store.close()
+    return ChainStore.attach(name)
@@ -0,0 +1,35 @@
+-- Create schema if not exists
+CREATE SCHEMA IF NOT EXISTS market_data;
+
+-- Latest hot columns per symbol as double precision (NUMERIC_MODE=float)
+CREATE TABLE IF NOT EXISTS market_data.options_snapshot (
+    symbol VARCHAR(50) PRIMARY KEY,
+    timestamp BIGINT NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+
+    contract_type VARCHAR(20) NOT NULL,
+    underlying_asset_symbol VARCHAR(20) NOT NULL,
+
+    -- Price information
+    mark_price DOUBLE PRECISION,
+    spot_price DOUBLE PRECISION,
+    strike_price DOUBLE PRECISION,  -- NULL for futures
+
+    -- Quotes
+    best_bid DOUBLE PRECISION,
+    best_ask DOUBLE PRECISION,
+    bid_size DOUBLE PRECISION,
+    ask_size DOUBLE PRECISION,
+    bid_iv DOUBLE PRECISION,
+    ask_iv DOUBLE PRECISION,
+    mark_iv DOUBLE PRECISION,
+
+    -- Greeks (NULL for futures)
+    delta DOUBLE PRECISION,
+    gamma DOUBLE PRECISION,
+    theta DOUBLE PRECISION,
+    vega DOUBLE PRECISION,
+    rho DOUBLE PRECISION
+);
+
+COMMENT ON TABLE market_data.options_snapshot IS 'Latest float64 quote state per symbol, the live source when NUMERIC_MODE=float';
@@ -0,0 +1,44 @@
+-- Create schema if not exists
+CREATE SCHEMA IF NOT EXISTS market_data;
+
+-- Append-only tick history, one row per received ticker message.
+-- Partitioned by UTC day, the producer creates each day's partition on demand
+CREATE TABLE IF NOT EXISTS market_data.options_ticks (
+    time TIMESTAMP WITH TIME ZONE NOT NULL,  -- exchange timestamp of the tick
+    symbol VARCHAR(50) NOT NULL,
+    contract_type VARCHAR(20) NOT NULL,
+    underlying_asset_symbol VARCHAR(20) NOT NULL,
+
+    -- Price information
+    mark_price DOUBLE PRECISION,
+    spot_price DOUBLE PRECISION,
+    strike_price DOUBLE PRECISION,  -- NULL for futures
+
+    -- Quotes
+    best_bid DOUBLE PRECISION,
+    best_ask DOUBLE PRECISION,
+    bid_size DOUBLE PRECISION,
+    ask_size DOUBLE PRECISION,
+    bid_iv DOUBLE PRECISION,
+    ask_iv DOUBLE PRECISION,
+    mark_iv DOUBLE PRECISION,
+
+    -- Greeks (NULL for futures)
+    delta DOUBLE PRECISION,
+    gamma DOUBLE PRECISION,
+    theta DOUBLE PRECISION,
+    vega DOUBLE PRECISION,
+    rho DOUBLE PRECISION,
+
+    -- Volume and open interest
+    volume DOUBLE PRECISION,
+    oi DOUBLE PRECISION
+) PARTITION BY RANGE (time);
+
+COMMENT ON TABLE market_data.options_ticks IS 'Append-only intraday tick history, partitioned by day';
+
+-- Ticks arrive in time order, so a BRIN index stays tiny and still prunes time ranges
+CREATE INDEX IF NOT EXISTS idx_options_ticks_time_brin ON market_data.options_ticks USING BRIN (time);
+
+-- Per-symbol history lookups
+CREATE INDEX IF NOT EXISTS idx_options_ticks_symbol_time ON market_data.options_ticks (symbol, time);
@@ -0,0 +1,25 @@
+-- Candles of several symbols and resolutions side by side, keyed on
+-- (symbol, resolution, time). Coarser resolutions can also be resampled
+-- from stored finer candles, see services/common/db/candles.py
+
+-- The resolution of the existing candles was never recorded, they are a
+-- cache of exchange data and get re-synced by the next load
+TRUNCATE TABLE market_data.historical_data;
+
+ALTER TABLE market_data.historical_data
+    ADD COLUMN IF NOT EXISTS resolution VARCHAR(4) NOT NULL;
+
+ALTER TABLE market_data.historical_data DROP CONSTRAINT IF EXISTS historical_data_pkey;
+
+ALTER TABLE market_data.historical_data
+    ADD CONSTRAINT historical_data_pkey PRIMARY KEY (symbol, resolution, time);
+
+-- The primary key covers lookups by symbol
+DROP INDEX IF EXISTS market_data.idx_historical_data_symbol;
+
+-- Candles arrive in time order, a BRIN index serves time range scans at a
+-- fraction of a btree's size
+CREATE INDEX IF NOT EXISTS idx_historical_data_time_brin
+    ON market_data.historical_data USING BRIN (time);
+
+COMMENT ON TABLE market_data.historical_data IS 'OHLCV candles per symbol and resolution.';
@@ -0,0 +1,24 @@
+-- Expiry parsed from the symbol at ingest (NULL for perpetuals), so chain and
+-- selection queries filter and sort on columns instead of symbol strings.
+-- Underlying and side are already stored as underlying_asset_symbol and
+-- contract_type
+ALTER TABLE market_data.options ADD COLUMN IF NOT EXISTS expiry_date DATE;
+
+ALTER TABLE market_data.options_snapshot ADD COLUMN IF NOT EXISTS expiry_date DATE;
+
+-- Rows written before the column existed, symbols look like C-BTC-90000-010325
+UPDATE market_data.options
+    SET expiry_date = to_date(split_part(symbol, '-', 4), 'DDMMYY')
+    WHERE expiry_date IS NULL AND symbol ~ '^[CP]-[^-]+-[^-]+-[0-9]{6}$';
+
+UPDATE market_data.options_snapshot
+    SET expiry_date = to_date(split_part(symbol, '-', 4), 'DDMMYY')
+    WHERE expiry_date IS NULL AND symbol ~ '^[CP]-[^-]+-[^-]+-[0-9]{6}$';
+
+-- One chain (underlying and expiry) is a contiguous range, ordered by side
+-- and strike the way it is displayed
+CREATE INDEX IF NOT EXISTS idx_options_chain
+    ON market_data.options (underlying_asset_symbol, expiry_date, contract_type, strike_price);
+
+CREATE INDEX IF NOT EXISTS idx_options_snapshot_chain
+    ON market_data.options_snapshot (underlying_asset_symbol, expiry_date, contract_type, strike_price);
@@ -0,0 +1,14 @@
+-- Leave free space on every page of the latest-state tables so that quote
+-- updates stay HOT: the new row version goes on the same page and no index is
+-- touched. Pages written before keep their layout until the table is rewritten
+ALTER TABLE market_data.options SET (fillfactor = 70);
+
+ALTER TABLE market_data.options_snapshot SET (fillfactor = 70);
+
+-- Logged copy of options_snapshot. With SNAPSHOT_UNLOGGED=true the snapshot
+-- writes no WAL, so Postgres empties it after a crash. The producer copies it
+-- here periodically and restores it from here at startup
+CREATE TABLE IF NOT EXISTS market_data.options_snapshot_checkpoint
+    (LIKE market_data.options_snapshot INCLUDING DEFAULTS);
+
+COMMENT ON TABLE market_data.options_snapshot_checkpoint IS 'Periodic durable copy of options_snapshot, see services/producer/snapshot.py';
@@ -50,3 +50,41 @@ class OptionsTypes(Enum):
 
 class FuturesTypes(Enum):
     PERPETUAL_FUTURES = "perpetual_futures"
+
+
+class WriteMode(Enum):
+    ORM = "orm"
+    BATCH = "batch"
+
+
+class OverflowPolicy(Enum):
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+
+
+class DecodeMode(Enum):
+    STRICT = "strict"  # json + pydantic validation
+    FAST = "fast"  # msgspec straight to a table row
+
+
+class NumericMode(Enum):
+    DECIMAL = "decimal"
+    FLOAT = "float"
+
+    def to_float(self, value):
+        """A price column as float, FLOAT mode columns already are"""
+        if self is NumericMode.FLOAT or value is None:
+            return value
+        return float(value)
+
+
+class ChainQueryMode(Enum):
+    ORM = "orm"  # SQLAlchemy select, a SimpleTicker per row
+    PREPARED = "prepared"  # prepared statement returning the finished JSON message
+
+
+class LiveTransport(Enum):
+    POSTGRES = "postgres"  # consumers poll the live table
+    SHM = "shm"  # consumers read the shared-memory chain store
+    NOTIFY = "notify"  # consumers re-read the symbols announced via LISTEN/NOTIFY
@@ -9,6 +9,8 @@ from sqlalchemy import (
     Numeric,
     Text,
     BigInteger,
+    Double,
+    DATE,
 )
 from datetime import date as Date
 from sqlalchemy.sql import func
@@ -146,7 +148,8 @@ class HistoricalData(Base):
     __tablename__ = "historical_data"
     __table_args__ = {"schema": "market_data"}
 
-    symbol = Column(String(10), nullable=False)
+    symbol = Column(String(10), primary_key=True)
+    resolution = Column(String(4), primary_key=True)  # Resolution value, e.g. "1m"
     time = Column(TIMESTAMP(timezone=True), primary_key=True)
     open = Column(Numeric(20, 8))
     high = Column(Numeric(20, 8))
@@ -173,6 +176,7 @@ class Options(Base):
     # Contract information
     contract_type = Column(String(20), nullable=False)
     underlying_asset_symbol = Column(String(20), nullable=False)
+    expiry_date = Column(DATE)  # parsed from the symbol, NULL for futures
     description = Column(Text)
     product_id = Column(Integer)
 
@@ -231,6 +235,56 @@ class Options(Base):
     lower_limit = Column(Numeric(20, 8))
 
 
+class OptionsSnapshot(Base):
+    """SQLAlchemy model for the market_data.options_snapshot table.
+
+    Latest hot columns per symbol stored as double precision, used as the live
+    source when NUMERIC_MODE is "float".
+    """
+
+    __tablename__ = "options_snapshot"
+    __table_args__ = {"schema": "market_data"}
+
+    symbol = Column(String(50), primary_key=True)
+    timestamp = Column(BigInteger, nullable=False)
+    updated_at = Column(
+        TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    contract_type = Column(String(20), nullable=False)
+    underlying_asset_symbol = Column(String(20), nullable=False)
+    expiry_date = Column(DATE)
+
+    mark_price = Column(Double)
+    spot_price = Column(Double)
+    strike_price = Column(Double)
+
+    best_bid = Column(Double)
+    best_ask = Column(Double)
+    bid_size = Column(Double)
+    ask_size = Column(Double)
+    bid_iv = Column(Double)
+    ask_iv = Column(Double)
+    mark_iv = Column(Double)
+
+    delta = Column(Double)
+    gamma = Column(Double)
+    theta = Column(Double)
+    vega = Column(Double)
+    rho = Column(Double)
+
+
+class OptionContract(BaseModel):
+    """Parsed metadata of a live option product from /v2/products"""
+
+    symbol: str
+    contract_type: OptionsTypes
+    underlying_asset_symbol: str
+    strike_price: Decimal
+    expiry_date: Date
+    product_id: Optional[int] = None
+
+
 class SubscriptionRequest(BaseModel):
     symbol: str
     expiry_date: Date
@@ -242,6 +296,15 @@ class LoadOHLCVRequest(BaseModel):
     lookback_units: int  # e.g., number of lookback units, if 1hr resolution, and 2000 lookback units, it means 2000 hours of lookback
 
 
+class OHLCVSyncRequest(LoadOHLCVRequest):
+    interval: Optional[float] = None  # seconds between syncs, config default if unset
+
+
+class OHLCVSyncStopRequest(BaseModel):
+    symbol: Optional[str] = None
+    resolution: Optional[Resolution] = None
+
+
 class SimulateRequest(BaseModel):
     symbol: str
     expiry_date: Date
@@ -6,6 +6,7 @@ from services.consumer.routes import router as consumer_router
 from services.consumer.routes import router as auth_router
 from services.consumer.service import consumer
 from services.consumer.payoff_service import payoff_consumer
+from services.common.db.notify import change_listener
 from services.common.core.logging import consumer_logger as logger
 
 
@@ -44,6 +45,9 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"CONSUMER: Error stopping polling tasks: {e}")
 
+    # Close the LISTEN connection (LIVE_TRANSPORT=notify)
+    await change_listener.stop()
+
 
 app = FastAPI(
     title="Hedge Lords Consumer",
@@ -12,15 +12,24 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from services.consumer.websocket_manager import manager
 from services.common.db.database import get_db_session
 from services.common.core.logging import consumer_logger as logger
+from services.common.core.config import (
+    NUMERIC_MODE,
+    LIVE_TRANSPORT,
+    LIVE_STORE_NAME,
+    LIVE_NOTIFY_FALLBACK_INTERVAL,
+)
+from services.common.db.notify import ChangeSubscription, change_listener
+from services.common.live.chain_store import ChainStore, records_to_dicts, reattach
 from services.common.types.models import (
     Options,
+    OptionsSnapshot,
     SelectedTicker,
     DataPoints,
     SimulateRequest,
 )
 from typing import Optional
 from decimal import Decimal
-from services.common.types.enums import Resolution
+from services.common.types.enums import Resolution, NumericMode, LiveTransport
 from services.common.math.options_contracts import call_payoff, put_payoff
 
 
@@ -32,6 +41,14 @@ class PayoffDiagramConsumer:
         self.price_range_percentage = 0.1  # Default 10% range for price points
         self.lot_size: float = 1.0  # Default lot size for contracts
         self.num_price_points = 500  # Number of price points to calculate
+        self.numeric_mode = NumericMode(NUMERIC_MODE)
+        # Float mode reads the double precision snapshot, no Decimal round trip
+        self.live_table = (
+            OptionsSnapshot if self.numeric_mode == NumericMode.FLOAT else Options
+        )
+        self.live_transport = LiveTransport(LIVE_TRANSPORT)
+        self.chain_store: Optional[ChainStore] = None
+        self.change_subscription: Optional[ChangeSubscription] = None
         self.set_sim_directory()
 
     async def process_message(self, message: str):
@@ -75,6 +92,10 @@ class PayoffDiagramConsumer:
                 self.selected_contracts.clear()
                 logger.info("PAYOFF: Cleared all selected contracts")
 
+            if self.change_subscription:
+                # Recompute the payoff for the new selection right away
+                self.change_subscription.reset()
+
             # Return a confirmation message with the current state.
             return {
                 "type": "confirmation",
@@ -161,14 +182,19 @@ class PayoffDiagramConsumer:
 
         expected_values = np.array([np.nan])
         try:
+            table = self.live_table
             query = select(
-                Options.symbol,
-                Options.best_bid,
-                Options.best_ask,
-                Options.spot_price,
-                Options.contract_type,
-                Options.strike_price,
-            ).where(Options.symbol.in_(self.selected_contracts.keys()))
+                table.symbol,
+                table.best_bid,
+                table.best_ask,
+                table.spot_price,
+                table.contract_type,
+                table.strike_price,
+            ).where(
+                table.symbol.in_(self.selected_contracts.keys()),
+                table.underlying_asset_symbol == symbol[:3],
+                table.expiry_date == expiry_date,
+            )
 
             contracts_table_coro = db.execute(query)
             sims_coro = self.get_monte_carlo(
@@ -178,6 +204,7 @@ class PayoffDiagramConsumer:
             logger.info("Gathering data from database and simulation")
             results = await asyncio.gather(contracts_table_coro, sims_coro)
             contracts_list = results[0].mappings().all()
+            # Float mode tables hold no Decimals, their values pass through as is
             contracts_dict = {
                 row_map.get("symbol"): {  # Key: Symbol
                     key: float(value) if isinstance(value, Decimal) else value
@@ -221,13 +248,10 @@ class PayoffDiagramConsumer:
     ) -> np.ndarray:
         total_payoff = np.zeros_like(sims, dtype=float)
         for contract, position in self.selected_contracts.items():
-            # Symbol check
-            key_parts = contract.split("-")
-            if symbol[:3] != key_parts[1]:
-                raise Exception(f"Symbol mismatch {symbol[:3]} != key_parts[1]")
-            if expiry_date.strftime("%d%m%y") != key_parts[3]:
+            # Contracts of another underlying or expiry were filtered out by the query
+            if contract not in contracts:
                 raise Exception(
-                    f"Expiry Date mismatch {expiry_date.strftime('%d%m%y')} != {key_parts[3]}"
+                    f"Contract {contract} is not a {symbol[:3]} contract expiring {expiry_date}"
                 )
 
             cost_or_credit = 0.0
@@ -263,14 +287,19 @@ class PayoffDiagramConsumer:
             return []
 
         try:
+            table = self.live_table
             query = select(
-                Options.symbol,
-                Options.contract_type,
-                Options.strike_price,
-                Options.best_bid,
-                Options.best_ask,
-                Options.spot_price,
-            ).where(Options.symbol.in_(self.selected_contracts.keys()))
+                table.symbol,
+                table.contract_type,
+                table.strike_price,
+                table.best_bid,
+                table.best_ask,
+                table.spot_price,
+                table.expiry_date,
+            ).where(table.symbol.in_(self.selected_contracts.keys()))
+            query = query.where(table.strike_price.is_not(None)).order_by(
+                table.strike_price
+            )
 
             logger.debug(
                 f"QUERY: {query.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True})}"
@@ -278,19 +307,20 @@ class PayoffDiagramConsumer:
             result = await db.execute(query)
             rows = result.all()
             contract_data: list[SelectedTicker] = []
+            to_float = self.numeric_mode.to_float
             for row in rows:
                 if row.strike_price:
                     contract_data.append(
                         SelectedTicker(
                             symbol=row.symbol,
                             contract_type=row.contract_type.replace("_options", ""),
-                            strike_price=float(row.strike_price),
-                            best_bid=float(row.best_bid) if row.best_bid else None,
-                            best_ask=float(row.best_ask) if row.best_ask else None,
-                            spot_price=float(row.spot_price)
-                            if row.spot_price
-                            else None,
-                            expiry_date=self._extract_expiry_date(row.symbol),
+                            strike_price=to_float(row.strike_price),
+                            best_bid=to_float(row.best_bid or None),
+                            best_ask=to_float(row.best_ask or None),
+                            spot_price=to_float(row.spot_price or None),
+                            expiry_date=(
+                                row.expiry_date.isoformat() if row.expiry_date else None
+                            ),
                             position=self.selected_contracts.get(row.symbol, "buy"),
                         )
                     )
@@ -298,7 +328,6 @@ class PayoffDiagramConsumer:
             logger.debug(
                 f"PAYOFF: Retrieved data for {len(self.selected_contracts)} selected contracts"
             )
-            contract_data.sort(key=lambda x: x.strike_price)
             return contract_data
 
         except Exception as e:
@@ -306,20 +335,31 @@ class PayoffDiagramConsumer:
             logger.exception(e)
             return []
 
-    def _extract_expiry_date(self, symbol: str) -> Optional[str]:
-        """Extract expiry date from option symbol if possible"""
-        try:
-            parts = symbol.split("-")
-            if len(parts) >= 4:
-                date_part = parts[3]
-                if len(date_part) >= 6:
-                    day = date_part[:2]
-                    month = date_part[2:4]
-                    year = date_part[4:6]
-                    return f"20{year}-{month}-{day}"  # ISO format
-            return None
-        except Exception:
-            return None
+    def get_selected_contracts_from_store(self) -> list[SelectedTicker]:
+        """Get data for the selected contracts from the shared-memory chain store"""
+        if not self.selected_contracts:
+            return []
+
+        self.chain_store = reattach(self.chain_store, LIVE_STORE_NAME)
+        if self.chain_store is None:
+            return []
+        _, records = self.chain_store.snapshot()
+        contract_data = [
+            SelectedTicker(
+                symbol=row["symbol"],
+                contract_type=row["contract_type"].replace("_options", ""),
+                strike_price=row["strike_price"],
+                best_bid=row["best_bid"] or None,
+                best_ask=row["best_ask"] or None,
+                spot_price=row["spot_price"] or None,
+                expiry_date=row["expiry_date"] or None,
+                position=self.selected_contracts.get(row["symbol"], "buy"),
+            )
+            for row in records_to_dicts(records, self.selected_contracts)
+            if row["strike_price"]
+        ]
+        contract_data.sort(key=lambda x: x.strike_price)
+        return contract_data
 
     def calculate_payoff_points(
         self, contracts_data: list[SelectedTicker]
@@ -367,7 +407,7 @@ class PayoffDiagramConsumer:
     async def get_current_payoff_data(self):
         """Fetch selected contracts and return calculated payoff data"""
         try:
-            async with get_db_session() as session:
+            async with get_db_session(read_only=True) as session:
                 contracts_data = await self.get_selected_contracts_data(session)
                 logger.info(f"PAYOFF: Selected contracts: {len(contracts_data)}")
 
@@ -390,37 +430,67 @@ class PayoffDiagramConsumer:
         logger.info("PAYOFF: Starting database polling")
         self.should_stop = False
 
+        if self.live_transport == LiveTransport.NOTIFY:
+            self.change_subscription = change_listener.subscribe()
+
         while not self.should_stop:
             try:
                 # Only poll if there is an active "trading" connection
                 if manager.active_connections.get("trading"):
-                    async with get_db_session() as session:
-                        contracts_data = await self.get_selected_contracts_data(session)
-                        # logger.info(
-                        #     f"PAYOFF: Selected contracts: {len(contracts_data)}"
-                        # )
-                        payoff_data = self.calculate_payoff_points(contracts_data)
-
-                        message = {
-                            "type": "payoff_update",
-                            "timestamp": int(datetime.now().timestamp() * 1000),
-                            "data": payoff_data.model_dump(),
-                            "selected_contracts": list(self.selected_contracts),
-                        }
-                        try:
-                            await manager.broadcast(message, "trading")
-                            logger.debug("PAYOFF: Sent payoff diagram data to client")
-                        except Exception as e:
-                            logger.error(f"PAYOFF: Error sending to websocket: {e}")
+                    await self.broadcast_payoff()
 
             except Exception as e:
                 logger.error(f"PAYOFF: Error during polling: {e}")
                 logger.exception(e)
 
-            await asyncio.sleep(0.5)  # Poll every 0.5 seconds
+            if self.change_subscription:
+                await self.wait_for_selected_changes()
+            else:
+                await asyncio.sleep(0.5)  # Poll every 0.5 seconds
 
         logger.info("PAYOFF: Polling stopped")
 
+    async def broadcast_payoff(self):
+        """Read the selected contracts and send the payoff diagram"""
+        if self.live_transport == LiveTransport.SHM:
+            contracts_data = self.get_selected_contracts_from_store()
+        else:
+            # After a notification the replica may not have the change yet
+            read_only = self.change_subscription is None
+            async with get_db_session(read_only=read_only) as session:
+                contracts_data = await self.get_selected_contracts_data(session)
+        # logger.info(
+        #     f"PAYOFF: Selected contracts: {len(contracts_data)}"
+        # )
+        payoff_data = self.calculate_payoff_points(contracts_data)
+
+        message = {
+            "type": "payoff_update",
+            "timestamp": int(datetime.now().timestamp() * 1000),
+            "data": payoff_data.model_dump(),
+            "selected_contracts": list(self.selected_contracts),
+        }
+        try:
+            await manager.broadcast(message, "trading")
+            logger.debug("PAYOFF: Sent payoff diagram data to client")
+        except Exception as e:
+            logger.error(f"PAYOFF: Error sending to websocket: {e}")
+
+    async def wait_for_selected_changes(self):
+        """Wait for a change that affects the payoff diagram.
+
+        Returns when a selected contract or the selection changes, a client
+        connects, or LIVE_NOTIFY_FALLBACK_INTERVAL passes without changes.
+        """
+        connected = bool(manager.active_connections.get("trading"))
+        timeout = LIVE_NOTIFY_FALLBACK_INTERVAL if connected else 0.5
+        while not self.should_stop:
+            changed = await self.change_subscription.wait(timeout)
+            if changed is None or not changed.isdisjoint(self.selected_contracts):
+                return
+            if bool(manager.active_connections.get("trading")) != connected:
+                return
+
     async def stop_polling(self):
         """Stop the polling process"""
         logger.info("PAYOFF: Stopping polling")
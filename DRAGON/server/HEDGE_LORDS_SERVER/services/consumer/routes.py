@@ -8,7 +8,8 @@ from services.consumer.websocket_manager import manager
 from services.common.core.logging import consumer_logger as logger
 from services.consumer.payoff_service import payoff_consumer
 from services.common.types.models import SimulateRequest
-from services.common.db.database import db_session
+from services.common.db.database import read_db_session
+from services.common.db.replica import replica_lag
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
@@ -86,7 +87,7 @@ def clear_simulations():
     "/expected_values", response_model=Optional[dict[str, dict[str, float]]]
 )  # Hint expected success response
 async def expected_values(
-    request: SimulateRequest, db: AsyncSession = Depends(db_session)
+    request: SimulateRequest, db: AsyncSession = Depends(read_db_session)
 ):
     """
     Calculates and returns expected payoff statistics based on Monte Carlo simulation.
@@ -196,6 +197,16 @@ async def select_deselect_option(payload: dict = Body(...)):
     return res
 
 
+@router.get("/replica_lag")
+async def get_replica_lag():
+    """How far the database serving consumer reads is behind the primary"""
+    try:
+        return await replica_lag()
+    except Exception as e:
+        logger.error(f"CONSUMER: Error reading replica lag: {e}")
+        return JSONResponse(status_code=503, content={"message": f"Error: {str(e)}"})
+
+
 @router.delete("/clear_all_contracts")
 async def clear_all_contracts():
     payoff_consumer.selected_contracts = {}
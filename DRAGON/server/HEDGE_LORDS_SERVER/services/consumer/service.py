@@ -1,29 +1,99 @@
 import asyncio
 from datetime import datetime
+from typing import Iterable, Optional
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from services.consumer.websocket_manager import manager
-from services.common.db.database import get_db_session
+from services.common.db.database import get_db_session, get_raw_connection
 from services.common.core.logging import consumer_logger as logger
-from services.common.types.models import Options, SimpleTicker
+from services.common.core.config import (
+    NUMERIC_MODE,
+    LIVE_TRANSPORT,
+    LIVE_STORE_NAME,
+    LIVE_STORE_POLL_INTERVAL,
+    LIVE_NOTIFY_FALLBACK_INTERVAL,
+    CONSUMER_CHAIN_QUERY,
+)
+from services.common.db.notify import change_listener
+from services.common.live.chain_store import ChainStore, records_to_dicts, reattach
+from services.common.types.enums import NumericMode, LiveTransport, ChainQueryMode
+from services.common.types.models import Options, OptionsSnapshot, SimpleTicker
+
+# Chain display order, served by the idx_*_chain indexes
+CHAIN_ORDER = "underlying_asset_symbol, expiry_date, contract_type, strike_price"
+
+
+def chain_payload_sql(table: str) -> str:
+    """The "prices" message of the whole chain as JSON text, built by Postgres.
+
+    Same keys, values and order as the SimpleTicker path. The result is cast
+    to text so the driver hands it over without decoding it.
+    """
+    return f"""
+        SELECT json_build_object(
+            'timestamp', (extract(epoch FROM clock_timestamp()) * 1000)::bigint,
+            'purpose', 'prices',
+            'options_chain', coalesce(
+                json_agg(
+                    json_build_object(
+                        'symbol', symbol,
+                        'contract_type', contract_type,
+                        'strike_price', strike_price,
+                        'best_bid', best_bid,
+                        'best_ask', best_ask,
+                        'spot_price', spot_price,
+                        'expiry_date', expiry_date
+                    )
+                    ORDER BY {CHAIN_ORDER}
+                ),
+                '[]'::json
+            )
+        )::text
+        FROM {table}
+    """
 
 
 class OptionsConsumer:
     def __init__(self):
         self.polling_task = None
         self.should_stop = False
+        self.numeric_mode = NumericMode(NUMERIC_MODE)
+        # Float mode reads the double precision snapshot, no Decimal round trip
+        self.live_table = (
+            OptionsSnapshot if self.numeric_mode == NumericMode.FLOAT else Options
+        )
+        self.live_transport = LiveTransport(LIVE_TRANSPORT)
+        self.chain_query = ChainQueryMode(CONSUMER_CHAIN_QUERY)
+        self.chain_payload_sql = chain_payload_sql(self.live_table.__table__.fullname)
+        self.chain_store: Optional[ChainStore] = None
+        self.last_store_version: Optional[int] = None
+
+    async def get_options_chain(
+        self, db: AsyncSession, symbols: Optional[Iterable[str]] = None
+    ) -> list[SimpleTicker]:
+        """Get simplified options chain data from the database.
 
-    async def get_options_chain(self, db: AsyncSession) -> list[SimpleTicker]:
-        """Get simplified options chain data from the database"""
+        With ``symbols`` only those rows are read.
+        """
         try:
             # Select only the necessary columns for SimpleTicker
+            table = self.live_table
             stmt = select(
-                Options.symbol,
-                Options.contract_type,
-                Options.strike_price,
-                Options.best_bid,
-                Options.best_ask,
-                Options.spot_price,
+                table.symbol,
+                table.contract_type,
+                table.strike_price,
+                table.best_bid,
+                table.best_ask,
+                table.spot_price,
+                table.expiry_date,
+            )
+            if symbols is not None:
+                stmt = stmt.where(table.symbol.in_(symbols))
+            stmt = stmt.order_by(
+                table.underlying_asset_symbol,
+                table.expiry_date,
+                table.contract_type,
+                table.strike_price,
             )
             result = await db.execute(stmt)
             rows = result.all()
@@ -34,20 +104,19 @@ class OptionsConsumer:
             # Create a list of SimpleTicker objects
             simple_tickers = []
 
+            to_float = self.numeric_mode.to_float
             for row in rows:
                 # Extract data for SimpleTicker
                 ticker = SimpleTicker(
                     symbol=row.symbol,
                     contract_type=row.contract_type,
-                    strike_price=float(row.strike_price)
-                    if row.strike_price is not None
-                    else None,
-                    best_bid=float(row.best_bid) if row.best_bid is not None else None,
-                    best_ask=float(row.best_ask) if row.best_ask is not None else None,
-                    spot_price=float(row.spot_price)
-                    if row.spot_price is not None
-                    else None,
-                    expiry_date=self._extract_expiry_date(row.symbol),
+                    strike_price=to_float(row.strike_price),
+                    best_bid=to_float(row.best_bid),
+                    best_ask=to_float(row.best_ask),
+                    spot_price=to_float(row.spot_price),
+                    expiry_date=(
+                        row.expiry_date.isoformat() if row.expiry_date else None
+                    ),
                 )
 
                 simple_tickers.append(ticker)
@@ -61,33 +130,53 @@ class OptionsConsumer:
             logger.exception(e)
             return []
 
-    def _extract_expiry_date(self, symbol: str) -> str:
-        """Extract expiry date from option symbol if possible"""
-        try:
-            # Assuming format like "C-BTC-75600-010325" where last 6 digits are DDMMYY
-            parts = symbol.split("-")
-            if len(parts) >= 4:
-                date_part = parts[3]
-                if len(date_part) >= 6:
-                    # Extract DDMMYY format
-                    day = date_part[:2]
-                    month = date_part[2:4]
-                    year = date_part[4:6]
-                    return f"20{year}-{month}-{day}"  # Return ISO format
-            return None
-        except Exception:
-            return None
+    async def get_options_chain_payload(self) -> str:
+        """The encoded "prices" message of the whole chain (prepared mode).
+
+        asyncpg keeps the statement prepared per pooled connection, so a poll
+        is one Bind/Execute and a single text value, no per-row Python work.
+        """
+        async with get_raw_connection(read_only=True) as conn:
+            return await conn.fetchval(self.chain_payload_sql)
+
+    def get_options_chain_from_store(self, records) -> list[SimpleTicker]:
+        """Build the options chain from a chain store snapshot"""
+        return [
+            SimpleTicker(
+                symbol=row["symbol"],
+                contract_type=row["contract_type"],
+                strike_price=row["strike_price"],
+                best_bid=row["best_bid"],
+                best_ask=row["best_ask"],
+                spot_price=row["spot_price"],
+                expiry_date=row["expiry_date"] or None,
+            )
+            for row in records_to_dicts(records)
+        ]
 
     async def start_polling(self):
         """Start polling the database for updates"""
         logger.info("CONSUMER: Starting database polling")
         self.should_stop = False
 
+        if self.live_transport == LiveTransport.SHM:
+            await self.poll_chain_store()
+            return
+        if self.live_transport == LiveTransport.NOTIFY:
+            await self.listen_for_changes()
+            return
+
         while not self.should_stop:
             try:
                 # Only poll if there is an active connection for premiums
-                if manager.active_connections.get("premiums"):
-                    async with get_db_session() as session:
+                if (
+                    manager.active_connections.get("premiums")
+                    and self.chain_query == ChainQueryMode.PREPARED
+                ):
+                    payload = await self.get_options_chain_payload()
+                    await manager.broadcast_text(payload, "premiums")
+                elif manager.active_connections.get("premiums"):
+                    async with get_db_session(read_only=True) as session:
                         # Get options chain data
                         options_chain = await self.get_options_chain(session)
 
@@ -116,6 +205,99 @@ class OptionsConsumer:
 
         logger.info("CONSUMER: Polling stopped")
 
+    async def poll_chain_store(self):
+        """Broadcast the chain from the shared-memory store whenever it changes.
+
+        Reading the store is a memcpy, so it is checked far more often than
+        the database would be polled and only a new version is broadcast.
+        """
+        while not self.should_stop:
+            try:
+                self.chain_store = reattach(self.chain_store, LIVE_STORE_NAME)
+                if self.chain_store is not None and manager.active_connections.get(
+                    "premiums"
+                ):
+                    version = self.chain_store.version
+                    if version != self.last_store_version:
+                        version, records = self.chain_store.snapshot()
+                        options_chain = self.get_options_chain_from_store(records)
+                        message = {
+                            "timestamp": int(datetime.now().timestamp() * 1000),
+                            "purpose": "prices",
+                            "options_chain": [
+                                ticker.dict() for ticker in options_chain
+                            ],
+                        }
+                        try:
+                            await manager.broadcast(message, "premiums")
+                            self.last_store_version = version
+                            logger.debug("CONSUMER: Sent options chain to client")
+                        except Exception as e:
+                            logger.error(f"CONSUMER: Error sending to websocket: {e}")
+                            await manager.disconnect("premiums")
+                else:
+                    # Resend the full chain to the next client that connects
+                    self.last_store_version = None
+
+            except Exception as e:
+                logger.error(f"CONSUMER: Error reading chain store: {e}")
+                logger.exception(e)
+
+            await asyncio.sleep(LIVE_STORE_POLL_INTERVAL)
+
+        logger.info("CONSUMER: Polling stopped")
+
+    async def listen_for_changes(self):
+        """Broadcast the chain whenever the producer announces changed symbols.
+
+        Only the announced symbols are re-read and merged into the last chain,
+        a full re-read happens on a reset, when a client (re)connects and
+        every LIVE_NOTIFY_FALLBACK_INTERVAL seconds without notifications.
+        """
+        subscription = change_listener.subscribe()
+        chain: dict[str, SimpleTicker] = {}
+        changed: Optional[set[str]] = None
+
+        while not self.should_stop:
+            try:
+                if not manager.active_connections.get("premiums"):
+                    chain = {}
+                elif changed is None or changed:
+                    if not chain:
+                        changed = None
+                    # Announced symbols are read from the primary, the replica
+                    # may not have replayed the write behind the notification yet
+                    async with get_db_session(read_only=changed is None) as session:
+                        options_chain = await self.get_options_chain(session, changed)
+                    if changed is None:
+                        chain = {}
+                    chain.update((ticker.symbol, ticker) for ticker in options_chain)
+
+                    message = {
+                        "timestamp": int(datetime.now().timestamp() * 1000),
+                        "purpose": "prices",
+                        "options_chain": [ticker.dict() for ticker in chain.values()],
+                    }
+                    try:
+                        await manager.broadcast(message, "premiums")
+                        logger.debug(
+                            f"CONSUMER: Sent options chain to client ({'all' if changed is None else len(changed)} symbols re-read)"
+                        )
+                    except Exception as e:
+                        logger.error(f"CONSUMER: Error sending to websocket: {e}")
+                        await manager.disconnect("premiums")
+
+            except Exception as e:
+                logger.error(f"CONSUMER: Error during change handling: {e}")
+                logger.exception(e)
+
+            # Until a chain has been sent, check for clients at the old poll rate
+            changed = await subscription.wait(
+                LIVE_NOTIFY_FALLBACK_INTERVAL if chain else 0.5
+            )
+
+        logger.info("CONSUMER: Polling stopped")
+
     async def stop_polling(self):
         """Stop the polling process"""
         logger.info("CONSUMER: Stopping polling")
@@ -32,5 +32,14 @@ class ConnectionManager:
             except Exception:
                 await self.disconnect(connection_name)
 
+    async def broadcast_text(self, message: str, connection_name: str):
+        """Send an already encoded JSON message as is"""
+        websocket = self.active_connections.get(connection_name)
+        if websocket:
+            try:
+                await websocket.send_text(message)
+            except Exception:
+                await self.disconnect(connection_name)
+
 
 manager = ConnectionManager()
@@ -0,0 +1,280 @@
+import math
+import time
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Iterable, Optional
+
+# Starting spot of the simulated underlyings, anything else starts at 100
+SPOT_PRICES = {"BTC": 85000.0, "ETH": 2000.0, "SOL": 140.0}
+# Annualised volatility driving the spot random walk
+SPOT_VOLATILITY = 0.6
+BASE_IV = 0.55
+SECONDS_PER_YEAR = 365 * 86400
+
+
+def _norm_cdf(x: float) -> float:
+    return 0.5 * (1 + math.erf(x / math.sqrt(2)))
+
+
+def _norm_pdf(x: float) -> float:
+    return math.exp(-0.5 * x * x) / math.sqrt(2 * math.pi)
+
+
+def black_scholes(
+    call: bool, spot: float, strike: float, years: float, iv: float
+) -> dict[str, float]:
+    """Price and greeks of a European option at zero rates"""
+    years = max(years, 1e-6)
+    root = iv * math.sqrt(years)
+    d1 = (math.log(spot / strike) + 0.5 * iv * iv * years) / root
+    d2 = d1 - root
+    if call:
+        price = spot * _norm_cdf(d1) - strike * _norm_cdf(d2)
+        delta = _norm_cdf(d1)
+        rho = strike * years * _norm_cdf(d2) / 100
+    else:
+        price = strike * _norm_cdf(-d2) - spot * _norm_cdf(-d1)
+        delta = _norm_cdf(d1) - 1
+        rho = -strike * years * _norm_cdf(-d2) / 100
+    return {
+        "price": max(price, 0.0),
+        "delta": delta,
+        "gamma": _norm_pdf(d1) / (spot * root),
+        # Per day and per vol point, like the exchange quotes them
+        "theta": -spot * _norm_pdf(d1) * iv / (2 * math.sqrt(years)) / 365,
+        "vega": spot * _norm_pdf(d1) * math.sqrt(years) / 100,
+        "rho": rho,
+    }
+
+
+def format_strike(strike: float) -> str:
+    return str(int(strike)) if strike.is_integer() else str(strike)
+
+
+def strike_step(spot: float) -> float:
+    """Round strike spacing of about 1% of spot (1000 for BTC at 85000)"""
+    raw = spot * 0.01
+    magnitude = 10 ** math.floor(math.log10(raw))
+    return round(raw / magnitude) * magnitude
+
+
+@dataclass
+class Option:
+    symbol: str
+    product_id: int
+    underlying: str
+    call: bool
+    strike: float
+    expiry: datetime
+    iv: float
+
+
+class SyntheticChain:
+    """Option chains of a few underlyings with random-walk spots and IVs.
+
+    Every underlying gets ``strikes`` strikes around its spot for each of
+    ``expiries`` daily expiries (12:00 UTC, like Delta's), a call and a put
+    each, plus a perpetual future "<UNDERLYING>USD". ``advance`` moves spots
+    and IVs; ``ticker`` renders the current v2/ticker frame of a symbol.
+    """
+
+    def __init__(
+        self,
+        underlyings: Iterable[str],
+        strikes: int,
+        expiries: int,
+        seed: Optional[int] = None,
+        today: Optional[date] = None,
+    ):
+        self.random = random.Random(seed)
+        today = today or datetime.now(timezone.utc).date()
+        self.spots: dict[str, float] = {}
+        self.options: dict[str, Option] = {}
+        product_id = 1
+        for underlying in underlyings:
+            spot = SPOT_PRICES.get(underlying, 100.0)
+            self.spots[underlying] = spot
+            step = strike_step(spot)
+            center = round(spot / step) * step
+            for day in range(1, expiries + 1):
+                expiry = datetime.combine(
+                    today + timedelta(days=day),
+                    datetime.min.time(),
+                    tzinfo=timezone.utc,
+                ) + timedelta(hours=12)
+                for i in range(strikes):
+                    strike = float(center + (i - strikes // 2) * step)
+                    if strike <= 0:
+                        continue
+                    for call in (True, False):
+                        symbol = (
+                            f"{'C' if call else 'P'}-{underlying}-{format_strike(strike)}-"
+                            f"{expiry:%d%m%y}"
+                        )
+                        smile = 0.1 * abs(math.log(strike / spot))
+                        self.options[symbol] = Option(
+                            symbol,
+                            product_id,
+                            underlying,
+                            call,
+                            strike,
+                            expiry,
+                            BASE_IV + smile,
+                        )
+                        product_id += 1
+        self._updated = time.monotonic()
+
+    @property
+    def perpetuals(self) -> list[str]:
+        return [f"{underlying}USD" for underlying in self.spots]
+
+    @property
+    def symbols(self) -> list[str]:
+        return list(self.options) + self.perpetuals
+
+    def advance(self) -> None:
+        """Move spots and IVs by the time elapsed since the last call"""
+        now = time.monotonic()
+        years = (now - self._updated) / SECONDS_PER_YEAR
+        self._updated = now
+        if years <= 0:
+            return
+        shock = SPOT_VOLATILITY * math.sqrt(years)
+        for underlying, spot in self.spots.items():
+            self.spots[underlying] = spot * math.exp(
+                shock * self.random.gauss(0, 1) - 0.5 * shock * shock
+            )
+        for option in self.options.values():
+            option.iv = min(max(option.iv + self.random.gauss(0, 0.002), 0.1), 3.0)
+
+    def products(self, contract_types: Optional[set[str]] = None) -> list[dict]:
+        """/v2/products entries"""
+        products = []
+        for option in self.options.values():
+            contract_type = "call_options" if option.call else "put_options"
+            products.append(
+                {
+                    "id": option.product_id,
+                    "symbol": option.symbol,
+                    "contract_type": contract_type,
+                    "strike_price": format_strike(option.strike),
+                    "settlement_time": option.expiry.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    "state": "live",
+                    "underlying_asset": {"symbol": option.underlying},
+                }
+            )
+        for i, underlying in enumerate(self.spots):
+            products.append(
+                {
+                    "id": 100000 + i,
+                    "symbol": f"{underlying}USD",
+                    "contract_type": "perpetual_futures",
+                    "state": "live",
+                    "underlying_asset": {"symbol": underlying},
+                }
+            )
+        if contract_types:
+            products = [p for p in products if p["contract_type"] in contract_types]
+        return products
+
+    def ticker(self, symbol: str) -> Optional[dict[str, Any]]:
+        """Current v2/ticker frame of a symbol, None if it is not listed"""
+        now = datetime.now(timezone.utc)
+        timestamp = int(now.timestamp() * 1_000_000)
+        option = self.options.get(symbol)
+        if option is None:
+            underlying = symbol[:-3]
+            if symbol[-3:] != "USD" or underlying not in self.spots:
+                return None
+            spot = self.spots[underlying]
+            mark = spot * (1 + self.random.gauss(0, 0.0001))
+            return {
+                "type": "v2/ticker",
+                "symbol": symbol,
+                "timestamp": timestamp,
+                "contract_type": "perpetual_futures",
+                "underlying_asset_symbol": underlying,
+                "description": f"{underlying} Perpetual",
+                "product_id": 100000 + list(self.spots).index(underlying),
+                "mark_price": f"{mark:.2f}",
+                "spot_price": f"{spot:.2f}",
+                "mark_basis": f"{mark - spot:.4f}",
+                "funding_rate": "0.0001",
+                "quotes": {
+                    "best_bid": f"{mark - 0.5:.1f}",
+                    "best_ask": f"{mark + 0.5:.1f}",
+                    "bid_size": "5000",
+                    "ask_size": "5000",
+                },
+            }
+
+        spot = self.spots[option.underlying]
+        years = (option.expiry - now).total_seconds() / SECONDS_PER_YEAR
+        model = black_scholes(option.call, spot, option.strike, years, option.iv)
+        mark = model["price"]
+        half_spread = max(mark * 0.01, 0.5)
+        return {
+            "type": "v2/ticker",
+            "symbol": symbol,
+            "timestamp": timestamp,
+            "contract_type": "call_options" if option.call else "put_options",
+            "underlying_asset_symbol": option.underlying,
+            "description": f"{option.underlying} {'Call' if option.call else 'Put'} option",
+            "product_id": option.product_id,
+            "mark_price": f"{mark:.4f}",
+            "spot_price": f"{spot:.2f}",
+            "strike_price": format_strike(option.strike),
+            "tick_size": "0.1",
+            "oi": "10.0",
+            "oi_contracts": "10000",
+            "quotes": {
+                "best_bid": f"{max(mark - half_spread, 0.0):.1f}",
+                "best_ask": f"{mark + half_spread:.1f}",
+                "bid_size": str(self.random.randint(100, 5000)),
+                "ask_size": str(self.random.randint(100, 5000)),
+                "bid_iv": f"{option.iv - 0.005:.4f}",
+                "ask_iv": f"{option.iv + 0.005:.4f}",
+                "mark_iv": f"{option.iv:.4f}",
+                "impact_mid_price": None,
+            },
+            "greeks": {
+                "delta": f"{model['delta']:.5f}",
+                "gamma": f"{model['gamma']:.8f}",
+                "theta": f"{model['theta']:.4f}",
+                "vega": f"{model['vega']:.4f}",
+                "rho": f"{model['rho']:.4f}",
+                "spot": f"{spot:.2f}",
+            },
+        }
+
+
+def candle_close(symbol: str, at: int) -> float:
+    """Deterministic price path of a symbol, the same for every request"""
+    base = SPOT_PRICES.get(symbol[:-3], 100.0)
+    rng = random.Random(f"{symbol}:{at}")
+    wave = 0.05 * math.sin(at / 86400 / 7 * 2 * math.pi) + 0.01 * math.sin(
+        at / 3600 * 2 * math.pi
+    )
+    return base * math.exp(wave + rng.gauss(0, 0.001))
+
+
+def candles(symbol: str, step: int, start: int, end: int) -> list[dict[str, Any]]:
+    """/v2/history/candles result for epoch seconds [start, end], newest first"""
+    result = []
+    first = -(-start // step) * step
+    for at in range(first, end + 1, step):
+        open_ = candle_close(symbol, at - step)
+        close = candle_close(symbol, at)
+        rng = random.Random(f"{symbol}:{at}:range")
+        result.append(
+            {
+                "time": at,
+                "open": round(open_, 2),
+                "high": round(max(open_, close) * (1 + rng.uniform(0, 0.002)), 2),
+                "low": round(min(open_, close) * (1 - rng.uniform(0, 0.002)), 2),
+                "close": round(close, 2),
+                "volume": rng.randint(1, 1000),
+            }
+        )
+    return result[::-1]
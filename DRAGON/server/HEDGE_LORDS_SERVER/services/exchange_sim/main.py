@@ -0,0 +1,137 @@
+"""Local stand-in for the Delta Exchange REST API and v2/ticker websocket.
+
+Run it and point the producer at it:
+    uvicorn services.exchange_sim.main:app --port 8010
+    DELTA_BASE_URL=http://127.0.0.1:8010 DELTA_WS_URL=ws://127.0.0.1:8010/ \\
+        uvicorn services.producer.main:app
+"""
+
+import json
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from services.common.core.config import (
+    EXCHANGE_SIM_UNDERLYINGS,
+    EXCHANGE_SIM_STRIKES,
+    EXCHANGE_SIM_EXPIRIES,
+    EXCHANGE_SIM_TICK_RATE,
+    EXCHANGE_SIM_SEED,
+)
+from services.common.core.logging import exchange_sim_logger as logger
+from services.common.types.enums import Resolution, ResolutionSeconds
+from services.exchange_sim.chain import SyntheticChain, candles
+
+chain = SyntheticChain(
+    EXCHANGE_SIM_UNDERLYINGS,
+    strikes=EXCHANGE_SIM_STRIKES,
+    expiries=EXCHANGE_SIM_EXPIRIES,
+    seed=EXCHANGE_SIM_SEED,
+)
+# Frames sent to all connections, for the stats endpoint
+frames_sent = 0
+
+
+async def run_market() -> None:
+    """Move the synthetic market once per tick"""
+    while True:
+        chain.advance()
+        await asyncio.sleep(1 / EXCHANGE_SIM_TICK_RATE)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info(
+        f"EXCHANGE SIM: {len(chain.symbols)} symbols, {EXCHANGE_SIM_TICK_RATE} ticks/sec per symbol"
+    )
+    market = asyncio.create_task(run_market())
+    yield
+    market.cancel()
+    await asyncio.gather(market, return_exceptions=True)
+
+
+app = FastAPI(
+    title="Delta Exchange Simulator",
+    version="1.0.0",
+    description="Synthetic Delta Exchange for benchmarks and tests",
+    lifespan=lifespan,
+)
+
+
+@app.get("/v2/products")
+async def products(contract_types: Optional[str] = None, states: Optional[str] = None):
+    types = set(contract_types.split(",")) if contract_types else None
+    return {"success": True, "result": chain.products(types)}
+
+
+@app.get("/v2/history/candles")
+async def history_candles(resolution: str, symbol: str, start: int, end: int):
+    try:
+        step = ResolutionSeconds[Resolution(resolution).name].value
+    except ValueError:
+        return {"success": False, "error": {"code": "invalid_resolution"}}
+    # The exchange caps a request at 2000 candles
+    start = max(start, end - step * 1999)
+    return {"success": True, "result": candles(symbol, step, start, end)}
+
+
+@app.get("/stats")
+async def stats():
+    return {"symbols": len(chain.symbols), "frames_sent": frames_sent}
+
+
+def _channel_symbols(message: dict) -> list[str]:
+    symbols = []
+    for channel in message.get("payload", {}).get("channels", []):
+        if channel.get("name") == "v2/ticker":
+            symbols.extend(channel.get("symbols", []))
+    return symbols
+
+
+async def _stream(websocket: WebSocket, subscribed: dict[str, None]) -> None:
+    """Send every subscribed symbol's ticker once per tick"""
+    global frames_sent
+    interval = 1 / EXCHANGE_SIM_TICK_RATE
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        for symbol in list(subscribed):
+            frame = chain.ticker(symbol)
+            if frame is not None:
+                await websocket.send_text(json.dumps(frame))
+                frames_sent += 1
+        await asyncio.sleep(max(interval - (loop.time() - started), 0))
+
+
+@app.websocket("/")
+async def ticker_socket(websocket: WebSocket):
+    """v2/ticker channel: subscribe and unsubscribe messages like Delta's"""
+    await websocket.accept()
+    subscribed: dict[str, None] = {}
+    stream = asyncio.create_task(_stream(websocket, subscribed))
+    try:
+        while True:
+            message = json.loads(await websocket.receive_text())
+            symbols = _channel_symbols(message)
+            if message.get("type") == "subscribe":
+                subscribed.update(dict.fromkeys(symbols))
+            elif message.get("type") == "unsubscribe":
+                if not any(symbols):
+                    subscribed.clear()
+                for symbol in symbols:
+                    subscribed.pop(symbol, None)
+            await websocket.send_text(
+                json.dumps(
+                    {
+                        "type": "subscriptions",
+                        "channels": [
+                            {"name": "v2/ticker", "symbols": list(subscribed)}
+                        ],
+                    }
+                )
+            )
+    except WebSocketDisconnect:
+        pass
+    finally:
+        stream.cancel()
+        await asyncio.gather(stream, return_exceptions=True)
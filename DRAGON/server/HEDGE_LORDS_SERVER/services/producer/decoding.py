@@ -0,0 +1,151 @@
+import msgspec
+from decimal import Decimal
+from typing import Any, Generic, Optional, TypeVar, Union
+from services.common.core.logging import producer_logger as logger
+from services.common.types.enums import OptionsTypes, FuturesTypes, NumericMode
+from services.common.exchanges.catalog import expiry_from_symbol
+from services.producer.writer import OPTIONS_COLUMNS
+
+CONTRACT_TYPES = frozenset(
+    [member.value for member in OptionsTypes]
+    + [member.value for member in FuturesTypes]
+)
+
+# Numeric type of the decoded prices, IVs and greeks (see NumericMode)
+N = TypeVar("N", Decimal, float)
+
+
+class WirePriceBand(msgspec.Struct, Generic[N]):
+    lower_limit: Optional[N] = None
+    upper_limit: Optional[N] = None
+
+
+class WireQuotes(msgspec.Struct, Generic[N]):
+    ask_iv: Optional[N] = None
+    ask_size: Optional[N] = None
+    best_ask: Optional[N] = None
+    best_bid: Optional[N] = None
+    bid_iv: Optional[N] = None
+    bid_size: Optional[N] = None
+    impact_mid_price: Optional[N] = None
+    mark_iv: Optional[N] = None
+
+
+class WireGreeks(msgspec.Struct, Generic[N]):
+    delta: Optional[N] = None
+    gamma: Optional[N] = None
+    theta: Optional[N] = None
+    vega: Optional[N] = None
+    rho: Optional[N] = None
+
+
+class TickerFrame(msgspec.Struct, Generic[N], tag_field="type", tag="v2/ticker"):
+    """A v2/ticker frame, restricted to the fields market_data.options stores.
+
+    Unknown fields are skipped by the decoder without being materialized.
+    """
+
+    symbol: str
+    timestamp: int
+    contract_type: str
+    underlying_asset_symbol: str = ""
+    description: Optional[str] = None
+    product_id: Optional[int] = None
+    mark_price: Optional[N] = None
+    spot_price: Optional[N] = None
+    strike_price: Optional[N] = None
+    tick_size: Optional[N] = None
+    open: Optional[N] = None
+    high: Optional[N] = None
+    low: Optional[N] = None
+    close: Optional[N] = None
+    volume: Optional[N] = None
+    turnover: Optional[N] = None
+    turnover_usd: Optional[N] = None
+    turnover_symbol: Optional[str] = None
+    oi: Optional[N] = None
+    oi_contracts: Optional[int] = None
+    oi_value: Optional[N] = None
+    oi_value_usd: Optional[N] = None
+    oi_value_symbol: Optional[str] = None
+    oi_change_usd_6h: Optional[N] = None
+    mark_basis: Optional[N] = None
+    funding_rate: Optional[N] = None
+    size: Optional[int] = None
+    initial_margin: Optional[N] = None
+    mark_change_24h: Optional[N] = None
+    quotes: Optional[WireQuotes[N]] = None
+    greeks: Optional[WireGreeks[N]] = None
+    price_band: Optional[WirePriceBand[N]] = None
+
+
+# strict=False lets the decoder accept the numeric strings Delta sends
+_decoders = {
+    NumericMode.DECIMAL: msgspec.json.Decoder(TickerFrame[Decimal], strict=False),
+    NumericMode.FLOAT: msgspec.json.Decoder(TickerFrame[float], strict=False),
+}
+
+_TOP_LEVEL_COLUMNS = tuple(
+    column for column in OPTIONS_COLUMNS if column in TickerFrame.__struct_fields__
+)
+
+
+def decode_ticker(
+    message: Union[str, bytes], numeric_mode: NumericMode = NumericMode.DECIMAL
+) -> Optional[TickerFrame]:
+    """Decode a raw websocket frame, returns None for anything but a valid ticker"""
+    try:
+        frame = _decoders[numeric_mode].decode(message)
+    except msgspec.ValidationError as e:
+        # Subscription acks, heartbeats and malformed tickers
+        logger.debug(f"PRODUCER: Skipping frame: {e}")
+        return None
+    except msgspec.DecodeError as e:
+        logger.error(f"PRODUCER: JSON decode error: {e}, message: {message[:100]}...")
+        return None
+
+    if frame.contract_type not in CONTRACT_TYPES:
+        logger.warning(f"PRODUCER: Unknown contract type: {frame.contract_type}")
+        return None
+    return frame
+
+
+def frame_to_row(frame: TickerFrame) -> dict[str, Any]:
+    """Flatten a decoded frame into a market_data.options row"""
+    row = dict.fromkeys(OPTIONS_COLUMNS)
+    for column in _TOP_LEVEL_COLUMNS:
+        row[column] = getattr(frame, column)
+    row["expiry_date"] = expiry_from_symbol(frame.symbol)
+
+    quotes = frame.quotes
+    if quotes is not None:
+        row["best_bid"] = quotes.best_bid
+        row["best_ask"] = quotes.best_ask
+        row["bid_size"] = quotes.bid_size
+        row["ask_size"] = quotes.ask_size
+        row["bid_iv"] = quotes.bid_iv
+        row["ask_iv"] = quotes.ask_iv
+        row["mark_iv"] = quotes.mark_iv
+        row["impact_mid_price"] = quotes.impact_mid_price
+    greeks = frame.greeks
+    if greeks is not None:
+        row["delta"] = greeks.delta
+        row["gamma"] = greeks.gamma
+        row["theta"] = greeks.theta
+        row["vega"] = greeks.vega
+        row["rho"] = greeks.rho
+    price_band = frame.price_band
+    if price_band is not None:
+        row["upper_limit"] = price_band.upper_limit
+        row["lower_limit"] = price_band.lower_limit
+    return row
+
+
+def decode_ticker_row(
+    message: Union[str, bytes], numeric_mode: NumericMode = NumericMode.DECIMAL
+) -> Optional[dict[str, Any]]:
+    """Fast path: raw frame straight to a market_data.options row"""
+    frame = decode_ticker(message, numeric_mode)
+    if frame is None:
+        return None
+    return frame_to_row(frame)
@@ -0,0 +1,204 @@
+import time
+import asyncio
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Optional
+from services.common.db.database import get_raw_connection
+from services.common.core.logging import producer_logger as logger
+
+TICKS_SCHEMA = "market_data"
+TICKS_TABLE = "options_ticks"
+
+# Columns of market_data.options_ticks in COPY order
+TICK_COLUMNS = (
+    "time",
+    "symbol",
+    "contract_type",
+    "underlying_asset_symbol",
+    "mark_price",
+    "spot_price",
+    "strike_price",
+    "best_bid",
+    "best_ask",
+    "bid_size",
+    "ask_size",
+    "bid_iv",
+    "ask_iv",
+    "mark_iv",
+    "delta",
+    "gamma",
+    "theta",
+    "vega",
+    "rho",
+    "volume",
+    "oi",
+)
+_ROW_COLUMNS = TICK_COLUMNS[1:]
+
+
+def tick_time(timestamp: int) -> datetime:
+    """Delta ticker timestamps are microseconds since the epoch"""
+    return datetime.fromtimestamp(timestamp / 1_000_000, tz=timezone.utc)
+
+
+def row_to_record(row: dict[str, Any]) -> tuple:
+    """Turn a market_data.options row into an options_ticks COPY record"""
+    return (tick_time(row["timestamp"]),) + tuple(
+        row[column] for column in _ROW_COLUMNS
+    )
+
+
+def partition_name(day: date) -> str:
+    return f"{TICKS_TABLE}_{day:%Y%m%d}"
+
+
+def partition_ddl(day: date) -> str:
+    """CREATE statement for the partition holding one UTC day of ticks.
+
+    The bounds carry an explicit offset: bare dates would be read in the
+    session TimeZone while records are routed by their UTC date.
+    """
+    return (
+        f"CREATE TABLE IF NOT EXISTS {TICKS_SCHEMA}.{partition_name(day)} "
+        f"PARTITION OF {TICKS_SCHEMA}.{TICKS_TABLE} "
+        f"FOR VALUES FROM ('{day.isoformat()} 00:00:00+00') "
+        f"TO ('{(day + timedelta(days=1)).isoformat()} 00:00:00+00')"
+    )
+
+
+class TickHistoryWriter:
+    """Appends every received tick to market_data.options_ticks with binary COPY.
+
+    Unlike OptionsBatchWriter nothing is coalesced: each tick becomes a row.
+    Records are buffered and copied every ``flush_interval`` seconds or once
+    ``batch_size`` are pending. While the database is unavailable at most
+    ``max_pending`` records are kept, the oldest are dropped beyond that.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 1.0,
+        batch_size: int = 5000,
+        max_pending: int = 100000,
+    ):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending: deque[tuple] = deque(maxlen=max_pending)
+        self._partitions: set[date] = set()
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.should_stop = False
+
+        # Metrics
+        self.ticks_received = 0
+        self.ticks_dropped = 0
+        self.rows_copied = 0
+        self.flush_count = 0
+        self.failed_flushes = 0
+        self.last_flush_ms = 0.0
+        self.total_flush_ms = 0.0
+
+    def add(self, row: dict[str, Any]) -> None:
+        """Buffer a market_data.options row as a tick record"""
+        self.ticks_received += 1
+        if len(self._pending) == self._pending.maxlen:
+            self.ticks_dropped += 1
+        self._pending.append(row_to_record(row))
+        if len(self._pending) >= self.batch_size:
+            self._flush_requested.set()
+
+    async def flush(self) -> int:
+        """COPY all pending records, returns the number of rows copied"""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            records = list(self._pending)
+            self._pending.clear()
+
+            start = time.perf_counter()
+            try:
+                async with get_raw_connection() as conn:
+                    await self._ensure_partitions(conn, records)
+                    await conn.copy_records_to_table(
+                        TICKS_TABLE,
+                        schema_name=TICKS_SCHEMA,
+                        columns=TICK_COLUMNS,
+                        records=records,
+                    )
+            except Exception as e:
+                self.failed_flushes += 1
+                # Put the records back in front of anything received meanwhile,
+                # dropping the oldest ones that no longer fit
+                room = self._pending.maxlen - len(self._pending)
+                requeued = records[-room:] if room else []
+                self.ticks_dropped += len(records) - len(requeued)
+                self._pending.extendleft(reversed(requeued))
+                logger.error(f"PRODUCER: Error copying {len(records)} ticks: {e}")
+                return 0
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.flush_count += 1
+            self.rows_copied += len(records)
+            self.last_flush_ms = elapsed_ms
+            self.total_flush_ms += elapsed_ms
+            logger.debug(
+                f"PRODUCER: Copied {len(records)} ticks in {elapsed_ms:.1f} ms"
+            )
+            return len(records)
+
+    async def _ensure_partitions(self, conn, records: list[tuple]) -> None:
+        """Create the daily partitions the records fall into"""
+        days = {record[0].date() for record in records} - self._partitions
+        for day in sorted(days):
+            await conn.execute(partition_ddl(day))
+            self._partitions.add(day)
+            logger.info(
+                f"PRODUCER: Tick history partition ready: {partition_name(day)}"
+            )
+
+    async def run(self) -> None:
+        """Flush loop, runs until stop() is called"""
+        logger.info(
+            f"PRODUCER: Tick history writer started (interval={self.flush_interval}s, batch_size={self.batch_size})"
+        )
+        while not self.should_stop:
+            try:
+                await asyncio.wait_for(
+                    self._flush_requested.wait(), timeout=self.flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+        logger.info("PRODUCER: Tick history writer stopped")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self.should_stop = False
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and copy whatever is still pending"""
+        self.should_stop = True
+        self._flush_requested.set()
+        if self._task:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        elapsed_s = self.total_flush_ms / 1000
+        return {
+            "pending_ticks": len(self._pending),
+            "ticks_received": self.ticks_received,
+            "ticks_dropped": self.ticks_dropped,
+            "rows_copied": self.rows_copied,
+            "flush_count": self.flush_count,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "copy_rows_per_sec": (
+                round(self.rows_copied / elapsed_s, 1) if elapsed_s else 0.0
+            ),
+        }
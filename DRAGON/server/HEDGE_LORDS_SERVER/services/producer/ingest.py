@@ -0,0 +1,125 @@
+import asyncio
+from collections import deque
+from typing import Any, Callable, Hashable, Optional
+from services.common.types.enums import OverflowPolicy
+
+
+class IngestQueue:
+    """Bounded queue between the websocket reader and the DB writer tasks.
+
+    The overflow policy decides what ``put`` does once ``maxsize`` items are
+    waiting:
+
+    - ``block``: wait for a writer to make room (backpressure on the reader)
+    - ``drop_oldest``: discard the oldest queued item
+    - ``coalesce``: keep only the latest item per key, an item for a key that
+      is already queued is merged into it in place with ``merge(queued, new)``
+      (replaces it without one); a new key on a full queue discards the
+      oldest key
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        merge: Optional[Callable[[Any, Any], Any]] = None,
+    ):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.merge = merge
+        self._keys: deque[Hashable] = deque()
+        self._items: dict[Hashable, Any] = {}
+        self._seq = 0
+        self._not_empty = asyncio.Condition()
+        self._not_full = asyncio.Condition()
+        self._unfinished = 0
+        self._all_done = asyncio.Event()
+        self._all_done.set()
+
+        # Metrics
+        self.enqueued = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_depth = 0
+
+    def qsize(self) -> int:
+        return len(self._keys)
+
+    def full(self) -> bool:
+        return len(self._keys) >= self.maxsize
+
+    async def put(self, key: Hashable, item: Any) -> None:
+        self.enqueued += 1
+        if self.policy == OverflowPolicy.COALESCE and key in self._items:
+            queued = self._items[key]
+            self._items[key] = self.merge(queued, item) if self.merge else item
+            self.coalesced += 1
+            return
+
+        if self.full():
+            if self.policy == OverflowPolicy.BLOCK:
+                async with self._not_full:
+                    await self._not_full.wait_for(lambda: not self.full())
+            else:
+                self._discard_oldest()
+
+        if self.policy != OverflowPolicy.COALESCE:
+            # Only coalesce mode keys items by symbol, other modes keep every item
+            self._seq += 1
+            key = self._seq
+        self._keys.append(key)
+        self._items[key] = item
+        self._unfinished += 1
+        self._all_done.clear()
+        self.max_depth = max(self.max_depth, len(self._keys))
+        async with self._not_empty:
+            self._not_empty.notify()
+
+    async def get(self) -> Any:
+        async with self._not_empty:
+            await self._not_empty.wait_for(lambda: self._keys)
+        return await self._pop()
+
+    async def get_many(self, max_items: int) -> list[Any]:
+        """Wait for at least one item, then take up to max_items without waiting"""
+        items = [await self.get()]
+        while self._keys and len(items) < max_items:
+            items.append(await self._pop())
+        return items
+
+    def task_done(self, count: int = 1) -> None:
+        self._unfinished -= count
+        if self._unfinished <= 0:
+            self._unfinished = 0
+            self._all_done.set()
+
+    async def join(self) -> None:
+        """Wait until every queued item has been marked done"""
+        await self._all_done.wait()
+
+    async def _pop(self) -> Any:
+        key = self._keys.popleft()
+        item = self._items.pop(key)
+        async with self._not_full:
+            self._not_full.notify()
+        return item
+
+    def _discard_oldest(self) -> None:
+        key = self._keys.popleft()
+        del self._items[key]
+        self.dropped += 1
+        self.task_done()
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            "policy": self.policy.value,
+            "depth": self.qsize(),
+            "max_depth": self.max_depth,
+            "maxsize": self.maxsize,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
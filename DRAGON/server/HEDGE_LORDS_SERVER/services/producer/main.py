@@ -2,16 +2,21 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from services.producer.routes import router as producer_router
+from services.producer.routes import producer
 from services.common.db.database import run_startup_migrations
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: run migrations
+    # Startup: run migrations, then set up (and restore) the snapshot table
     await run_startup_migrations()
+    await producer.prepare_snapshot()
     yield
-    # Shutdown: clean up resources if needed
-    pass
+    # Shutdown: stop streaming (closing the websocket and HTTP pool) and flush
+    # any buffered writes
+    await producer.stop_streaming()
+    await producer.stop_ohlcv_sync()
+    producer.close_chain_store()
 
 
 app = FastAPI(
@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from services.common.db.database import db_session
 from services.common.core.config import EXCHANGES
-from services.common.types.models import SubscriptionRequest, LoadOHLCVRequest
+from services.common.types.models import (
+    SubscriptionRequest,
+    LoadOHLCVRequest,
+    OHLCVSyncRequest,
+    OHLCVSyncStopRequest,
+)
 from services.producer.service import OptionsProducer
 
 router = APIRouter(prefix="/producer", tags=["producer"])
@@ -27,14 +33,56 @@ async def subscribe_symbol(
 
 
 @router.post("/unsubscribe")
-async def unsubscribe():
-    await producer.stop_streaming()
+async def unsubscribe(request: Optional[SubscriptionRequest] = None):
+    """Stop one symbol and expiry, or the whole stream without a body"""
+    if request is None:
+        await producer.stop_streaming()
+    else:
+        await producer.stop_subscription(request.symbol, request.expiry_date)
     return {"message": "Subscription stopped"}
 
 
+@router.get("/subscriptions")
+async def subscriptions():
+    return producer.subscriptions.stats
+
+
+@router.get("/stats")
+async def stats():
+    return producer.stats
+
+
+@router.get("/top_of_book")
+async def top_of_book(instrument: Optional[str] = None):
+    """Consolidated best bid/ask of one instrument (e.g. BTC-USD), or of all"""
+    if instrument is None:
+        return [producer.book.top(name) for name in producer.book.instruments]
+    top = producer.book.top(instrument)
+    if top is None:
+        raise HTTPException(status_code=404, detail=f"No quotes for {instrument}")
+    return top
+
+
 @router.post("/load_ohlcv_data")
 async def load_data(request: LoadOHLCVRequest, db: AsyncSession = Depends(db_session)):
     await producer.load_ohlcv_data(
         request.symbol, request.resolution, request.lookback_units, db
     )
     return {"message": "Data loading started"}
+
+
+@router.post("/ohlcv_sync")
+async def start_ohlcv_sync(request: OHLCVSyncRequest):
+    """Keep the symbol's candles in sync in the background"""
+    producer.start_ohlcv_sync(
+        request.symbol, request.resolution, request.lookback_units, request.interval
+    )
+    return {"message": "OHLCV sync started"}
+
+
+@router.post("/ohlcv_sync/stop")
+async def stop_ohlcv_sync(request: Optional[OHLCVSyncStopRequest] = None):
+    """Stop the matching sync jobs, all of them without a body"""
+    request = request or OHLCVSyncStopRequest()
+    await producer.stop_ohlcv_sync(request.symbol, request.resolution)
+    return {"message": "OHLCV sync stopped"}
@@ -1,16 +1,59 @@
 import json
-import pandas as pd
+import asyncio
 from datetime import date, datetime, timedelta, timezone
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from services.common.db.database import get_db_session
+from services.common.db.notify import notify_changed, notify_reset
 from services.common.core.logging import producer_logger as logger
-from services.common.exchanges.delta import DeltaExchange
+from services.common.exchanges.delta import DeltaExchange, normalize_ticker
+from services.common.exchanges.catalog import expiry_from_symbol
+from services.common.core.config import (
+    PRODUCER_WRITE_MODE,
+    PRODUCER_FLUSH_INTERVAL,
+    PRODUCER_BATCH_SIZE,
+    PRODUCER_QUEUE_SIZE,
+    PRODUCER_QUEUE_POLICY,
+    PRODUCER_WRITER_TASKS,
+    PRODUCER_DECODE_MODE,
+    PRODUCER_WRITE_AUDIT_TABLE,
+    PRODUCER_TICK_HISTORY,
+    PRODUCER_HISTORY_FLUSH_INTERVAL,
+    PRODUCER_HISTORY_BATCH_SIZE,
+    PRODUCER_HISTORY_MAX_PENDING,
+    NUMERIC_MODE,
+    LIVE_TRANSPORT,
+    LIVE_STORE_NAME,
+    LIVE_STORE_CAPACITY,
+    LIVE_NOTIFY_CHANNEL,
+    PRODUCER_MAX_SYMBOLS_PER_CONNECTION,
+    PRODUCER_BACKFILL_CONCURRENCY,
+    PRODUCER_BACKFILL_RETRIES,
+    PRODUCER_BACKFILL_RETRY_DELAY,
+    PRODUCER_OHLCV_SYNC_INTERVAL,
+    PRODUCER_CANDLE_COPY_CHUNK,
+    PRODUCER_VENUES,
+    BOOK_STALE_AFTER,
+    SNAPSHOT_UNLOGGED,
+    SNAPSHOT_CHECKPOINT_INTERVAL,
+)
+from services.common.live.chain_store import ChainStore
+from services.common.exchanges.consolidated import ConsolidatedBook, delta_tick
+from services.producer.ingest import IngestQueue
+from services.producer.history import TickHistoryWriter
+from services.producer.snapshot import SnapshotCheckpointer, prepare_snapshot
+from services.producer.subscriptions import SubscriptionRegistry
+from services.producer.venues import VenueIngest
+from services.producer.backfill import BackfillEngine, missing_windows, split_window
+from services.producer.candles import copy_candles
+from services.producer.decoding import decode_ticker_row
+from services.producer.writer import OptionsBatchWriter, merge_tickers, ticker_to_row
 from decimal import Decimal
-from typing import Union, Any
-from sqlalchemy import select, delete, insert
+from typing import Optional, Union, Any
+from sqlalchemy import select, delete
 from services.common.types.models import (
     Options,
+    OptionsSnapshot,
     OptionsTicker,
     FuturesTicker,
     HistoricalData,
@@ -20,6 +63,11 @@ from services.common.types.enums import (
     ResolutionSeconds,
     OptionsTypes,
     FuturesTypes,
+    WriteMode,
+    OverflowPolicy,
+    DecodeMode,
+    NumericMode,
+    LiveTransport,
 )
 
 
@@ -31,38 +79,240 @@ class OptionsProducer:
         self.api_url = api_url
         # Create instance of DeltaExchange that will use our message handler
         self.exchange = None
+        self.write_mode = WriteMode(PRODUCER_WRITE_MODE)
+        self.live_transport = LiveTransport(LIVE_TRANSPORT)
+        # Channel announcing the symbols of every write (LIVE_TRANSPORT=notify)
+        self.notify_channel = (
+            LIVE_NOTIFY_CHANNEL if self.live_transport == LiveTransport.NOTIFY else None
+        )
+        self.numeric_mode = NumericMode(NUMERIC_MODE)
+        self.writer: Optional[OptionsBatchWriter] = None
+        if self.write_mode == WriteMode.BATCH:
+            models = (Options,)
+            if self.numeric_mode == NumericMode.FLOAT:
+                # The snapshot is the live source, options is kept for audit
+                models = (
+                    (OptionsSnapshot, Options)
+                    if PRODUCER_WRITE_AUDIT_TABLE
+                    else (OptionsSnapshot,)
+                )
+            self.writer = OptionsBatchWriter(
+                flush_interval=PRODUCER_FLUSH_INTERVAL,
+                batch_size=PRODUCER_BATCH_SIZE,
+                models=models,
+                notify_channel=self.notify_channel,
+            )
+        elif self.numeric_mode == NumericMode.FLOAT:
+            raise ValueError("NUMERIC_MODE=float requires PRODUCER_WRITE_MODE=batch")
+        if SNAPSHOT_UNLOGGED and self.numeric_mode != NumericMode.FLOAT:
+            raise ValueError("SNAPSHOT_UNLOGGED requires NUMERIC_MODE=float")
+        self.snapshot_checkpointer: Optional[SnapshotCheckpointer] = (
+            SnapshotCheckpointer(SNAPSHOT_CHECKPOINT_INTERVAL)
+            if SNAPSHOT_UNLOGGED
+            else None
+        )
+        self.decode_mode = DecodeMode(PRODUCER_DECODE_MODE)
+        if self.numeric_mode == NumericMode.FLOAT:
+            # The strict path builds Decimals, float mode is float64 from decode on
+            self.decode_mode = DecodeMode.FAST
+        elif self.decode_mode == DecodeMode.FAST and not self.writer:
+            # The ORM writer needs validated ticker models
+            logger.warning(
+                "PRODUCER: Fast decoding requires the batch write mode, using strict"
+            )
+            self.decode_mode = DecodeMode.STRICT
+        self.history: Optional[TickHistoryWriter] = None
+        if PRODUCER_TICK_HISTORY:
+            self.history = TickHistoryWriter(
+                flush_interval=PRODUCER_HISTORY_FLUSH_INTERVAL,
+                batch_size=PRODUCER_HISTORY_BATCH_SIZE,
+                max_pending=PRODUCER_HISTORY_MAX_PENDING,
+            )
+        self.chain_store: Optional[ChainStore] = None
+        if self.live_transport == LiveTransport.SHM:
+            self.chain_store = ChainStore.create(LIVE_STORE_NAME, LIVE_STORE_CAPACITY)
+        self.subscriptions = SubscriptionRegistry(PRODUCER_MAX_SYMBOLS_PER_CONNECTION)
+        if PRODUCER_WRITER_TASKS > 1 and not self.writer:
+            # ORM writes select then insert per symbol, concurrent tasks would
+            # race on the same symbol and apply ticks out of order
+            raise ValueError(
+                "PRODUCER_WRITER_TASKS > 1 requires PRODUCER_WRITE_MODE=batch"
+            )
+        self.ingest_queue = IngestQueue(
+            maxsize=PRODUCER_QUEUE_SIZE,
+            policy=OverflowPolicy(PRODUCER_QUEUE_POLICY),
+            merge=merge_tickers,
+        )
+        self.writer_tasks: list[asyncio.Task] = []
+        # Cross-venue top of book, fed by every Delta frame and the extra venues
+        self.book = ConsolidatedBook(stale_after=BOOK_STALE_AFTER)
+        self.venues: Optional[VenueIngest] = (
+            VenueIngest(self.book, PRODUCER_VENUES) if PRODUCER_VENUES else None
+        )
+        self._backfill: Optional[BackfillEngine] = None
+        self._rest_exchange: Optional[DeltaExchange] = None
+        self.ohlcv_sync_tasks: dict[tuple[str, Resolution], asyncio.Task] = {}
+        self.ohlcv_sync_stats: dict[str, dict[str, Any]] = {}
+        # Ranges the exchange has no candles for, e.g. before a listing
+        self.ohlcv_empty_windows: dict[
+            tuple[str, Resolution], list[tuple[datetime, datetime]]
+        ] = {}
 
     async def message_handler(self, message: str) -> None:
-        """Handle incoming websocket messages"""
+        """Handle incoming websocket messages.
+
+        Runs inside the websocket read loop, so it only decodes the frame,
+        updates the consolidated book and hands it to the ingest queue; the
+        DB writer tasks do the persistence.
+        """
         try:
             logger.debug(
                 f"PRODUCER: Received message: {message[:100]}..."
             )  # Print first 100 chars
-            async with get_db_session() as db:
+            if self.decode_mode == DecodeMode.FAST:
+                row = decode_ticker_row(message, self.numeric_mode)
+                if row:
+                    # The fast decoder's row already has the flattened quotes
+                    tick = delta_tick(row)
+                    if tick is not None:
+                        self.book.update(tick)
+                    await self.ingest_queue.put(row["symbol"], row)
+                return
+
+            try:
+                data = json.loads(message)
+            except json.JSONDecodeError as e:
+                logger.error(
+                    f"PRODUCER: JSON decode error: {e}, message: {message[:100]}..."
+                )
+                return
+            logger.debug(f"PRODUCER: Parsed message type: {data.get('type')}")
+            # Before parse_ticker converts the values in place
+            for tick in normalize_ticker(data):
+                self.book.update(tick)
+            ticker_data = self.parse_ticker(data)
+            if ticker_data:
+                await self.ingest_queue.put(ticker_data.symbol, ticker_data)
+        except Exception as e:
+            logger.error(f"PRODUCER: Error processing message: {e}")
+
+    async def run_db_writer(self, worker_id: int) -> None:
+        """Drain the ingest queue into the database until cancelled"""
+        logger.info(f"PRODUCER: DB writer {worker_id} started")
+        while True:
+            tickers = await self.ingest_queue.get_many(PRODUCER_BATCH_SIZE)
+            try:
+                await self.write_to_db(tickers)
+            except Exception as e:
+                logger.error(f"PRODUCER: DB writer {worker_id} error: {e}")
+            finally:
+                self.ingest_queue.task_done(len(tickers))
+
+    async def write_to_db(
+        self, tickers: list[Union[OptionsTicker, FuturesTicker, dict[str, Any]]]
+    ) -> None:
+        """Write a batch of dequeued tickers using the configured write mode.
+
+        Items are ticker models from the strict decoder or ready-made rows
+        from the fast decoder (batch mode only). The batch is published to
+        the live chain store first, and every item is appended to the tick
+        history before the batch writer coalesces them. Ticks still queued for unsubscribed symbols are dropped.
+        """
+        tickers = [
+            ticker_data
+            for ticker_data in tickers
+            if not self.subscriptions.is_released(
+                ticker_data["symbol"]
+                if isinstance(ticker_data, dict)
+                else ticker_data.symbol
+            )
+        ]
+        if not tickers:
+            return
+        rows = [
+            ticker_data if isinstance(ticker_data, dict) else ticker_to_row(ticker_data)
+            for ticker_data in tickers
+        ]
+        if self.chain_store is not None:
+            self.chain_store.update(rows)
+        if self.history:
+            for row in rows:
+                self.history.add(row)
+        if self.writer:
+            for row in rows:
+                self.writer.add(row)
+            return
+
+        async with get_db_session() as db:
+            for ticker_data in tickers:
+                if self.subscriptions.is_released(ticker_data.symbol):
+                    # Unsubscribed while this batch was being written
+                    continue
                 try:
-                    data = json.loads(message)
-                    logger.debug(f"PRODUCER: Parsed message type: {data.get('type')}")
-                    await self.write_to_db(data, db)
-                except json.JSONDecodeError as e:
+                    await self.save_ticker_to_db(ticker_data, db)
+                    logger.info(
+                        f"PRODUCER: Saved data for symbol: {ticker_data.symbol}"
+                    )
+                except Exception as e:
                     logger.error(
-                        f"PRODUCER: JSON decode error: {e}, message: {message[:100]}..."
+                        f"PRODUCER: Error writing to database: {e}, ticker: {ticker_data}"
                     )
-        except Exception as e:
-            logger.error(f"PRODUCER: Error processing message: {e}")
+                    await db.rollback()
+            if self.notify_channel:
+                await notify_changed(
+                    db,
+                    self.notify_channel,
+                    {ticker_data.symbol for ticker_data in tickers},
+                )
 
-    async def write_to_db(self, message: dict, db: AsyncSession) -> None:
-        """Write message to database using structured models"""
-        logger.debug(f"PRODUCER: Writing to db {message.get('type')}")
+    def start_writers(self) -> None:
+        """Start the DB writer tasks (and the batch/history flush loops)"""
+        if self.writer:
+            self.writer.start()
+        if self.history:
+            self.history.start()
+        if self.snapshot_checkpointer:
+            self.snapshot_checkpointer.start()
+        if not self.writer_tasks:
+            self.writer_tasks = [
+                asyncio.create_task(self.run_db_writer(i))
+                for i in range(PRODUCER_WRITER_TASKS)
+            ]
 
+    async def stop_writers(self, timeout: float = 5.0) -> None:
+        """Drain the ingest queue, then stop the DB writer tasks"""
+        if self.writer_tasks:
+            try:
+                await asyncio.wait_for(self.ingest_queue.join(), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"PRODUCER: Timed out draining ingest queue, {self.ingest_queue.qsize()} messages left"
+                )
+            for task in self.writer_tasks:
+                task.cancel()
+            await asyncio.gather(*self.writer_tasks, return_exceptions=True)
+            self.writer_tasks = []
+        if self.writer:
+            await self.writer.stop()
+        if self.history:
+            await self.history.stop()
+        if self.snapshot_checkpointer:
+            # After the writer's last flush, so the checkpoint has the final state
+            await self.snapshot_checkpointer.stop()
+
+    def parse_ticker(
+        self, message: dict
+    ) -> Optional[Union[OptionsTicker, FuturesTicker]]:
+        """Validate a decoded websocket message into a ticker model"""
         # Only process ticker messages
         if message.get("type") != "v2/ticker":
             logger.warning(f"PRODUCER: Skipping message type: {message.get('type')}")
-            return
+            return None
 
         symbol = message.get("symbol")
         if not symbol:
             logger.warning(f"PRODUCER: Missing symbol: {message}")
-            return
+            return None
 
         try:
             # Convert string values to appropriate types
@@ -92,40 +342,81 @@ class OptionsProducer:
             contract_type = message.get("contract_type")
             if any(contract_type == member.value for member in OptionsTypes):
                 # This is an option
-                ticker_data = OptionsTicker(**message)
+                return OptionsTicker(**message)
             elif any(contract_type == member.value for member in FuturesTypes):
                 # This is a future
-                ticker_data = FuturesTicker(**message)
-            else:
-                logger.warning(f"PRODUCER: Unknown contract type: {contract_type}")
-                return
-
-            await self.save_ticker_to_db(ticker_data, db)
+                return FuturesTicker(**message)
 
-            logger.info(f"PRODUCER: Saved data for symbol: {symbol}")
+            logger.warning(f"PRODUCER: Unknown contract type: {contract_type}")
+            return None
         except Exception as e:
-            logger.error(
-                f"PRODUCER: Error writing to database: {e}, message: {message}"
-            )
-            await db.rollback()
+            logger.error(f"PRODUCER: Error parsing ticker: {e}, message: {message}")
+            return None
 
     async def start_streaming(self, symbol: str, expiry_date: date):
-        """Start streaming data for given symbol and expiry"""
+        """Start streaming data for given symbol and expiry.
+
+        Adds to the running stream: the new contracts are subscribed on the
+        open connection, without reconnecting or clearing other expiries.
+        """
+        key = (symbol, expiry_date)
+        if key in self.subscriptions:
+            logger.info(
+                f"PRODUCER: Already streaming {symbol} with expiry {expiry_date}"
+            )
+            return
         logger.info(
             f"PRODUCER: Starting streaming for {symbol} with expiry {expiry_date}"
         )
-        await self.stop_streaming()
 
-        # Clear the database table before starting new stream
-        await self.clear_database()
+        if self.exchange is None:
+            # Clear the database table before starting a new stream
+            await self.clear_database()
+            if self.chain_store is not None:
+                self.chain_store.clear()
+
+            self.start_writers()
 
-        # Create DeltaExchange instance with our message handler
-        self.exchange = DeltaExchange(self.message_handler)
-        await self.exchange.connect()
+            # Create DeltaExchange instance with our message handler
+            self.exchange = DeltaExchange(self.message_handler)
+            await self.exchange.connect()
+            if self.venues:
+                await self.venues.start()
 
         # Subscribe to the symbol with expiry date
-        await self.exchange.subscribe(symbol, expiry_date)
-        logger.info(f"PRODUCER: Successfully started streaming for {symbol}")
+        contracts = await self.exchange.filtered_contracts(symbol, expiry_date)
+        added = self.subscriptions.add(key, contracts + [symbol])
+        if added:
+            await self.exchange.subscribe_symbols(added)
+        if self.subscriptions.saturated:
+            logger.warning(
+                f"PRODUCER: Connection carries {self.subscriptions.symbol_count} symbols, "
+                f"above the {self.subscriptions.max_symbols_per_connection} per connection limit"
+            )
+        logger.info(
+            f"PRODUCER: Successfully started streaming for {symbol} ({len(added)} new symbols)"
+        )
+
+    async def stop_subscription(self, symbol: str, expiry_date: date):
+        """Stop streaming one symbol and expiry, the others keep running.
+
+        Symbols no other subscription uses are unsubscribed and removed from
+        the live tables. Their ticks still in the ingest queue are dropped by
+        write_to_db, the ones buffered in the batch writer are discarded here.
+        """
+        released = self.subscriptions.remove((symbol, expiry_date))
+        if not released:
+            return
+        if self.exchange:
+            await self.exchange.unsubscribe(released)
+        if self.writer:
+            await self.writer.discard(released)
+        if self.chain_store is not None:
+            self.chain_store.remove(released)
+        await self.remove_symbols(released)
+        logger.info(
+            f"PRODUCER: Stopped streaming {symbol} with expiry {expiry_date} ({len(released)} symbols)"
+        )
 
     async def stop_streaming(self):
         """Stop current streaming session"""
@@ -134,7 +425,91 @@ class OptionsProducer:
             await self.exchange.unsubscribe()
             # Disconnect from websocket
             await self.exchange.disconnect()
+            self.exchange = None
             logger.info("PRODUCER: Streaming stopped successfully")
+        if self.venues:
+            await self.venues.stop()
+        self.subscriptions.clear()
+        await self.stop_writers()
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Ingest metrics for the stats endpoint"""
+        rest = self.exchange or self._rest_exchange
+        return {
+            "write_mode": self.write_mode.value,
+            "decode_mode": self.decode_mode.value,
+            "numeric_mode": self.numeric_mode.value,
+            "queue": self.ingest_queue.stats,
+            "writer_tasks": len(self.writer_tasks),
+            "writer": self.writer.stats if self.writer else None,
+            "tick_history": self.history.stats if self.history else None,
+            "snapshot_checkpoint": (
+                self.snapshot_checkpointer.stats if self.snapshot_checkpointer else None
+            ),
+            "subscriptions": self.subscriptions.stats,
+            "connection": self.exchange.stats if self.exchange else None,
+            "products_catalog": self.exchange.catalog.stats if self.exchange else None,
+            "http_pool": self.exchange.http_stats if self.exchange else None,
+            "last_backfill": self._backfill.last_run if self._backfill else None,
+            "candle_cache": (
+                rest.candle_cache.stats if rest and rest.candle_cache else None
+            ),
+            "ohlcv_sync": {
+                "jobs": [
+                    f"{symbol}:{resolution.value}"
+                    for symbol, resolution in self.ohlcv_sync_tasks
+                ],
+                "last": self.ohlcv_sync_stats,
+            },
+            "consolidated_book": self.book.stats,
+            "venues": self.venues.stats if self.venues else None,
+            "live_transport": self.live_transport.value,
+            "chain_store": (
+                {
+                    "symbols": len(self.chain_store),
+                    "version": self.chain_store.version,
+                    "overflowed": self.chain_store.overflowed,
+                }
+                if self.chain_store is not None
+                else None
+            ),
+        }
+
+    async def prepare_snapshot(self) -> None:
+        """Apply SNAPSHOT_UNLOGGED to the snapshot table and restore it (startup)"""
+        try:
+            await prepare_snapshot(SNAPSHOT_UNLOGGED)
+        except Exception as e:
+            logger.error(f"PRODUCER: Error preparing the snapshot table: {e}")
+
+    def close_chain_store(self) -> None:
+        """Release the shared-memory chain store (process shutdown)"""
+        if self.chain_store is not None:
+            self.chain_store.close()
+            self.chain_store = None
+
+    @property
+    def rest_exchange(self) -> DeltaExchange:
+        """The streaming connection, or a REST-only client while not streaming"""
+        if self.exchange is not None:
+            return self.exchange
+        if self._rest_exchange is None:
+            self._rest_exchange = DeltaExchange(self.message_handler)
+        return self._rest_exchange
+
+    @property
+    def backfill_engine(self) -> BackfillEngine:
+        """Backfill engine bound to the current exchange"""
+        exchange = self.rest_exchange
+        if self._backfill is None or self._backfill.exchange is not exchange:
+            self._backfill = BackfillEngine(
+                exchange,
+                concurrency=PRODUCER_BACKFILL_CONCURRENCY,
+                retries=PRODUCER_BACKFILL_RETRIES,
+                retry_delay=PRODUCER_BACKFILL_RETRY_DELAY,
+            )
+        return self._backfill
 
     async def load_ohlcv_data(
         self,
@@ -144,93 +519,164 @@ class OptionsProducer:
         db: AsyncSession,
         request_split: int = 1000,
     ) -> None:
-        """Load OHLCV data from Delta Exchange API"""
-        if self.exchange is None:
-            logger.error("PRODUCER: DeltaExchange instance is not initialized")
-            return
-
+        """Sync the stored OHLCV lookback window with Delta Exchange.
+
+        Only what the table is missing is downloaded: the candles after the
+        newest stored one (re-fetched too, it may have been still forming)
+        and the gaps inside the window, upserted in place. The first sync
+        costs the full lookback, later ones a single small request. Gaps the
+        exchange returned nothing for are remembered and not asked for again.
+        """
         try:
-            requests = self.calculate_requests(
-                symbol, resolution, lookback_units, request_split
+            step = self.resolution_step(resolution)
+            end_time = datetime.now(timezone.utc)
+            start_time = end_time - step * lookback_units
+            result = await db.execute(
+                select(HistoricalData.time)
+                .where(
+                    HistoricalData.symbol == symbol,
+                    HistoricalData.resolution == resolution.value,
+                    HistoricalData.time >= start_time,
+                )
+                .order_by(HistoricalData.time)
             )
-            dfs: list[pd.DataFrame] = []
-            for request in requests:
-                dfs.append(
-                    await self.exchange.get_historical_data(
-                        coin=request["symbol"],
-                        resolution=request["resolution"],
-                        start_date=request["start_date"],
-                        end_date=request["end_date"],
-                        set_index=True,
-                    )
+            stored = list(result.scalars())
+            key = (symbol, resolution)
+            gaps = missing_windows(
+                stored,
+                start_time,
+                end_time,
+                step,
+                self.ohlcv_empty_windows.get(key, ()),
+            )
+            requests = [
+                {
+                    "symbol": symbol,
+                    "resolution": resolution,
+                    "start_date": window_start,
+                    "end_date": window_end,
+                }
+                for gap_start, gap_end in gaps.windows
+                for window_start, window_end in split_window(
+                    gap_start, gap_end, step, request_split
+                )
+            ]
+            engine = self.backfill_engine
+            df = await engine.run(requests)
+            if not engine.last_run.get("failed_chunks"):
+                # Every gap was fetched, whatever is still missing is empty upstream
+                synced = missing_windows(
+                    sorted(set(stored).union(df["time"])), start_time, end_time, step
                 )
-            df = (
-                pd.concat(dfs, ignore_index=False)
-                .sort_index(ascending=True)
-                .reset_index(drop=False)
+                self.ohlcv_empty_windows[key] = synced.windows[:-1]
+
+            # Candles that fell out of the lookback window are pruned with the load
+            load = await copy_candles(
+                df, resolution, PRODUCER_CANDLE_COPY_CHUNK, prune=(symbol, start_time)
             )
-            delete_stmt = delete(HistoricalData)  # No WHERE clause = delete all
-            await db.execute(delete_stmt)
-            if not df.empty:
-                records_to_insert = df[
-                    ["symbol", "time", "open", "high", "low", "close", "volume"]
-                ].to_dict(orient="records")
-                insert_stmt = insert(HistoricalData).values(records_to_insert)
-                await db.execute(insert_stmt)
-            await db.commit()
 
+            self.ohlcv_sync_stats[f"{symbol}:{resolution.value}"] = {
+                "synced_at": end_time.isoformat(),
+                "stored_candles": len(stored),
+                "fetched_candles": len(df),
+                "requests": len(requests),
+                "gaps_filled": len(gaps.internal),
+                "load_rows_per_sec": load["rows_per_sec"],
+            }
+            logger.info(
+                f"PRODUCER: Synced {symbol} {resolution.value} candles: {len(df)} fetched "
+                f"in {len(requests)} requests, {len(stored)} already stored"
+            )
         except Exception as e:
             logger.error(f"PRODUCER: Error loading OHLCV data: {e}")
 
+    async def run_ohlcv_sync(
+        self, symbol: str, resolution: Resolution, lookback_units: int, interval: float
+    ) -> None:
+        """Keep one symbol and resolution in sync until cancelled"""
+        logger.info(
+            f"PRODUCER: OHLCV sync started for {symbol} {resolution.value} every {interval}s"
+        )
+        while True:
+            async with get_db_session() as db:
+                await self.load_ohlcv_data(symbol, resolution, lookback_units, db)
+            await asyncio.sleep(interval)
+
+    def start_ohlcv_sync(
+        self,
+        symbol: str,
+        resolution: Resolution,
+        lookback_units: int,
+        interval: Optional[float] = None,
+    ) -> None:
+        """Start (or restart) the background sync job of a symbol and resolution"""
+        key = (symbol, resolution)
+        task = self.ohlcv_sync_tasks.pop(key, None)
+        if task:
+            task.cancel()
+        self.ohlcv_sync_tasks[key] = asyncio.create_task(
+            self.run_ohlcv_sync(
+                symbol,
+                resolution,
+                lookback_units,
+                interval or PRODUCER_OHLCV_SYNC_INTERVAL,
+            )
+        )
+
+    async def stop_ohlcv_sync(
+        self, symbol: Optional[str] = None, resolution: Optional[Resolution] = None
+    ) -> None:
+        """Stop the sync jobs matching symbol and resolution, all without them"""
+        keys = [
+            key
+            for key in self.ohlcv_sync_tasks
+            if symbol in (None, key[0]) and resolution in (None, key[1])
+        ]
+        tasks = [self.ohlcv_sync_tasks.pop(key) for key in keys]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if not self.ohlcv_sync_tasks and self._rest_exchange:
+            await self._rest_exchange.close_http()
+            self._rest_exchange = None
+
     # HELPER METHODS
     @staticmethod
-    def calculate_requests(
-        symbol: str, resolution: Resolution, lookback_units: int, request_split: int
-    ) -> list[dict[str, Any]]:
-        """Calculate requests for loading historical data"""
+    def resolution_step(resolution: Resolution) -> timedelta:
+        """Duration of one candle"""
         resolution_seconds = ResolutionSeconds.__members__.get(resolution.name)
         if resolution_seconds is None:
             raise ValueError(f"Invalid resolution: {resolution}")
-
-        # split into multiple requests if lookback_units > 1000
-        end_time = datetime.now(timezone.utc)
-        start_time = end_time - timedelta(
-            seconds=resolution_seconds.value * (lookback_units % request_split)
-        )
-        requests: list[dict[str, Any]] = [
-            {
-                "symbol": symbol,
-                "resolution": resolution,
-                "start_date": start_time,
-                "end_date": end_time,
-            }
-        ]
-        if lookback_units > request_split:
-            for i in range(0, lookback_units // request_split):
-                end_time = start_time
-                start_time = end_time - timedelta(
-                    seconds=resolution_seconds.value * request_split
-                )
-                requests.append(
-                    {
-                        "symbol": symbol,
-                        "resolution": resolution,
-                        "start_date": start_time,
-                        "end_date": end_time,
-                    }
-                )
-        return requests
+        return timedelta(seconds=resolution_seconds.value)
 
     async def clear_database(self):
-        """Clear all data from the options table"""
+        """Clear the latest-state options tables, the tick history is kept"""
         try:
             async with get_db_session() as db:
-                await db.execute(text("TRUNCATE TABLE market_data.options"))
+                await db.execute(
+                    text(
+                        "TRUNCATE TABLE market_data.options, market_data.options_snapshot, "
+                        "market_data.options_snapshot_checkpoint"
+                    )
+                )
+                if self.notify_channel:
+                    await notify_reset(db, self.notify_channel)
                 await db.commit()
                 logger.info("PRODUCER: Database table cleared successfully")
         except Exception as e:
             logger.error(f"PRODUCER: Error clearing database: {e}")
 
+    async def remove_symbols(self, symbols: list[str]):
+        """Delete unsubscribed symbols from the latest-state options tables"""
+        try:
+            async with get_db_session() as db:
+                for model in (Options, OptionsSnapshot):
+                    await db.execute(delete(model).where(model.symbol.in_(symbols)))
+                if self.notify_channel:
+                    await notify_reset(db, self.notify_channel)
+        except Exception as e:
+            logger.error(f"PRODUCER: Error removing symbols: {e}")
+
     def prepare_numeric_values(self, data: dict):
         """Convert string values to appropriate numeric types"""
         # Convert common numeric fields
@@ -365,6 +811,7 @@ class OptionsProducer:
                 timestamp=ticker.timestamp,
                 contract_type=ticker.contract_type.value,
                 underlying_asset_symbol=ticker.underlying_asset_symbol,
+                expiry_date=expiry_from_symbol(ticker.symbol),
                 description=ticker.description,
                 product_id=ticker.product_id,
                 # Price information
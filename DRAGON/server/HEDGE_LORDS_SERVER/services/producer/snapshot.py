@@ -0,0 +1,134 @@
+import time
+import asyncio
+from typing import Any, Optional
+from services.common.db.database import get_raw_connection
+from services.common.core.logging import producer_logger as logger
+from services.common.types.models import OptionsSnapshot
+
+SNAPSHOT_TABLE = "market_data.options_snapshot"
+CHECKPOINT_TABLE = "market_data.options_snapshot_checkpoint"
+
+_COLUMNS = ", ".join(column.name for column in OptionsSnapshot.__table__.columns)
+
+_PERSISTENCE_SQL = (
+    f"SELECT relpersistence FROM pg_class WHERE oid = to_regclass('{SNAPSHOT_TABLE}')"
+)
+_CHECKPOINT_SQL = f"INSERT INTO {CHECKPOINT_TABLE} ({_COLUMNS}) SELECT {_COLUMNS} FROM {SNAPSHOT_TABLE}"
+# Only into an empty snapshot, a running producer's state is never replaced
+_RESTORE_SQL = (
+    f"INSERT INTO {SNAPSHOT_TABLE} ({_COLUMNS}) SELECT {_COLUMNS} FROM {CHECKPOINT_TABLE} "
+    f"WHERE NOT EXISTS (SELECT 1 FROM {SNAPSHOT_TABLE})"
+)
+
+
+def _row_count(status: str) -> int:
+    """Rows of an "INSERT 0 <n>" command status"""
+    return int(status.rsplit(" ", 1)[-1])
+
+
+async def prepare_snapshot(unlogged: bool) -> int:
+    """Make the snapshot table UNLOGGED or logged, then restore it if empty.
+
+    Switching rewrites the table (it is small and nothing writes yet at
+    startup). An unlogged snapshot comes back empty after a crash, and a
+    restart after a switch to logged may find it so too, so in both cases
+    the last checkpoint is loaded. Returns the number of restored rows.
+    """
+    wanted = "u" if unlogged else "p"
+    async with get_raw_connection() as conn:
+        persistence = await conn.fetchval(_PERSISTENCE_SQL)
+        if persistence is None:
+            logger.warning(f"PRODUCER: {SNAPSHOT_TABLE} does not exist yet")
+            return 0
+        if persistence != wanted:
+            await conn.execute(
+                f"ALTER TABLE {SNAPSHOT_TABLE} SET {'UNLOGGED' if unlogged else 'LOGGED'}"
+            )
+            logger.info(
+                f"PRODUCER: {SNAPSHOT_TABLE} is now {'UNLOGGED' if unlogged else 'logged'}"
+            )
+        restored = _row_count(await conn.execute(_RESTORE_SQL))
+    if restored:
+        logger.info(f"PRODUCER: Restored {restored} snapshot rows from the checkpoint")
+    return restored
+
+
+class SnapshotCheckpointer:
+    """Copies the UNLOGGED options_snapshot to its logged checkpoint table.
+
+    The snapshot is rewritten at tick rate without WAL; the checkpoint costs
+    one copy of the latest state every ``interval`` seconds instead. The copy
+    replaces the checkpoint in a single transaction, so it always holds a
+    consistent snapshot.
+    """
+
+    def __init__(self, interval: float = 60.0):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._stop = asyncio.Event()
+
+        # Metrics
+        self.checkpoints = 0
+        self.failed_checkpoints = 0
+        self.last_rows = 0
+        self.last_checkpoint_ms = 0.0
+        self.last_checkpoint_at: Optional[float] = None
+
+    async def checkpoint(self) -> int:
+        """Replace the checkpoint with the current snapshot, returns its rows"""
+        start = time.perf_counter()
+        try:
+            async with get_raw_connection() as conn:
+                async with conn.transaction():
+                    await conn.execute(f"TRUNCATE TABLE {CHECKPOINT_TABLE}")
+                    rows = _row_count(await conn.execute(_CHECKPOINT_SQL))
+        except Exception as e:
+            self.failed_checkpoints += 1
+            logger.error(f"PRODUCER: Error checkpointing the snapshot: {e}")
+            return 0
+
+        self.checkpoints += 1
+        self.last_rows = rows
+        self.last_checkpoint_ms = (time.perf_counter() - start) * 1000
+        self.last_checkpoint_at = time.time()
+        logger.debug(
+            f"PRODUCER: Checkpointed {rows} snapshot rows in {self.last_checkpoint_ms:.1f} ms"
+        )
+        return rows
+
+    async def run(self) -> None:
+        """Checkpoint loop, runs until stop() is called"""
+        logger.info(f"PRODUCER: Snapshot checkpoints every {self.interval}s")
+        while not self._stop.is_set():
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                await self.checkpoint()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._stop.clear()
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop the loop and take a last checkpoint of the final state"""
+        if self._task is None:
+            return
+        self._stop.set()
+        await self._task
+        self._task = None
+        await self.checkpoint()
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            "checkpoints": self.checkpoints,
+            "failed_checkpoints": self.failed_checkpoints,
+            "last_rows": self.last_rows,
+            "last_checkpoint_ms": round(self.last_checkpoint_ms, 3),
+            "last_checkpoint_age_s": (
+                round(time.time() - self.last_checkpoint_at, 1)
+                if self.last_checkpoint_at
+                else None
+            ),
+        }
@@ -0,0 +1,95 @@
+from datetime import date
+from typing import Any, Iterable
+
+# (underlying, expiry date) of one /producer/subscribe request
+SubscriptionKey = tuple[str, date]
+
+
+class SubscriptionRegistry:
+    """Active (underlying, expiry) subscriptions sharing one websocket.
+
+    Different subscriptions can include the same symbol (every expiry of an
+    underlying also streams the underlying's perpetual), so symbols are
+    reference counted: ``add`` returns only the symbols that still need a
+    subscribe message and ``remove`` only the ones no subscription uses
+    anymore. Released symbols are remembered until a subscription adds them
+    again, so ticks still queued for them can be told apart and dropped.
+    """
+
+    def __init__(self, max_symbols_per_connection: int):
+        self.max_symbols_per_connection = max_symbols_per_connection
+        self._subscriptions: dict[SubscriptionKey, tuple[str, ...]] = {}
+        self._refcounts: dict[str, int] = {}
+        self._released: set[str] = set()
+
+    def __contains__(self, key: SubscriptionKey) -> bool:
+        return key in self._subscriptions
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    @property
+    def symbols(self) -> list[str]:
+        return list(self._refcounts)
+
+    @property
+    def symbol_count(self) -> int:
+        return len(self._refcounts)
+
+    @property
+    def saturated(self) -> bool:
+        """The connection carries as many symbols as it should, shard beyond this"""
+        return self.symbol_count >= self.max_symbols_per_connection
+
+    def add(self, key: SubscriptionKey, symbols: Iterable[str]) -> list[str]:
+        """Register a subscription, returns the symbols new to the connection"""
+        if key in self._subscriptions:
+            return []
+        symbols = tuple(dict.fromkeys(symbols))
+        self._subscriptions[key] = symbols
+        added = []
+        for symbol in symbols:
+            count = self._refcounts.get(symbol, 0)
+            if not count:
+                added.append(symbol)
+                self._released.discard(symbol)
+            self._refcounts[symbol] = count + 1
+        return added
+
+    def remove(self, key: SubscriptionKey) -> list[str]:
+        """Drop a subscription, returns the symbols no longer needed"""
+        released = []
+        for symbol in self._subscriptions.pop(key, ()):
+            count = self._refcounts[symbol] - 1
+            if count:
+                self._refcounts[symbol] = count
+            else:
+                del self._refcounts[symbol]
+                released.append(symbol)
+        self._released.update(released)
+        return released
+
+    def is_released(self, symbol: str) -> bool:
+        """The symbol was unsubscribed and no subscription has added it back"""
+        return symbol in self._released
+
+    def clear(self) -> None:
+        self._subscriptions.clear()
+        self._refcounts.clear()
+        self._released.clear()
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            "subscriptions": [
+                {
+                    "symbol": underlying,
+                    "expiry_date": expiry_date.isoformat(),
+                    "symbols": len(symbols),
+                }
+                for (underlying, expiry_date), symbols in self._subscriptions.items()
+            ],
+            "symbols_per_connection": self.symbol_count,
+            "max_symbols_per_connection": self.max_symbols_per_connection,
+            "saturated": self.saturated,
+        }
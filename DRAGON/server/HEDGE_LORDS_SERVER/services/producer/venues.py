@@ -0,0 +1,86 @@
+import asyncio
+from typing import Any, Optional
+from services.common.core.config import EXCHANGES
+from services.common.core.logging import producer_logger as logger
+from services.common.exchanges.base import BaseExchange
+from services.common.exchanges.binance import BinanceExchange
+from services.common.exchanges.consolidated import ConsolidatedBook
+
+# Adapters that can run next to the Delta stream, keyed like EXCHANGES
+VENUE_ADAPTERS: dict[str, type[BaseExchange]] = {
+    "binance": BinanceExchange,
+}
+
+
+class VenueIngest:
+    """Extra venues streaming into the consolidated book.
+
+    Every adapter runs its own websocket task and its frames are normalized
+    in the read loop straight into the book, nothing is persisted. The Delta
+    stream feeds the same book from the producer's message handler, ahead of
+    the ingest queue.
+    """
+
+    def __init__(self, book: ConsolidatedBook, venues: list[str]):
+        unknown = [venue for venue in venues if venue not in VENUE_ADAPTERS]
+        if unknown:
+            raise ValueError(f"No venue adapter for {', '.join(unknown)}")
+        self.book = book
+        self.venues = venues
+        self.exchanges: dict[str, BaseExchange] = {}
+        self.ticks: dict[str, int] = dict.fromkeys(venues, 0)
+        self.errors: dict[str, int] = dict.fromkeys(venues, 0)
+
+    def _handler(self, venue: str):
+        async def on_message(message: str) -> None:
+            try:
+                for tick in self.exchanges[venue].normalize(message):
+                    self.book.update(tick)
+                    self.ticks[venue] += 1
+            except Exception as e:
+                self.errors[venue] += 1
+                logger.error(f"PRODUCER: Error normalizing {venue} message: {e}")
+
+        return on_message
+
+    async def _start_venue(self, venue: str) -> None:
+        exchange = VENUE_ADAPTERS[venue](self._handler(venue))
+        self.exchanges[venue] = exchange
+        await exchange.connect()
+        for coin in EXCHANGES[venue]["coins"]:
+            await exchange.subscribe(coin, None)
+        logger.info(f"PRODUCER: Streaming {venue} top of book")
+
+    async def start(self) -> None:
+        """Connect every venue that is not running yet"""
+        pending = [venue for venue in self.venues if venue not in self.exchanges]
+        results = await asyncio.gather(
+            *(self._start_venue(venue) for venue in pending), return_exceptions=True
+        )
+        for venue, result in zip(pending, results):
+            if isinstance(result, Exception):
+                logger.error(f"PRODUCER: Failed to start {venue}: {result}")
+
+    async def stop(self) -> None:
+        exchanges, self.exchanges = self.exchanges, {}
+        await asyncio.gather(
+            *(exchange.disconnect() for exchange in exchanges.values()),
+            return_exceptions=True,
+        )
+
+    @property
+    def running(self) -> bool:
+        return bool(self.exchanges)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            venue: {
+                "connection": (
+                    self.exchanges[venue].stats if venue in self.exchanges else None
+                ),
+                "ticks": self.ticks[venue],
+                "errors": self.errors[venue],
+            }
+            for venue in self.venues
+        }
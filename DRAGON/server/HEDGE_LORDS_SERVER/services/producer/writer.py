@@ -0,0 +1,305 @@
+import time
+import asyncio
+from typing import Any, Optional, Union
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from services.common.db.database import Base, get_db_session
+from services.common.db.notify import notify_changed
+from services.common.core.logging import producer_logger as logger
+from services.common.exchanges.catalog import expiry_from_symbol
+from services.common.types.models import (
+    Options,
+    OptionsSnapshot,
+    OptionsTicker,
+    FuturesTicker,
+)
+
+# Every column written by the producer (updated_at is maintained by the upsert)
+OPTIONS_COLUMNS: tuple[str, ...] = tuple(
+    column.name for column in Options.__table__.columns if column.name != "updated_at"
+)
+
+QUOTE_FIELDS = (
+    "best_bid",
+    "best_ask",
+    "bid_size",
+    "ask_size",
+    "bid_iv",
+    "ask_iv",
+    "mark_iv",
+    "impact_mid_price",
+)
+GREEK_FIELDS = ("delta", "gamma", "theta", "vega", "rho")
+PRICE_BAND_FIELDS = ("upper_limit", "lower_limit")
+
+# Nested fields only overwrite the stored value when the tick carries one, the
+# same partial update rule used by OptionsProducer.save_ticker_to_db
+MERGE_COLUMNS = frozenset(QUOTE_FIELDS + GREEK_FIELDS + PRICE_BAND_FIELDS)
+
+# Postgres accepts at most 32767 bind parameters per statement
+MAX_ROWS_PER_STATEMENT = 32767 // len(OPTIONS_COLUMNS)
+
+
+def ticker_to_row(ticker: Union[OptionsTicker, FuturesTicker]) -> dict[str, Any]:
+    """Flatten a validated ticker into a market_data.options row"""
+    row = dict.fromkeys(OPTIONS_COLUMNS)
+    for key, value in ticker.model_dump(
+        exclude={"quotes", "greeks", "price_band"}
+    ).items():
+        if key in row:
+            row[key] = value
+    row["contract_type"] = ticker.contract_type.value
+    row["expiry_date"] = expiry_from_symbol(ticker.symbol)
+
+    if ticker.quotes:
+        for field in QUOTE_FIELDS:
+            row[field] = getattr(ticker.quotes, field)
+    if ticker.greeks:
+        for field in GREEK_FIELDS:
+            row[field] = getattr(ticker.greeks, field)
+    if ticker.price_band:
+        for field in PRICE_BAND_FIELDS:
+            row[field] = getattr(ticker.price_band, field)
+    return row
+
+
+def merge_rows(existing: dict[str, Any], incoming: dict[str, Any]) -> dict[str, Any]:
+    """Apply a newer row for the same symbol on top of an older one"""
+    merged = dict(incoming)
+    for field in MERGE_COLUMNS:
+        if merged.get(field) is None:
+            merged[field] = existing.get(field)
+    return merged
+
+
+def merge_tickers(
+    existing: Union[OptionsTicker, FuturesTicker, dict[str, Any]],
+    incoming: Union[OptionsTicker, FuturesTicker, dict[str, Any]],
+) -> Union[OptionsTicker, FuturesTicker, dict[str, Any]]:
+    """merge_rows for dequeued items, ticker models or ready-made rows"""
+    if isinstance(incoming, dict):
+        return merge_rows(existing, incoming)
+    updates = {}
+    for name in ("quotes", "greeks", "price_band"):
+        old, new = getattr(existing, name, None), getattr(incoming, name, None)
+        if old is None:
+            continue
+        if new is None:
+            updates[name] = old
+        else:
+            updates[name] = new.model_copy(
+                update={
+                    field: getattr(old, field)
+                    for field in type(new).model_fields
+                    if getattr(new, field) is None
+                }
+            )
+    return incoming.model_copy(update=updates)
+
+
+def build_upsert(rows: list[dict[str, Any]], model: type[Base] = Options):
+    """Multi-row INSERT ... ON CONFLICT (symbol) DO UPDATE.
+
+    Rows carry every market_data.options column, tables storing a subset of
+    them (OptionsSnapshot) only get the columns they have.
+    """
+    table = model.__table__
+    columns = [column.name for column in table.columns if column.name != "updated_at"]
+    if model is not Options:
+        rows = [{column: row[column] for column in columns} for row in rows]
+    stmt = insert(table).values(rows)
+    set_ = {}
+    for column in columns:
+        if column == "symbol":
+            continue
+        if column in MERGE_COLUMNS:
+            set_[column] = func.coalesce(stmt.excluded[column], table.c[column])
+        else:
+            set_[column] = stmt.excluded[column]
+    set_["updated_at"] = func.now()
+    return stmt.on_conflict_do_update(index_elements=[table.c.symbol], set_=set_)
+
+
+class CoalescingBuffer:
+    """Latest row per symbol between flushes (last value wins).
+
+    A tick for a symbol that is already buffered is merged into the buffered
+    row with merge_rows, so the write volume per flush is bounded by the
+    number of distinct symbols rather than the message rate.
+    """
+
+    def __init__(self):
+        self._rows: dict[str, dict[str, Any]] = {}
+        self.ticks_received = 0
+        self.ticks_coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, row: dict[str, Any]) -> None:
+        self.ticks_received += 1
+        symbol = row["symbol"]
+        existing = self._rows.get(symbol)
+        if existing is None:
+            self._rows[symbol] = row
+        else:
+            self._rows[symbol] = merge_rows(existing, row)
+            self.ticks_coalesced += 1
+
+    def restore(self, rows: list[dict[str, Any]]) -> None:
+        """Put back rows from a failed flush underneath anything newer"""
+        for row in rows:
+            symbol = row["symbol"]
+            newer = self._rows.get(symbol)
+            self._rows[symbol] = row if newer is None else merge_rows(row, newer)
+
+    def discard(self, symbols: list[str]) -> None:
+        for symbol in symbols:
+            self._rows.pop(symbol, None)
+
+    def drain(self) -> list[dict[str, Any]]:
+        rows = list(self._rows.values())
+        self._rows = {}
+        return rows
+
+
+class OptionsBatchWriter:
+    """Collects ticker rows and upserts them into market_data.options in batches.
+
+    A flush happens every ``flush_interval`` seconds, or as soon as
+    ``batch_size`` rows are pending, whichever comes first. Each flush upserts
+    the rows into every table in ``models`` within one transaction, and with
+    a ``notify_channel`` announces the flushed symbols in that transaction.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 0.25,
+        batch_size: int = 500,
+        models: tuple[type[Base], ...] = (Options,),
+        notify_channel: Optional[str] = None,
+    ):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.models = models
+        self.notify_channel = notify_channel
+        self._buffer = CoalescingBuffer()
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.should_stop = False
+
+        # Metrics
+        self.flush_count = 0
+        self.rows_written = 0
+        self.last_flush_rows = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.total_flush_ms = 0.0
+        self.failed_flushes = 0
+
+    def add(self, row: dict[str, Any]) -> None:
+        """Buffer a row for the next flush"""
+        self._buffer.add(row)
+        if len(self._buffer) >= self.batch_size:
+            self._flush_requested.set()
+
+    async def discard(self, symbols: list[str]) -> None:
+        """Drop the pending rows of symbols, waiting for an in-flight flush.
+
+        Once this returns no flush can write those symbols again unless they
+        are added anew.
+        """
+        async with self._flush_lock:
+            self._buffer.discard(symbols)
+
+    async def flush(self) -> int:
+        """Write all pending rows, returns the number of rows written"""
+        async with self._flush_lock:
+            if not len(self._buffer):
+                return 0
+            # One row per symbol, which ON CONFLICT DO UPDATE also requires
+            rows = self._buffer.drain()
+
+            start = time.perf_counter()
+            try:
+                async with get_db_session() as db:
+                    for model in self.models:
+                        for i in range(0, len(rows), MAX_ROWS_PER_STATEMENT):
+                            await db.execute(
+                                build_upsert(
+                                    rows[i : i + MAX_ROWS_PER_STATEMENT], model
+                                )
+                            )
+                    if self.notify_channel:
+                        await notify_changed(
+                            db, self.notify_channel, [row["symbol"] for row in rows]
+                        )
+            except Exception as e:
+                self.failed_flushes += 1
+                # Keep the rows so the next flush retries them
+                self._buffer.restore(rows)
+                logger.error(f"PRODUCER: Error flushing {len(rows)} rows: {e}")
+                return 0
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.flush_count += 1
+            self.rows_written += len(rows)
+            self.last_flush_rows = len(rows)
+            self.last_flush_ms = elapsed_ms
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+            self.total_flush_ms += elapsed_ms
+            logger.info(f"PRODUCER: Flushed {len(rows)} rows in {elapsed_ms:.1f} ms")
+            return len(rows)
+
+    async def run(self) -> None:
+        """Flush loop, runs until stop() is called"""
+        logger.info(
+            f"PRODUCER: Batch writer started (interval={self.flush_interval}s, batch_size={self.batch_size})"
+        )
+        while not self.should_stop:
+            try:
+                await asyncio.wait_for(
+                    self._flush_requested.wait(), timeout=self.flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+        logger.info("PRODUCER: Batch writer stopped")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self.should_stop = False
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write whatever is still pending"""
+        self.should_stop = True
+        self._flush_requested.set()
+        if self._task:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            "pending_rows": len(self._buffer),
+            "ticks_received": self._buffer.ticks_received,
+            "ticks_coalesced": self._buffer.ticks_coalesced,
+            "flush_count": self.flush_count,
+            "failed_flushes": self.failed_flushes,
+            "rows_written": self.rows_written,
+            "last_flush_rows": self.last_flush_rows,
+            "avg_rows_per_flush": (
+                self.rows_written / self.flush_count if self.flush_count else 0.0
+            ),
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "avg_flush_ms": (
+                round(self.total_flush_ms / self.flush_count, 3)
+                if self.flush_count
+                else 0.0
+            ),
+            "max_flush_ms": round(self.max_flush_ms, 3),
+        }
@@ -9,7 +9,12 @@ from services.common.core.config import DB_USER, DB_PASSWORD, DB_HOST, DB_PORT,
 from sqlalchemy.orm import sessionmaker, Session
 from services.common.types.enums import Resolution
 from services.common.core.logging import simulator_logger as logger
-from services.common.types.models import HistoricalData, SimulateRequest
+from services.common.types.models import SimulateRequest
+from services.common.db.candles import (
+    candles_query,
+    source_resolution,
+    stored_resolutions_query,
+)
 from services.common.types.enums import ResolutionSeconds
 from services.common.math.cpu_monte import simulate
 
@@ -70,7 +75,7 @@ class SimulatorService:
             )
             sim_file_path = os.path.join(self.sim_directory, sim_file_name)
 
-            prices = self.db_historical_data
+            prices = self.db_historical_data(symbol, resolution)
             if prices.empty:
                 logger.warning(f"No historical data found for symbol {symbol}")
                 return None
@@ -104,14 +109,24 @@ class SimulatorService:
             )
 
     # helper methods
-    @property
-    def db_historical_data(self) -> pd.DataFrame:
-        """Fetch historical data for a given symbol."""
+    def db_historical_data(self, symbol: str, resolution: Resolution) -> pd.DataFrame:
+        """Fetch historical data for a given symbol and resolution.
+
+        Resolutions that are not stored are resampled by the database from
+        finer stored candles.
+        """
         prices = pd.DataFrame()
-        prices_query = select(HistoricalData.time, HistoricalData.close)
 
         with self.get_sync_db_session() as session:
-            result = session.execute(prices_query)
+            stored = [
+                Resolution(value)
+                for value in session.execute(stored_resolutions_query(symbol)).scalars()
+            ]
+            source = source_resolution(resolution, stored)
+            if source is None:
+                return prices
+            candles = candles_query(symbol, resolution, source).subquery()
+            result = session.execute(select(candles.c.time, candles.c.close))
             all_rows_as_mappings = result.mappings().all()
             if all_rows_as_mappings:
                 prices = pd.DataFrame(all_rows_as_mappings)
@@ -0,0 +1,202 @@
+import asyncio
+import time
+import httpx
+import pandas as pd
+from services.common.exchanges.ratelimit import TokenBucket
+from services.common.types.enums import Resolution
+from services.producer.backfill import BackfillEngine, missing_windows, split_window
+from services.producer import service
+from services.producer.candles import candle_records
+from services.producer.service import OptionsProducer
+from tests.test_decoding import make_producer
+
+T0 = pd.Timestamp("2025-03-01", tz="UTC")
+
+
+def candles(start: int, count: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "time": [T0 + pd.Timedelta(minutes=start + i) for i in range(count)],
+            "open": 1.0,
+            "high": 1.0,
+            "low": 1.0,
+            "close": float(start),
+            "volume": 1.0,
+            "symbol": "BTCUSD",
+        }
+    )
+
+
+class FakeExchange:
+    def __init__(self, windows, failures=0, status=429):
+        self.windows = windows
+        self.failures = failures
+        self.status = status
+        self.calls = 0
+
+    async def fetch_candles(self, coin, resolution, start_date, end_date):
+        self.calls += 1
+        if self.failures:
+            self.failures -= 1
+            request = httpx.Request("GET", "https://example.test")
+            raise httpx.HTTPStatusError(
+                "error", request=request, response=httpx.Response(self.status)
+            )
+        # Later windows come back first to check the result is time ordered
+        await asyncio.sleep(0.01 * (len(self.windows) - start_date))
+        return self.windows[start_date]
+
+
+def requests(count: int) -> list[dict]:
+    return [
+        {"symbol": "BTCUSD", "resolution": "1m", "start_date": i, "end_date": i}
+        for i in range(count)
+    ]
+
+
+def test_windows_are_stitched_in_order_without_boundary_duplicates():
+    # Adjacent windows share their boundary candle
+    exchange = FakeExchange([candles(0, 11), candles(10, 11), candles(20, 5)])
+    engine = BackfillEngine(exchange, concurrency=3, retries=0)
+
+    df = asyncio.run(engine.run(requests(3)))
+
+    assert len(df) == 25
+    assert df["time"].is_monotonic_increasing
+    assert df["time"].is_unique
+    # The later window's copy of a boundary candle wins
+    assert df.loc[df["time"] == T0 + pd.Timedelta(minutes=10), "close"].item() == 10
+    assert engine.last_run["duplicates_removed"] == 2
+    assert engine.last_run["candles"] == 25
+
+
+def test_transient_errors_are_retried():
+    exchange = FakeExchange([candles(0, 5)], failures=2)
+    engine = BackfillEngine(exchange, concurrency=1, retries=3, retry_delay=0.001)
+
+    df = asyncio.run(engine.run(requests(1)))
+
+    assert len(df) == 5
+    assert exchange.calls == 3
+    assert engine.last_run["retries"] == 2
+    assert engine.last_run["failed_chunks"] == 0
+
+
+def test_client_errors_are_not_retried():
+    exchange = FakeExchange([candles(0, 5)], failures=1, status=400)
+    engine = BackfillEngine(exchange, concurrency=1, retries=3, retry_delay=0.001)
+
+    df = asyncio.run(engine.run(requests(1)))
+
+    assert df.empty
+    assert exchange.calls == 1
+    assert engine.last_run["failed_chunks"] == 1
+
+
+def test_token_bucket_paces_requests_after_the_burst():
+    async def scenario():
+        bucket = TokenBucket(rate=50, capacity=5)
+        start = time.perf_counter()
+        await asyncio.gather(*(bucket.acquire() for _ in range(10)))
+        return bucket, time.perf_counter() - start
+
+    bucket, elapsed = asyncio.run(scenario())
+
+    # 5 from the burst, the other 5 at 50/s
+    assert elapsed >= 0.09
+    assert bucket.acquired == 10
+
+
+def test_missing_windows_cover_the_tail_and_internal_gaps():
+    step = pd.Timedelta(minutes=1)
+    start, end = T0, T0 + pd.Timedelta(minutes=60)
+    stored = [T0 + pd.Timedelta(minutes=m) for m in [5, 6, 7, 12, 13, 50]]
+
+    assert missing_windows([], start, end, step).windows == [(start, end)]
+    gaps = missing_windows(stored, start, end, step)
+    assert gaps.leading == (start, stored[0])
+    assert gaps.internal == [(stored[2], stored[3]), (stored[4], stored[5])]
+    assert gaps.tail == (stored[5], end)
+    # A complete table only re-fetches from its newest candle
+    full = [T0 + pd.Timedelta(minutes=m) for m in range(60)]
+    assert missing_windows(full, start, end, step).windows == [(full[-1], end)]
+
+
+def test_missing_windows_skip_known_empty_ranges():
+    step = pd.Timedelta(minutes=1)
+    start, end = T0, T0 + pd.Timedelta(minutes=60)
+    stored = [T0 + pd.Timedelta(minutes=m) for m in [5, 6, 7, 12, 13, 50]]
+    # Known from an earlier sync whose lookback started before this one
+    known_empty = [(start - step, stored[0]), (stored[2], stored[3])]
+
+    gaps = missing_windows(stored, start, end, step, known_empty)
+
+    assert gaps.windows == [(stored[4], stored[5]), (stored[5], end)]
+
+
+class RecordingEngine:
+    """Returns candles only for the newest minute, the rest is an exchange hole"""
+
+    def __init__(self):
+        self.requests = []
+        self.last_run = {}
+
+    async def run(self, requests):
+        self.requests.append([(r["start_date"], r["end_date"]) for r in requests])
+        self.last_run = {"failed_chunks": 0}
+        newest = requests[-1]["start_date"]
+        return pd.DataFrame({"symbol": "BTCUSD", "time": [newest]})
+
+
+class StoredTimes:
+    def __init__(self, times):
+        self.times = times
+
+    async def execute(self, query):
+        return self
+
+    def scalars(self):
+        return iter(self.times)
+
+
+def test_second_sync_skips_ranges_the_exchange_has_no_candles_for(monkeypatch):
+    async def copy_candles(df, resolution, chunk, prune=None):
+        return {"rows_per_sec": 0.0}
+
+    engine = RecordingEngine()
+    monkeypatch.setattr(OptionsProducer, "backfill_engine", property(lambda _: engine))
+    monkeypatch.setattr(service, "copy_candles", copy_candles)
+    producer = make_producer()
+    # Listed 30 minutes into the 60 minute lookback, no trades for 10 minutes
+    now = pd.Timestamp.now(tz="UTC").floor("min")
+    stored = [now - pd.Timedelta(minutes=m) for m in [30, 29, *range(20, 0, -1)]]
+    db = StoredTimes(stored)
+
+    asyncio.run(producer.load_ohlcv_data("BTCUSD", Resolution.MINUTE_1, 60, db))
+    asyncio.run(producer.load_ohlcv_data("BTCUSD", Resolution.MINUTE_1, 60, db))
+
+    first, second = engine.requests
+    assert len(first) == 3
+    assert second == [(stored[-1], second[0][1])]
+    assert producer.ohlcv_sync_stats["BTCUSD:1m"]["gaps_filled"] == 0
+
+
+def test_split_window_caps_candles_per_request():
+    step = pd.Timedelta(minutes=1)
+    windows = split_window(T0, T0 + pd.Timedelta(minutes=25), step, 10)
+
+    assert [(b - a) / step for a, b in windows] == [10, 10, 5]
+    assert windows[0][0] == T0 and windows[-1][1] == T0 + pd.Timedelta(minutes=25)
+
+
+def test_candle_records_are_chunked_copy_tuples():
+    chunks = list(candle_records(candles(0, 25), Resolution.MINUTE_1, chunk_size=10))
+
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    symbol, resolution, time_, open_, high, low, close, volume = chunks[1][0]
+    assert (symbol, resolution, time_) == (
+        "BTCUSD",
+        "1m",
+        T0 + pd.Timedelta(minutes=10),
+    )
+    assert all(isinstance(value, float) for value in (open_, high, low, volume))
@@ -0,0 +1,97 @@
+import asyncio
+import pandas as pd
+from datetime import datetime, timedelta, timezone
+from services.common.exchanges.candle_cache import CandleCache
+from services.common.types.enums import Resolution
+
+DAY = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+
+class FakeFetch:
+    """Hourly candles for any range, remembering the requested ranges"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, symbol, resolution, start, end):
+        self.calls.append((start, end))
+        times = pd.date_range(start, end, freq="1h", inclusive="left")
+        return pd.DataFrame(
+            {
+                "time": times,
+                "open": 1,
+                "high": 2,
+                "low": 0,
+                "close": range(len(times)),
+                "volume": 10,
+                "symbol": symbol,
+            }
+        )
+
+
+def test_cache_fetches_only_missing_days(tmp_path):
+    fetch = FakeFetch()
+    cache = CandleCache(str(tmp_path), fetch)
+    hour = Resolution.HOUR_1
+
+    async def scenario():
+        first = await cache.get("BTCUSD", hour, DAY, DAY + timedelta(days=2))
+        again = await cache.get(
+            "BTCUSD", hour, DAY + timedelta(hours=6), DAY + timedelta(days=2)
+        )
+        wider = await cache.get("BTCUSD", hour, DAY, DAY + timedelta(days=3))
+        return first, again, wider
+
+    first, again, wider = asyncio.run(scenario())
+
+    assert len(first) == 48
+    assert len(again) == 42
+    assert again["time"].iloc[0] == DAY + timedelta(hours=6)
+    assert len(wider) == 72 and wider["time"].is_monotonic_increasing
+    # The second query came entirely from disk, the third only fetched day 3
+    assert fetch.calls == [
+        (DAY, DAY + timedelta(days=2)),
+        (DAY + timedelta(days=2), DAY + timedelta(days=3)),
+    ]
+    assert cache.path("BTCUSD", hour, DAY.date()).exists()
+    assert cache.stats["partition_hits"] == 4
+    assert cache.stats["partition_misses"] == 3
+    assert cache.stats["bytes_read"] > 0
+
+
+def test_days_that_have_not_ended_are_not_cached(tmp_path):
+    fetch = FakeFetch()
+    cache = CandleCache(str(tmp_path), fetch)
+    now = datetime.now(timezone.utc)
+
+    async def scenario():
+        for _ in range(2):
+            await cache.get("BTCUSD", Resolution.HOUR_1, now - timedelta(hours=3), now)
+
+    asyncio.run(scenario())
+
+    assert len(fetch.calls) == 2
+    assert not cache.path("BTCUSD", Resolution.HOUR_1, now.date()).exists()
+
+
+def test_days_without_candles_are_not_cached(tmp_path):
+    fetch = FakeFetch()
+
+    async def empty_then_candles(symbol, resolution, start, end):
+        if not fetch.calls:
+            fetch.calls.append((start, end))
+            return pd.DataFrame(columns=["time", "open", "high", "low", "close"])
+        return await fetch(symbol, resolution, start, end)
+
+    cache = CandleCache(str(tmp_path), empty_then_candles)
+
+    async def scenario():
+        end = DAY + timedelta(days=1)
+        empty = await cache.get("BTCUSD", Resolution.HOUR_1, DAY, end)
+        return empty, await cache.get("BTCUSD", Resolution.HOUR_1, DAY, end)
+
+    empty, filled = asyncio.run(scenario())
+
+    assert empty.empty
+    assert len(filled) == 24 and len(fetch.calls) == 2
+    assert cache.path("BTCUSD", Resolution.HOUR_1, DAY.date()).exists()
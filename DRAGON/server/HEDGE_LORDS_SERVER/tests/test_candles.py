@@ -0,0 +1,33 @@
+from sqlalchemy.dialects import postgresql
+from services.common.db.candles import candles_query, source_resolution
+from services.common.types.enums import Resolution
+
+
+def compile_sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+def test_source_resolution_prefers_stored_then_coarsest_divisor():
+    stored = [Resolution.MINUTE_1, Resolution.MINUTE_5, Resolution.MINUTE_30]
+
+    assert source_resolution(Resolution.MINUTE_5, stored) == Resolution.MINUTE_5
+    assert source_resolution(Resolution.HOUR_1, stored) == Resolution.MINUTE_30
+    assert source_resolution(Resolution.MINUTE_15, stored) == Resolution.MINUTE_5
+    assert source_resolution(Resolution.MINUTE_1, [Resolution.HOUR_1]) is None
+
+
+def test_stored_resolution_is_read_as_is():
+    sql = compile_sql(candles_query("BTCUSD", Resolution.MINUTE_1, Resolution.MINUTE_1))
+
+    assert "date_bin" not in sql
+    assert "ORDER BY market_data.historical_data.time" in sql
+
+
+def test_coarser_resolution_is_resampled_by_the_database():
+    sql = compile_sql(candles_query("BTCUSD", Resolution.HOUR_1, Resolution.MINUTE_1))
+
+    assert "date_bin" in sql
+    assert "GROUP BY" in sql
+    assert "array_agg(market_data.historical_data.open ORDER BY" in sql
+    assert "max(market_data.historical_data.high)" in sql
+    assert "sum(market_data.historical_data.volume)" in sql
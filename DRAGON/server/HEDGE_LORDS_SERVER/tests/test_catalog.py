@@ -0,0 +1,61 @@
+import asyncio
+from datetime import date
+from decimal import Decimal
+from services.common.exchanges.catalog import ProductsCatalog, expiry_from_symbol
+
+PRODUCTS = [
+    {"symbol": "C-BTC-95000-010325", "contract_type": "call_options", "id": 1},
+    {"symbol": "P-BTC-90000-010325", "contract_type": "put_options", "id": 2},
+    {"symbol": "C-BTC-90000-010425", "contract_type": "call_options", "id": 3},
+    {"symbol": "C-ETH-3000-010325", "contract_type": "call_options", "id": 4},
+    {"symbol": "BTCUSD", "contract_type": "perpetual_futures", "id": 5},
+]
+
+
+def test_catalog_indexes_by_underlying_and_expiry_with_one_fetch():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return PRODUCTS
+
+    async def scenario():
+        catalog = ProductsCatalog(fetch, ttl=60)
+        march = await catalog.contracts("BTC", date(2025, 3, 1))
+        april = await catalog.contracts("BTC", date(2025, 4, 1))
+        expiries = await catalog.expiries("BTC")
+        return march, april, expiries
+
+    march, april, expiries = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert [c.symbol for c in march] == ["P-BTC-90000-010325", "C-BTC-95000-010325"]
+    assert march[1].strike_price == Decimal("95000")
+    assert [c.symbol for c in april] == ["C-BTC-90000-010425"]
+    assert expiries == [date(2025, 3, 1), date(2025, 4, 1)]
+
+
+def test_failed_refresh_keeps_previous_catalog():
+    responses = [PRODUCTS]
+
+    async def fetch():
+        if not responses:
+            raise RuntimeError("API down")
+        return responses.pop()
+
+    async def scenario():
+        catalog = ProductsCatalog(fetch, ttl=60)
+        await catalog.refresh()
+        await catalog.refresh()
+        return catalog, await catalog.symbols()
+
+    catalog, symbols = asyncio.run(scenario())
+
+    assert len(symbols) == 4
+    assert catalog.failed_refreshes == 1
+
+
+def test_expiry_from_symbol():
+    assert expiry_from_symbol("C-BTC-90000-010325") == date(2025, 3, 1)
+    assert expiry_from_symbol("BTCUSD") is None
+    assert expiry_from_symbol("C-BTC-90000-320325") is None
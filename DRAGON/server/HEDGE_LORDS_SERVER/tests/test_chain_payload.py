@@ -0,0 +1,67 @@
+import asyncio
+from services.consumer import service
+from services.consumer.service import OptionsConsumer, chain_payload_sql
+from services.consumer.websocket_manager import ConnectionManager
+from services.common.types.enums import ChainQueryMode
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, message):
+        self.sent.append(message)
+
+
+class FakeConnection:
+    def __init__(self, payload):
+        self.payload = payload
+        self.queries = []
+
+    async def fetchval(self, query):
+        self.queries.append(query)
+        return self.payload
+
+
+def test_payload_sql_reads_the_live_table_as_text():
+    sql = chain_payload_sql("market_data.options_snapshot")
+
+    assert "FROM market_data.options_snapshot" in sql
+    assert sql.strip().endswith("FROM market_data.options_snapshot")
+    assert ")::text" in sql
+    for key in ("symbol", "strike_price", "best_bid", "spot_price", "expiry_date"):
+        assert f"'{key}'" in sql
+
+
+def test_prepared_poll_forwards_the_payload_unchanged(monkeypatch):
+    payload = '{"timestamp": 1, "purpose": "prices", "options_chain": []}'
+    connection = FakeConnection(payload)
+    websocket = FakeWebSocket()
+    manager = ConnectionManager()
+    manager.active_connections["premiums"] = websocket
+
+    class FakeRawConnection:
+        def __init__(self, read_only=False):
+            assert read_only
+
+        async def __aenter__(self):
+            return connection
+
+        async def __aexit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(service, "get_raw_connection", FakeRawConnection)
+    monkeypatch.setattr(service, "manager", manager)
+    consumer = OptionsConsumer()
+    consumer.chain_query = ChainQueryMode.PREPARED
+
+    async def scenario():
+        task = asyncio.create_task(consumer.start_polling())
+        while not websocket.sent:
+            await asyncio.sleep(0.01)
+        consumer.should_stop = True
+        await task
+
+    asyncio.run(scenario())
+    assert websocket.sent[0] == payload
+    assert connection.queries[0] == consumer.chain_payload_sql
@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+import pytest
+from datetime import date
+from decimal import Decimal
+from services.common.live.chain_store import _H_PID, ChainStore, records_to_dicts
+
+STORE_NAME = f"test_chain_{os.getpid()}"
+
+
+def make_row(symbol: str, **values) -> dict:
+    row = {
+        "symbol": symbol,
+        "timestamp": 1,
+        "contract_type": "call_options",
+        "underlying_asset_symbol": "BTC",
+    }
+    row.update(values)
+    return row
+
+
+def test_reader_sees_writer_updates_and_versions():
+    writer = ChainStore.create(STORE_NAME, capacity=2)
+    try:
+        reader = ChainStore.attach(STORE_NAME)
+        writer.update(
+            [
+                make_row(
+                    "C-BTC-90000-010325",
+                    mark_price=Decimal("10"),
+                    best_bid=9.5,
+                    expiry_date=date(2025, 3, 1),
+                )
+            ]
+        )
+        version, records = reader.snapshot()
+
+        # A tick without quotes keeps the last quote, like the table upsert
+        writer.update([make_row("C-BTC-90000-010325", mark_price=11.0)])
+        writer.update([make_row("P-BTC-90000-010325"), make_row("C-BTC-1-010325")])
+        new_version, new_records = reader.snapshot()
+        rows = records_to_dicts(new_records, ["C-BTC-90000-010325"])
+
+        assert records_to_dicts(records)[0]["mark_price"] == 10.0
+        assert new_version > version
+        assert len(new_records) == 2
+        assert writer.overflowed == 1
+        assert rows[0]["mark_price"] == 11.0
+        assert rows[0]["best_bid"] == 9.5
+        assert rows[0]["delta"] is None
+        assert rows[0]["expiry_date"] == "2025-03-01"
+        reader.close()
+    finally:
+        writer.close()
+
+    assert ChainStore.attach(STORE_NAME) is None
+
+
+def test_remove_moves_last_record_into_freed_slot():
+    writer = ChainStore.create(STORE_NAME, capacity=3)
+    try:
+        writer.update([make_row("A"), make_row("B"), make_row("C")])
+        writer.remove(["A"])
+        writer.update([make_row("C", mark_price=1.0)])
+        _, records = writer.snapshot()
+        rows = {row["symbol"]: row for row in records_to_dicts(records)}
+
+        assert set(rows) == {"B", "C"}
+        assert rows["C"]["mark_price"] == 1.0
+    finally:
+        writer.close()
+
+
+def test_create_refuses_a_live_segment_and_replaces_a_dead_one():
+    writer = ChainStore.create(STORE_NAME, capacity=2)
+    with pytest.raises(RuntimeError):
+        ChainStore.create(STORE_NAME, capacity=2)
+
+    # The writer exits without closing the segment
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    writer._header[_H_PID] = exited.pid
+    replacement = ChainStore.create(STORE_NAME, capacity=2)
+    writer.owner = False
+    writer.close()
+
+    assert replacement.is_open and len(replacement) == 0
+    replacement.close()
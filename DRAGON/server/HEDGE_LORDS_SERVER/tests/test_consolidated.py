@@ -0,0 +1,98 @@
+import json
+import time
+import asyncio
+from services.common.exchanges.binance import BinanceExchange
+from services.common.exchanges.consolidated import (
+    ConsolidatedBook,
+    NormalizedTick,
+    canonical_instrument,
+)
+from services.common.exchanges.delta import DeltaExchange
+from services.common.types.enums import DecodeMode
+from services.exchange_sim.chain import SyntheticChain
+from tests.test_decoding import make_producer
+
+
+def tick(venue, bid, ask, age=0.0, spot=None):
+    return NormalizedTick(
+        venue=venue,
+        instrument="BTC-USD",
+        symbol="BTCUSD",
+        timestamp=int((time.time() - age) * 1_000_000),
+        bid=bid,
+        ask=ask,
+        spot=spot,
+    )
+
+
+async def noop(message):
+    pass
+
+
+def test_canonical_instrument():
+    assert canonical_instrument("BTCUSDT") == "BTC-USD"
+    assert canonical_instrument("BTCUSD") == "BTC-USD"
+    assert canonical_instrument("ETHUSDC") == "ETH-USD"
+    assert canonical_instrument("C-BTC-85000-181026") == "C-BTC-85000-181026"
+
+
+def test_best_quotes_across_venues_and_back_off():
+    book = ConsolidatedBook()
+    book.update(tick("delta_exchange", 100.0, 102.0, spot=101.0))
+    book.update(tick("binance", 100.5, 101.5, spot=101.2))
+
+    top = book.top("BTC-USD")
+    assert (top["best_bid"], top["best_bid_venue"]) == (100.5, "binance")
+    assert (top["best_ask"], top["best_ask_venue"]) == (101.5, "binance")
+    assert top["mid"] == 101.0
+    assert abs(top["spot"] - 101.1) < 1e-9
+    assert book.recomputes == 0
+
+    # The best venue backs off, the other venue's quote takes over
+    book.update(tick("binance", 99.0, 103.0))
+    top = book.top("BTC-USD")
+    assert (top["best_bid"], top["best_bid_venue"]) == (100.0, "delta_exchange")
+    assert (top["best_ask"], top["best_ask_venue"]) == (102.0, "delta_exchange")
+    assert book.recomputes == 1
+    assert book.top("ETH-USD") is None
+
+
+def test_stale_quotes_are_ignored():
+    book = ConsolidatedBook(stale_after=5)
+    book.update(tick("delta_exchange", 100.0, 102.0, age=1))
+    book.update(tick("binance", 101.0, 101.5, age=60))
+
+    top = book.top("BTC-USD")
+    assert top["best_bid_venue"] == "delta_exchange"
+    assert top["best_ask"] == 102.0
+
+
+def test_venue_frames_normalize():
+    binance = BinanceExchange(noop)
+    frame = '{"u":1,"s":"BTCUSDT","b":"100.10","B":"2.5","a":"100.20","A":"1.0"}'
+    (binance_tick,) = binance.normalize(frame)
+    assert binance_tick.instrument == "BTC-USD"
+    assert (binance_tick.bid, binance_tick.ask) == (100.1, 100.2)
+    assert binance.normalize('{"result":null,"id":1}') == []
+
+    chain = SyntheticChain(["BTC"], strikes=2, expiries=1, seed=1)
+    (delta_tick,) = DeltaExchange(noop).normalize(json.dumps(chain.ticker("BTCUSD")))
+    assert delta_tick.venue == "delta_exchange"
+    assert delta_tick.instrument == "BTC-USD"
+    assert delta_tick.ask > delta_tick.bid and delta_tick.spot > 0
+
+
+def test_delta_frames_reach_the_book_before_the_ingest_queue():
+    chain = SyntheticChain(["BTC"], strikes=2, expiries=1, seed=1)
+    frame = json.dumps(chain.ticker("BTCUSD"))
+
+    for decode_mode in (DecodeMode.STRICT, DecodeMode.FAST):
+        producer = make_producer()
+        producer.decode_mode = decode_mode
+        asyncio.run(producer.message_handler(frame))
+
+        # Nothing has been written yet, the book already has the quote
+        assert producer.ingest_queue.qsize() == 1
+        top = producer.book.top("BTC-USD")
+        assert top["best_bid_venue"] == "delta_exchange"
+        assert top["best_ask"] > top["best_bid"]
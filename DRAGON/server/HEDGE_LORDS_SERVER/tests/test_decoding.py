@@ -0,0 +1,76 @@
+import json
+from datetime import date
+from decimal import Decimal
+from services.common.core.config import EXCHANGES
+from services.common.types.enums import DecodeMode, NumericMode
+from services.producer import service
+from services.producer.service import OptionsProducer
+from services.producer.writer import ticker_to_row
+from services.producer.decoding import decode_ticker_row
+
+FRAME = {
+    "type": "v2/ticker",
+    "symbol": "C-BTC-90000-010325",
+    "timestamp": 1740787200000000,
+    "contract_type": "call_options",
+    "underlying_asset_symbol": "BTC",
+    "product_id": 12345,
+    "mark_price": "1234.5",
+    "spot_price": "84321.55",
+    "strike_price": "90000",
+    "oi_contracts": "45231",
+    "volume": 12.5,
+    "tags": ["x"],
+    "price_band": {"lower_limit": "0.1", "upper_limit": "2469"},
+    "quotes": {"best_ask": "1240", "best_bid": "1230", "mark_iv": "0.555"},
+    "greeks": {"delta": "0.51", "spot": "84321.55"},
+}
+
+
+def make_producer() -> OptionsProducer:
+    return OptionsProducer(
+        api_key=EXCHANGES["delta_exchange"]["api_key"],
+        api_secret=EXCHANGES["delta_exchange"]["api_secret"],
+        ws_url=EXCHANGES["delta_exchange"]["ws_url"],
+        api_url=EXCHANGES["delta_exchange"]["base_url"],
+    )
+
+
+def test_fast_decoder_matches_strict_path():
+    message = json.dumps(FRAME)
+    strict_row = ticker_to_row(make_producer().parse_ticker(json.loads(message)))
+
+    fast_row = decode_ticker_row(message)
+
+    assert fast_row == strict_row
+    assert fast_row["best_bid"] == Decimal("1230")
+    assert fast_row["oi_contracts"] == 45231
+    assert fast_row["expiry_date"] == date(2025, 3, 1)
+
+
+def test_fast_decoder_skips_non_ticker_frames():
+    assert decode_ticker_row(json.dumps({"type": "subscriptions"})) is None
+    assert decode_ticker_row("not json") is None
+    assert decode_ticker_row(json.dumps({**FRAME, "contract_type": "spot"})) is None
+
+
+def test_fast_decoder_float_mode():
+    row = decode_ticker_row(json.dumps(FRAME), NumericMode.FLOAT)
+
+    assert row["best_bid"] == 1230.0
+    assert isinstance(row["mark_price"], float)
+    assert isinstance(row["delta"], float)
+
+
+def test_float_mode_decodes_with_the_fast_decoder(monkeypatch):
+    monkeypatch.setattr(service, "NUMERIC_MODE", "float")
+    monkeypatch.setattr(service, "PRODUCER_WRITE_MODE", "batch")
+    monkeypatch.setattr(service, "PRODUCER_DECODE_MODE", "strict")
+
+    assert make_producer().decode_mode == DecodeMode.FAST
+
+
+def test_numeric_mode_to_float():
+    assert NumericMode.DECIMAL.to_float(Decimal("1.5")) == 1.5
+    assert NumericMode.DECIMAL.to_float(None) is None
+    assert NumericMode.FLOAT.to_float(1.5) == 1.5
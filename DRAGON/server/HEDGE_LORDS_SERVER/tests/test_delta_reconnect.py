@@ -0,0 +1,50 @@
+import json
+import asyncio
+import websockets
+import services.common.exchanges.delta as delta
+from services.common.exchanges.delta import DeltaExchange
+
+
+def test_reconnects_and_replays_subscriptions(monkeypatch):
+    monkeypatch.setattr(delta, "DELTA_RECONNECT_MIN_DELAY", 0.01)
+
+    async def scenario():
+        connections = []
+        subscribed = []
+
+        async def handler(ws):
+            connections.append(ws)
+            async for message in ws:
+                subscribed.append(json.loads(message))
+                if len(connections) == 1:
+                    # Drop the first connection right after the subscription
+                    await ws.close()
+
+        async with websockets.serve(handler, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+
+            async def on_message(message):
+                pass
+
+            exchange = DeltaExchange(on_message)
+            exchange.ws_url = f"ws://127.0.0.1:{port}"
+            # No products catalog refresh against the real API
+            monkeypatch.setattr(exchange.catalog, "start", lambda: None)
+            await exchange.connect()
+            await exchange.subscribe_symbols(["C-BTC-90000-010325", "BTCUSD"])
+            for _ in range(200):
+                if len(subscribed) == 2:
+                    break
+                await asyncio.sleep(0.01)
+            stats = exchange.stats
+            await exchange.disconnect()
+        return len(connections), subscribed, stats
+
+    connections, subscribed, stats = asyncio.run(scenario())
+
+    assert connections == 2
+    replayed = subscribed[1]["payload"]["channels"][0]["symbols"]
+    assert replayed == ["C-BTC-90000-010325", "BTCUSD"]
+    assert stats["disconnects"] == 1
+    assert stats["reconnects"] == 1
+    assert stats["connected"]
@@ -0,0 +1,69 @@
+import json
+from fastapi.testclient import TestClient
+from services.common.exchanges.catalog import parse_option_product
+from services.common.types.enums import NumericMode
+from services.exchange_sim.chain import SyntheticChain
+from services.exchange_sim.main import app
+from services.producer.decoding import decode_ticker_row
+
+
+def test_chain_size_and_products_parse():
+    chain = SyntheticChain(["BTC", "ETH"], strikes=10, expiries=3, seed=1)
+
+    assert len(chain.options) == 2 * 10 * 3 * 2
+    contracts = [parse_option_product(p) for p in chain.products({"call_options"})]
+    assert len(contracts) == 2 * 10 * 3
+    assert all(contract is not None for contract in contracts)
+
+
+def test_ticker_frames_decode_like_delta_frames():
+    chain = SyntheticChain(["BTC"], strikes=4, expiries=1, seed=1)
+    symbol = next(iter(chain.options))
+    chain.advance()
+
+    row = decode_ticker_row(json.dumps(chain.ticker(symbol)), NumericMode.FLOAT)
+    perpetual = decode_ticker_row(json.dumps(chain.ticker("BTCUSD")), NumericMode.FLOAT)
+
+    assert row["symbol"] == symbol
+    assert row["mark_price"] >= 0 and row["best_ask"] > row["best_bid"]
+    assert -1 <= row["delta"] <= 1 and row["gamma"] > 0
+    assert perpetual["contract_type"] == "perpetual_futures"
+    assert chain.ticker("C-XRP-1-010125") is None
+
+
+def test_rest_and_websocket_api():
+    with TestClient(app) as client:
+        products = client.get(
+            "/v2/products", params={"contract_types": "call_options,put_options"}
+        ).json()
+        candles = client.get(
+            "/v2/history/candles",
+            params={"resolution": "1h", "symbol": "BTCUSD", "start": 0, "end": 36000},
+        ).json()
+        again = client.get(
+            "/v2/history/candles",
+            params={"resolution": "1h", "symbol": "BTCUSD", "start": 0, "end": 36000},
+        ).json()
+        symbol = products["result"][0]["symbol"]
+
+        with client.websocket_connect("/") as ws:
+            ws.send_text(
+                json.dumps(
+                    {
+                        "type": "subscribe",
+                        "payload": {
+                            "channels": [{"name": "v2/ticker", "symbols": [symbol]}]
+                        },
+                    }
+                )
+            )
+            frames = [json.loads(ws.receive_text()) for _ in range(3)]
+
+    assert products["success"] and products["result"]
+    assert [c["time"] for c in candles["result"]] == [
+        3600 * h for h in range(10, -1, -1)
+    ]
+    # Candle history is deterministic
+    assert candles == again
+    tickers = [frame for frame in frames if frame["type"] == "v2/ticker"]
+    assert tickers and all(frame["symbol"] == symbol for frame in tickers)
@@ -0,0 +1,73 @@
+import asyncio
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from services.producer.history import (
+    TICK_COLUMNS,
+    TickHistoryWriter,
+    partition_ddl,
+    row_to_record,
+)
+from services.producer.writer import OPTIONS_COLUMNS
+
+
+def make_row(symbol: str, timestamp: int, **values) -> dict:
+    row = dict.fromkeys(OPTIONS_COLUMNS)
+    row.update(
+        symbol=symbol,
+        timestamp=timestamp,
+        contract_type="call_options",
+        underlying_asset_symbol="BTC",
+    )
+    row.update(values)
+    return row
+
+
+def test_row_to_record_follows_copy_column_order():
+    record = row_to_record(
+        make_row("C-BTC-90000-010325", 1740787200000000, mark_price=Decimal("10"))
+    )
+
+    assert len(record) == len(TICK_COLUMNS)
+    assert record[0] == datetime(2025, 3, 1, tzinfo=timezone.utc)
+    assert record[TICK_COLUMNS.index("symbol")] == "C-BTC-90000-010325"
+    assert record[TICK_COLUMNS.index("mark_price")] == Decimal("10")
+
+
+def test_partition_ddl_covers_one_day():
+    ddl = partition_ddl(date(2025, 3, 1))
+
+    assert "market_data.options_ticks_20250301" in ddl
+    assert "FROM ('2025-03-01 00:00:00+00') TO ('2025-03-02 00:00:00+00')" in ddl
+
+
+def test_history_keeps_every_tick_and_bounds_pending():
+    history = TickHistoryWriter(batch_size=10, max_pending=2)
+    for i in range(3):
+        history.add(make_row("C-BTC-90000-010325", 1740787200000000 + i))
+
+    assert history.ticks_received == 3
+    assert history.ticks_dropped == 1
+    assert history.stats["pending_ticks"] == 2
+
+
+def test_failed_flush_requeues_without_evicting_newer_ticks(monkeypatch):
+    from contextlib import asynccontextmanager
+    from services.producer import history as history_module
+
+    history = TickHistoryWriter(batch_size=10, max_pending=3)
+    for i in range(3):
+        history.add(make_row("C-BTC-90000-010325", 1740787200000000 + i))
+
+    @asynccontextmanager
+    async def failing_connection():
+        # A tick arrives while the COPY is in flight, then the COPY fails
+        history.add(make_row("C-BTC-90000-010325", 1740787200000000 + 3))
+        raise ConnectionError("database unavailable")
+        yield
+
+    monkeypatch.setattr(history_module, "get_raw_connection", failing_connection)
+    assert asyncio.run(history.flush()) == 0
+
+    times = [record[0].microsecond for record in history._pending]
+    assert times == [1, 2, 3]
+    assert history.ticks_dropped == 1
@@ -0,0 +1,108 @@
+import asyncio
+from contextlib import asynccontextmanager
+from services.common.db import database
+
+
+class FakeConnection:
+    """Records statements, keeps the migrations table and its comment in memory"""
+
+    def __init__(self, comment=None, applied=None):
+        self.comment = comment
+        self.applied = dict(applied or {})
+        self.statements = []
+        self.in_transaction = False
+        self.transactional = []
+
+    async def fetchval(self, query, *args):
+        return self.comment
+
+    async def fetch(self, query, *args):
+        return [
+            {"filename": name, "checksum": checksum}
+            for name, checksum in self.applied.items()
+        ]
+
+    async def execute(self, query, *args):
+        query = query.strip()
+        self.statements.append(query)
+        if query.startswith("INSERT INTO migrations"):
+            self.applied[args[0]] = args[1]
+        elif query.startswith("COMMENT ON TABLE migrations"):
+            self.comment = query.split("'")[1]
+        elif not query.startswith(
+            (
+                "SELECT pg_advisory",
+                "CREATE TABLE IF NOT EXISTS migrations",
+                "ALTER TABLE migrations",
+            )
+        ):
+            self.transactional.append((query, self.in_transaction))
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.in_transaction = True
+        try:
+            yield
+        finally:
+            self.in_transaction = False
+
+
+def setup(monkeypatch, tmp_path, conn):
+    (tmp_path / "001_table.sql").write_text("CREATE TABLE a (x int);\nSELECT 1;")
+    (tmp_path / "002_index.sql").write_text(
+        f"{database.NO_TRANSACTION_MARKER}\nCREATE INDEX CONCURRENTLY i ON a (x);"
+    )
+    monkeypatch.setattr(database.settings, "MIGRATIONS_FOLDER", str(tmp_path))
+
+    @asynccontextmanager
+    async def get_raw_connection():
+        yield conn
+
+    monkeypatch.setattr(database, "get_raw_connection", get_raw_connection)
+
+
+def test_applies_pending_files_under_the_lock_then_takes_the_fast_path(
+    monkeypatch, tmp_path
+):
+    conn = FakeConnection()
+    setup(monkeypatch, tmp_path, conn)
+
+    asyncio.run(database.run_migrations())
+    assert set(conn.applied) == {"001_table.sql", "002_index.sql"}
+    assert conn.statements[0] == "SELECT pg_advisory_lock($1)"
+    assert conn.statements[-1] == "SELECT pg_advisory_unlock($1)"
+    assert conn.transactional == [
+        ("CREATE TABLE a (x int)", True),
+        ("SELECT 1", True),
+        ("CREATE INDEX CONCURRENTLY i ON a (x)", False),
+    ]
+
+    conn.statements.clear()
+    asyncio.run(database.run_migrations())
+    assert conn.statements == []
+
+
+def test_changed_files_are_not_rerun(monkeypatch, tmp_path):
+    conn = FakeConnection(applied={"001_table.sql": "old", "002_index.sql": None})
+    setup(monkeypatch, tmp_path, conn)
+
+    asyncio.run(database.run_migrations())
+
+    assert conn.applied == {"001_table.sql": "old", "002_index.sql": None}
+    assert conn.transactional == [
+        ("UPDATE migrations SET checksum = $1 WHERE filename = $2", False)
+    ]
+    assert conn.comment is not None
+
+
+def test_split_statements_ignores_comments():
+    sql = "-- first; not a statement\nSELECT '--;' AS x; -- trailing; note\nSELECT 2;"
+    assert database.split_statements(sql) == ["SELECT '--;' AS x", "SELECT 2"]
+
+
+def test_shipped_migrations_split_into_statements():
+    keywords = ("ALTER", "COMMENT", "CREATE", "DROP", "INSERT", "TRUNCATE", "UPDATE")
+    assert database.get_migration_files()
+    for path in database.get_migration_files():
+        for stmt in database.split_statements(path.read_text()):
+            assert stmt.upper().startswith(keywords), (path.name, stmt[:60])
@@ -0,0 +1,37 @@
+import asyncio
+from services.common.db.notify import (
+    MAX_PAYLOAD_BYTES,
+    RESET,
+    ChangeSubscription,
+    chunk_symbols,
+)
+
+
+def test_chunk_symbols_fits_payload_limit():
+    symbols = [f"C-BTC-{strike}-010325" for strike in range(100000, 102000)]
+
+    payloads = chunk_symbols(symbols)
+
+    assert len(payloads) > 1
+    assert all(len(payload.encode()) <= MAX_PAYLOAD_BYTES for payload in payloads)
+    assert [s for payload in payloads for s in payload.split(",")] == symbols
+
+
+def test_subscription_accumulates_and_resets():
+    async def scenario():
+        subscription = ChangeSubscription()
+        subscription._push("C-BTC-1-010325,P-BTC-1-010325")
+        subscription._push("C-BTC-1-010325")
+        changed = await subscription.wait(timeout=1)
+
+        subscription._push("C-BTC-2-010325")
+        subscription._push(RESET)
+        reset = await subscription.wait(timeout=1)
+        timed_out = await subscription.wait(timeout=0.01)
+        return changed, reset, timed_out
+
+    changed, reset, timed_out = asyncio.run(scenario())
+
+    assert changed == {"C-BTC-1-010325", "P-BTC-1-010325"}
+    assert reset is None
+    assert timed_out is None
@@ -0,0 +1,94 @@
+import asyncio
+import time
+from services.common.exchanges.recording import (
+    FrameRecorder,
+    FrameReplayer,
+    read_frames,
+)
+
+
+def crashed_recording(path, frames, start=1000.0):
+    """A recording whose gzip member was never closed"""
+    recorder = FrameRecorder(str(path))
+    for i, frame in enumerate(frames):
+        recorder.record(frame, received_at=start + i)
+    recorder._file.flush()
+    recorder._file.fileobj.flush()
+    # Abandon the open member the way a killed process would
+    recorder._file.fileobj.close()
+
+
+def record(path, frames, start=1000.0, interval=0.01):
+    recorder = FrameRecorder(str(path))
+    for i, frame in enumerate(frames):
+        recorder.record(frame, received_at=start + i * interval)
+    recorder.close()
+
+
+def test_recordings_append_across_sessions(tmp_path):
+    path = tmp_path / "frames.bin.gz"
+    record(path, ['{"n": 1}', '{"n": 2}'])
+    record(path, ['{"n": 3}'], start=2000.0)
+
+    frames = list(read_frames(str(path)))
+
+    assert [frame for _, frame in frames] == ['{"n": 1}', '{"n": 2}', '{"n": 3}']
+    assert frames[1][0] == 1000.01 and frames[2][0] == 2000.0
+
+
+def test_replay_speeds(tmp_path):
+    path = tmp_path / "frames.bin.gz"
+    # 20 frames spread over 0.2s
+    record(path, [str(i) for i in range(20)], interval=0.01)
+    received = []
+
+    async def handler(frame):
+        received.append(frame)
+
+    def replay(speed):
+        start = time.perf_counter()
+        result = asyncio.run(FrameReplayer(str(path), handler, speed).run())
+        return result, time.perf_counter() - start
+
+    realtime, realtime_s = replay(1.0)
+    fast, fast_s = replay(4.0)
+    flat_out, _ = replay(None)
+
+    assert received == [str(i) for i in range(20)] * 3
+    assert realtime["frames"] == fast["frames"] == flat_out["frames"] == 20
+    assert realtime_s >= 0.18
+    assert fast_s < realtime_s
+
+
+def test_unclosed_recording_reads_up_to_the_last_complete_frame(tmp_path):
+    path = tmp_path / "frames.bin.gz"
+    record(path, ['{"n": 1}'])
+    crashed_recording(path, ['{"n": 2}', '{"n": 3}'])
+
+    frames = [frame for _, frame in read_frames(str(path))]
+
+    assert frames == ['{"n": 1}', '{"n": 2}', '{"n": 3}']
+
+
+def test_recording_after_a_crash_repairs_the_file_first(tmp_path):
+    path = tmp_path / "frames.bin.gz"
+    record(path, ['{"n": 1}'])
+    crashed_recording(path, ['{"n": 2}'])
+    record(path, ['{"n": 3}'], start=2000.0)
+
+    frames = [frame for _, frame in read_frames(str(path))]
+
+    assert frames == ['{"n": 1}', '{"n": 2}', '{"n": 3}']
+
+
+def test_members_are_closed_periodically(tmp_path):
+    path = tmp_path / "frames.bin.gz"
+    recorder = FrameRecorder(str(path), member_frames=2)
+    for i in range(5):
+        recorder.record(str(i), received_at=1000.0 + i)
+
+    # The first four frames are in closed members, readable while recording
+    assert [frame for _, frame in read_frames(str(path))][:4] == ["0", "1", "2", "3"]
+    recorder.close()
+    assert recorder.stats["members"] == 3
+    assert [frame for _, frame in read_frames(str(path))] == [str(i) for i in range(5)]
@@ -0,0 +1,55 @@
+import asyncio
+from services.common.db import database
+from services.common.db.replica import replica_lag
+
+
+class FakeSession:
+    def __init__(self):
+        self.commits = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+def test_read_only_sessions_use_the_read_factory(monkeypatch):
+    write, read = FakeSession(), FakeSession()
+    monkeypatch.setattr(database, "AsyncSessionFactory", lambda: write)
+    monkeypatch.setattr(database, "ReadSessionFactory", lambda: read)
+
+    async def scenario():
+        async with database.get_db_session(read_only=True) as session:
+            assert session is read
+        async with database.get_db_session() as session:
+            assert session is write
+
+    asyncio.run(scenario())
+    assert (read.commits, write.commits) == (0, 1)
+
+
+def test_reads_share_the_primary_without_read_host():
+    assert database.read_engine is database.engine
+    lag = asyncio.run(replica_lag())
+    assert lag == {
+        "separate": False,
+        "in_recovery": False,
+        "lag_seconds": 0.0,
+        "lag_bytes": 0,
+    }
+
+
+def test_unlogged_snapshot_keeps_reads_on_the_primary():
+    assert database.use_read_database("replica-host", snapshot_unlogged=False)
+    assert not database.use_read_database("replica-host", snapshot_unlogged=True)
+    assert not database.use_read_database(None, snapshot_unlogged=False)
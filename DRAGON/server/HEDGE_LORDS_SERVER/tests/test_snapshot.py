@@ -0,0 +1,70 @@
+import asyncio
+from contextlib import asynccontextmanager
+from services.producer import snapshot
+from services.producer.snapshot import SnapshotCheckpointer, prepare_snapshot
+
+
+class FakeConnection:
+    def __init__(self, persistence="p", rows=3):
+        self.persistence = persistence
+        self.rows = rows
+        self.statements = []
+        self.transactions = 0
+
+    async def fetchval(self, query):
+        return self.persistence
+
+    async def execute(self, query):
+        self.statements.append(query)
+        if query.startswith("INSERT"):
+            return f"INSERT 0 {self.rows}"
+        return "OK"
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.transactions += 1
+        yield
+
+
+def use_connection(monkeypatch, conn):
+    @asynccontextmanager
+    async def get_raw_connection():
+        yield conn
+
+    monkeypatch.setattr(snapshot, "get_raw_connection", get_raw_connection)
+
+
+def test_prepare_switches_persistence_once_and_restores(monkeypatch):
+    conn = FakeConnection(persistence="p", rows=2)
+    use_connection(monkeypatch, conn)
+
+    restored = asyncio.run(prepare_snapshot(unlogged=True))
+    conn.persistence = "u"
+    asyncio.run(prepare_snapshot(unlogged=True))
+
+    alters = [s for s in conn.statements if s.startswith("ALTER")]
+    assert alters == ["ALTER TABLE market_data.options_snapshot SET UNLOGGED"]
+    assert restored == 2
+    assert "WHERE NOT EXISTS" in conn.statements[-1]
+
+
+def test_checkpoint_replaces_the_copy_in_one_transaction(monkeypatch):
+    conn = FakeConnection(rows=5)
+    use_connection(monkeypatch, conn)
+    checkpointer = SnapshotCheckpointer(interval=60)
+
+    async def scenario():
+        checkpointer.start()
+        await checkpointer.stop()
+
+    asyncio.run(scenario())
+
+    assert conn.transactions == 1
+    assert conn.statements[0] == (
+        "TRUNCATE TABLE market_data.options_snapshot_checkpoint"
+    )
+    assert conn.statements[1].startswith(
+        "INSERT INTO market_data.options_snapshot_checkpoint"
+    )
+    assert checkpointer.stats["checkpoints"] == 1
+    assert checkpointer.stats["last_rows"] == 5
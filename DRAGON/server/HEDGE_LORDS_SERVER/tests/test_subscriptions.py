@@ -0,0 +1,64 @@
+import asyncio
+from datetime import date
+from services.producer.subscriptions import SubscriptionRegistry
+from services.producer.writer import OPTIONS_COLUMNS, OptionsBatchWriter
+from tests.test_decoding import make_producer
+
+MARCH = ("BTCUSD", date(2025, 3, 1))
+APRIL = ("BTCUSD", date(2025, 4, 1))
+
+
+def test_shared_symbols_are_reference_counted():
+    registry = SubscriptionRegistry(max_symbols_per_connection=4)
+
+    added_march = registry.add(MARCH, ["C-BTC-90000-010325", "BTCUSD"])
+    added_april = registry.add(APRIL, ["C-BTC-90000-010425", "BTCUSD"])
+
+    assert added_march == ["C-BTC-90000-010325", "BTCUSD"]
+    assert added_april == ["C-BTC-90000-010425"]
+    assert registry.add(MARCH, ["C-BTC-90000-010325"]) == []
+    assert registry.symbol_count == 3
+    assert not registry.saturated
+
+    assert registry.remove(MARCH) == ["C-BTC-90000-010325"]
+    assert registry.remove(APRIL) == ["C-BTC-90000-010425", "BTCUSD"]
+    assert registry.symbol_count == 0
+
+
+def test_saturation_is_reported():
+    registry = SubscriptionRegistry(max_symbols_per_connection=2)
+    registry.add(MARCH, ["C-BTC-90000-010325", "BTCUSD"])
+
+    assert registry.saturated
+    assert registry.stats["symbols_per_connection"] == 2
+
+
+def test_released_symbols_are_remembered_until_added_again():
+    registry = SubscriptionRegistry(max_symbols_per_connection=4)
+    registry.add(MARCH, ["C-BTC-90000-010325", "BTCUSD"])
+    registry.add(APRIL, ["C-BTC-90000-010425", "BTCUSD"])
+
+    registry.remove(MARCH)
+    assert registry.is_released("C-BTC-90000-010325")
+    assert not registry.is_released("BTCUSD")
+
+    registry.add(MARCH, ["C-BTC-90000-010325", "BTCUSD"])
+    assert not registry.is_released("C-BTC-90000-010325")
+
+
+def test_queued_ticks_of_released_symbols_are_not_written():
+    producer = make_producer()
+    producer.writer = OptionsBatchWriter()
+    producer.subscriptions.add(MARCH, ["C-BTC-90000-010325", "BTCUSD"])
+
+    async def run():
+        producer.writer.add(dict.fromkeys(OPTIONS_COLUMNS, None) | {"symbol": "BTCUSD"})
+        producer.subscriptions.remove(MARCH)
+        await producer.writer.discard(["C-BTC-90000-010325", "BTCUSD"])
+        await producer.write_to_db(
+            [dict.fromkeys(OPTIONS_COLUMNS) | {"symbol": "C-BTC-90000-010325"}]
+        )
+
+    asyncio.run(run())
+    assert producer.writer.stats["pending_rows"] == 0
+    assert producer.writer.stats["ticks_received"] == 1
@@ -0,0 +1,257 @@
+import re
+import asyncio
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from sqlalchemy.dialects import postgresql
+from services.common.types.enums import OverflowPolicy
+from services.common.types.models import Options, OptionsSnapshot, OptionsTicker
+from services.producer import writer
+from services.producer.ingest import IngestQueue
+from services.producer.writer import (
+    CoalescingBuffer,
+    MERGE_COLUMNS,
+    OPTIONS_COLUMNS,
+    OptionsBatchWriter,
+    build_upsert,
+    merge_tickers,
+)
+
+
+def make_row(symbol: str, **values) -> dict:
+    row = dict.fromkeys(OPTIONS_COLUMNS)
+    row.update(symbol=symbol, timestamp=1, contract_type="call_options")
+    row.update(values)
+    return row
+
+
+def upsert_assignments(model) -> dict[str, str]:
+    sql = str(
+        build_upsert([make_row("C-BTC-90000-010325")], model).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+    set_clause = sql.split("DO UPDATE SET ", 1)[1]
+    return dict(re.findall(r"(\w+) = (\w+\([^)]*\)|[^,]+)", set_clause))
+
+
+class RecordingSession:
+    def __init__(self, fail: bool = False, on_execute=None):
+        self.fail = fail
+        self.on_execute = on_execute
+        self.statements = []
+
+    async def execute(self, statement):
+        if self.on_execute:
+            self.on_execute()
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        self.statements.append(statement)
+
+    @asynccontextmanager
+    async def session(self):
+        yield self
+
+
+def test_upsert_coalesces_nested_fields_and_overwrites_the_rest():
+    assignments = upsert_assignments(Options)
+
+    for column in OPTIONS_COLUMNS:
+        if column == "symbol":
+            assert column not in assignments
+        elif column in MERGE_COLUMNS:
+            assert assignments[column] == (
+                f"coalesce(excluded.{column}, market_data.options.{column})"
+            )
+        else:
+            assert assignments[column] == f"excluded.{column}"
+    assert assignments["updated_at"] == "now()"
+
+
+def test_snapshot_upsert_only_writes_its_own_columns():
+    columns = {column.name for column in OptionsSnapshot.__table__.columns}
+    statement = build_upsert([make_row("C-BTC-90000-010325")], OptionsSnapshot)
+    params = statement.compile(dialect=postgresql.dialect()).params
+
+    assert {name.rsplit("_m0", 1)[0] for name in params} == columns - {"updated_at"}
+    assert set(upsert_assignments(OptionsSnapshot)) < columns
+
+
+def test_flush_is_chunked_by_bind_parameter_limit(monkeypatch):
+    session = RecordingSession()
+    monkeypatch.setattr(writer, "get_db_session", session.session)
+    monkeypatch.setattr(writer, "MAX_ROWS_PER_STATEMENT", 2)
+    batch_writer = OptionsBatchWriter(models=(Options, OptionsSnapshot))
+    for strike in range(5):
+        batch_writer.add(make_row(f"C-BTC-{strike}-010325"))
+
+    assert asyncio.run(batch_writer.flush()) == 5
+
+    tables = [statement.table.name for statement in session.statements]
+    sizes = [
+        sum(
+            name.startswith("symbol_m")
+            for name in statement.compile(dialect=postgresql.dialect()).params
+        )
+        for statement in session.statements
+    ]
+    assert tables == ["options"] * 3 + ["options_snapshot"] * 3
+    assert sizes == [2, 2, 1] * 2
+
+
+def test_failed_flush_restores_rows_under_newer_ones(monkeypatch):
+    batch_writer = OptionsBatchWriter()
+    batch_writer.add(
+        make_row("C-BTC-90000-010325", best_bid=Decimal("1"), best_ask=Decimal("2"))
+    )
+    batch_writer.add(make_row("P-BTC-90000-010325", mark_price=Decimal("5")))
+
+    def tick_during_flush():
+        # A tick arrives while the upsert is in flight, then the upsert fails
+        batch_writer.add(make_row("C-BTC-90000-010325", best_bid=Decimal("3")))
+
+    session = RecordingSession(fail=True, on_execute=tick_during_flush)
+    monkeypatch.setattr(writer, "get_db_session", session.session)
+
+    assert asyncio.run(batch_writer.flush()) == 0
+
+    rows = {row["symbol"]: row for row in batch_writer._buffer.drain()}
+    assert rows["C-BTC-90000-010325"]["best_bid"] == Decimal("3")
+    assert rows["C-BTC-90000-010325"]["best_ask"] == Decimal("2")
+    assert rows["P-BTC-90000-010325"]["mark_price"] == Decimal("5")
+    assert batch_writer.failed_flushes == 1
+
+
+def test_coalescing_keeps_latest_row_per_symbol():
+    buffer = CoalescingBuffer()
+    buffer.add(make_row("C-BTC-90000-010325", mark_price=Decimal("10")))
+    buffer.add(make_row("C-BTC-90000-010325", mark_price=Decimal("11")))
+    buffer.add(make_row("P-BTC-90000-010325", mark_price=Decimal("5")))
+
+    rows = {row["symbol"]: row for row in buffer.drain()}
+
+    assert len(rows) == 2
+    assert rows["C-BTC-90000-010325"]["mark_price"] == Decimal("11")
+    assert buffer.ticks_received == 3
+    assert buffer.ticks_coalesced == 1
+    assert len(buffer) == 0
+
+
+def test_coalescing_merges_partial_nested_fields():
+    buffer = CoalescingBuffer()
+    buffer.add(
+        make_row(
+            "C-BTC-90000-010325",
+            best_bid=Decimal("10"),
+            best_ask=Decimal("12"),
+            delta=Decimal("0.5"),
+            upper_limit=Decimal("100"),
+            spot_price=Decimal("90000"),
+        )
+    )
+    buffer.add(make_row("C-BTC-90000-010325", best_bid=Decimal("10.5")))
+
+    (row,) = buffer.drain()
+
+    # Quotes, greeks and price band keep the last known value
+    assert row["best_bid"] == Decimal("10.5")
+    assert row["best_ask"] == Decimal("12")
+    assert row["delta"] == Decimal("0.5")
+    assert row["upper_limit"] == Decimal("100")
+    # Top level fields are replaced like save_ticker_to_db does
+    assert row["spot_price"] is None
+
+
+def test_restore_keeps_newer_values():
+    buffer = CoalescingBuffer()
+    failed = [
+        make_row("C-BTC-90000-010325", best_bid=Decimal("1"), best_ask=Decimal("2"))
+    ]
+    buffer.add(make_row("C-BTC-90000-010325", best_bid=Decimal("3")))
+
+    buffer.restore(failed)
+
+    (row,) = buffer.drain()
+    assert row["best_bid"] == Decimal("3")
+    assert row["best_ask"] == Decimal("2")
+
+
+def test_coalescing_queue_merges_partial_items():
+    ticker = {
+        "symbol": "C-BTC-90000-010325",
+        "timestamp": 1,
+        "contract_type": "call_options",
+        "underlying_asset_symbol": "BTC",
+        "type": "v2/ticker",
+        "mark_price": "1235",
+        "strike_price": "90000",
+    }
+    first = OptionsTicker(
+        **ticker,
+        quotes={"best_bid": "1230", "best_ask": "1240"},
+        greeks={"delta": "0.5"},
+    )
+    second = OptionsTicker(**ticker, quotes={"best_bid": "1231"})
+
+    async def run():
+        queue = IngestQueue(10, OverflowPolicy.COALESCE, merge=merge_tickers)
+        await queue.put("C-BTC-90000-010325", first)
+        await queue.put("C-BTC-90000-010325", second)
+        await queue.put("P-BTC-90000-010325", make_row("P-BTC-90000-010325"))
+        await queue.put(
+            "P-BTC-90000-010325", make_row("P-BTC-90000-010325", best_ask=Decimal("7"))
+        )
+        return await queue.get_many(10)
+
+    merged, row = asyncio.run(run())
+
+    assert merged.quotes.best_bid == Decimal("1231")
+    assert merged.quotes.best_ask == Decimal("1240")
+    assert merged.greeks.delta == Decimal("0.5")
+    assert row["best_ask"] == Decimal("7")
+
+
+def test_drop_oldest_queue_evicts_the_oldest_item():
+    async def run():
+        queue = IngestQueue(2, OverflowPolicy.DROP_OLDEST)
+        for item in ["a", "b", "c"]:
+            await queue.put("C-BTC-90000-010325", item)
+        stats = queue.stats
+        items = await queue.get_many(10)
+        queue.task_done(len(items))
+        await asyncio.wait_for(queue.join(), timeout=1)
+        return stats, items
+
+    stats, items = asyncio.run(run())
+
+    # Every item is kept apart, same key or not, until the oldest is evicted
+    assert items == ["b", "c"]
+    assert stats["dropped"] == 1
+    assert stats["enqueued"] == 3
+    assert stats["depth"] == 2
+    assert stats["max_depth"] == 2
+
+
+def test_block_queue_put_waits_for_room():
+    async def run():
+        queue = IngestQueue(1, OverflowPolicy.BLOCK)
+        await queue.put("C-BTC-90000-010325", "a")
+        put = asyncio.create_task(queue.put("P-BTC-90000-010325", "b"))
+        await asyncio.sleep(0.01)
+        blocked = not put.done()
+
+        first = await queue.get_many(10)
+        await asyncio.wait_for(put, timeout=1)
+        second = await queue.get_many(10)
+        queue.task_done(len(first) + len(second))
+        await asyncio.wait_for(queue.join(), timeout=1)
+        return blocked, first + second, queue.stats
+
+    blocked, items, stats = asyncio.run(run())
+
+    assert blocked
+    assert items == ["a", "b"]
+    assert stats["depth"] == 0
+    assert stats["max_depth"] == 1
+    assert stats["enqueued"] == 2
+    assert stats["dropped"] == 0
+    assert stats["policy"] == OverflowPolicy.BLOCK.value